@@ -0,0 +1,163 @@
+"""
+Runs the benchmark scenarios, saves the timings as JSON, and compares them against a saved baseline.
+
+Usage (from the repository root):
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline baseline.json --threshold 0.25
+
+The exit code is 1 when any scenario is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable
+
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+
+def time_function(
+    function: Callable[[], any],
+    max_repeats: int = 5,
+    time_budget: float = 5.0,
+    reset: Callable[[], None] = None,
+) -> dict:
+    """Times repeated calls of a function. The function is called at least once and then repeated until either
+    `max_repeats` calls or `time_budget` seconds are reached. If given, `reset` is called before every call and is
+    not included in its time.
+
+    :return: The minimum, median, and mean time of a call in seconds, and the number of calls
+    """
+    times = []
+    start = time.perf_counter()
+    while len(times) < max_repeats:
+        if reset is not None:
+            reset()
+        call_start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - call_start)
+        if time.perf_counter() - start > time_budget:
+            break
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "repeats": len(times),
+    }
+
+
+def run_scenarios(
+    scenarios: list[Scenario], max_repeats: int, time_budget: float
+) -> dict:
+    """Runs the scenarios and returns the results with metadata about the environment."""
+    results = {}
+    for scenario in scenarios:
+        try:
+            timed_function, reset = scenario.setup()
+        except ImportError as error:
+            print(f"{scenario.name}: skipped ({error})")
+            results[scenario.name] = {"skipped": str(error)}
+            continue
+
+        results[scenario.name] = time_function(
+            timed_function, max_repeats, time_budget, reset
+        )
+        print(f"{scenario.name}: {results[scenario.name]['min'] * 1000:.3f} ms")
+
+    return {
+        "metadata": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Compares the minimum time of every scenario that is in both the results and the baseline.
+
+    :return: The names of the scenarios that are slower than the baseline by more than the threshold
+    """
+    slower = []
+    print(f"\n{'scenario':45} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None or "min" not in previous or "min" not in current:
+            continue
+
+        change = current["min"] / previous["min"] - 1
+        flag = ""
+        if change > threshold:
+            slower.append(name)
+            flag = "  SLOWER"
+        print(
+            f"{name:45} {previous['min'] * 1000:12.3f} {current['min'] * 1000:12.3f} {change:+8.1%}{flag}"
+        )
+
+    return slower
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the efficalc benchmark suite.")
+    parser.add_argument(
+        "--output", help="save the results as JSON to this path", default=None
+    )
+    parser.add_argument(
+        "--baseline", help="compare the results to this saved JSON", default=None
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="the allowed slowdown compared to the baseline, defaults to 0.2 (20%%)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run scenarios with this text in the name"
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="also run the slow scenarios"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="the maximum repeats of each scenario"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=5.0,
+        help="stop repeating a scenario after this many seconds",
+    )
+    options = parser.parse_args(args)
+
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if options.filter in scenario.name and (options.all or not scenario.slow)
+    ]
+    results = run_scenarios(scenarios, options.repeats, options.time_budget)
+
+    if options.output is not None:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if options.baseline is not None:
+        with open(options.baseline) as file:
+            baseline = json.load(file)
+        slower = compare_to_baseline(results, baseline, options.threshold)
+        if slower:
+            print(
+                f"\n{len(slower)} scenario(s) slower than the baseline: {', '.join(slower)}"
+            )
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+The benchmark scenarios. Each scenario has a setup function that is not timed and returns the function that is timed
+and a reset function that is called (also not timed) before every timed call. The reset function builds new
+calculation items and clears the memoized LaTeX conversions, so repeated calls are not faster than a first call just
+because they reuse the results of the previous one.
+Setup functions raise ImportError when a scenario needs a package that is not installed, and the scenario is skipped.
+"""
+
+import dataclasses
+from typing import Callable, Tuple
+
+from efficalc import (
+    Assumption,
+    Calculation,
+    Comparison,
+    Heading,
+    Input,
+    TextBlock,
+    clear_saved_objects,
+    sqrt,
+)
+from efficalc.base_definitions.latex_text import _memoized_latex_to_text
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.generate_html import _latex_to_mathml, generate_html_for_calc_items
+
+
+@dataclasses.dataclass
+class Scenario(object):
+    """A named benchmark with a setup function that returns the function to time.
+
+    :param name: The unique name of the scenario
+    :param setup: Prepares the scenario and returns the function to time and the function that resets it before
+        every timed call
+    :param slow: Slow scenarios only run with the --all flag
+    """
+
+    name: str
+    setup: Callable[[], Tuple[Callable[[], any], Callable[[], None]]]
+    slow: bool = False
+
+
+def clear_memoized_conversions():
+    """Clears the memoized LaTeX conversions that are shared by every calculation in the process."""
+    _memoized_latex_to_text.cache_clear()
+    _latex_to_mathml.cache_clear()
+
+
+def _setup_example_runner(import_calculation: Callable[[], Callable]):
+    def setup():
+        calculation = import_calculation()
+        # Every call runs the calculation function again, so the items are always new
+        return (
+            lambda: CalculationRunner(calculation).calculate_all_items(),
+            clear_memoized_conversions,
+        )
+
+    return setup
+
+
+def _import_steel_beam_moment_strength():
+    from examples.steel_beam_moment_strength import calculation
+
+    return calculation
+
+
+def _import_rectangular_hss_compression_design():
+    from examples.rectangular_hss_compression_design import calculation
+
+    return calculation
+
+
+def _import_conc_col_pmm():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from examples.conc_col_pmm.calc_document.calculation import calculation
+
+    return calculation
+
+
+def _synthetic_calculation(item_count: int) -> Callable:
+    """A calculation function with `item_count` items that uses every common item type."""
+
+    def calculation():
+        a = Input("a", 12, "in", description="First dimension")
+        b = Input("b", 4, "in", description="Second dimension")
+        previous = Calculation("c_{0}", a * b, "in^2")
+        for i in range(1, item_count - 2):
+            kind = i % 6
+            if kind == 0:
+                Heading(f"Section {i}", head_level=2)
+            elif kind == 1:
+                Assumption(f"Assumption number {i}")
+            elif kind == 2:
+                TextBlock(f"Some descriptive text for item {i}.")
+            elif kind == 3:
+                previous = Calculation(
+                    f"c_{{{i}}}", previous / a + b * 2, "in", description="A step"
+                )
+            elif kind == 4:
+                previous = Calculation(f"c_{{{i}}}", sqrt(previous**2 + a**2), "in")
+            else:
+                Comparison(previous, "<", 1000)
+        Calculation("result", previous + 1, "in", result_check=True)
+
+    return calculation
+
+
+def _setup_generate_html(item_count: int):
+    def setup():
+        calculation = _synthetic_calculation(item_count)
+        items = []
+
+        def reset():
+            # New items have no memoized render keys or results from the previous call
+            clear_memoized_conversions()
+            items[:] = CalculationRunner(calculation).calculate_all_items()
+
+        return lambda: generate_html_for_calc_items(items), reset
+
+    return setup
+
+
+def _setup_section_query(use_catalog: bool = False):
+    def setup():
+        # The loaded catalog and the open database connection are what these scenarios measure, so they are kept
+        # between calls
+        return _section_query(use_catalog), clear_memoized_conversions
+
+    return setup
+
+
+def _section_query(use_catalog: bool):
+    from efficalc.sections import (
+        ALL_AISC_RECTANGULAR_NAMES,
+        ALL_AISC_WIDE_FLANGE_NAMES,
+        disable_section_catalog,
+        enable_section_catalog,
+        get_aisc_rectangular,
+        get_aisc_wide_flange,
+    )
+
+    if use_catalog:
+        enable_section_catalog().load_all()
+    else:
+        disable_section_catalog()
+
+    wide_flange_names = ALL_AISC_WIDE_FLANGE_NAMES[:100]
+    rectangular_names = ALL_AISC_RECTANGULAR_NAMES[:100]
+
+    def query_sections():
+        for name in wide_flange_names:
+            get_aisc_wide_flange(name)
+        for name in rectangular_names:
+            get_aisc_rectangular(name)
+
+    return query_sections
+
+
+def _setup_canvas_to_svg(element_count: int):
+    def setup():
+        from efficalc.canvas import (
+            ArrowMarker,
+            Canvas,
+            Circle,
+            Dimension,
+            Line,
+            Polyline,
+            Rectangle,
+            Text,
+        )
+
+        canvas = Canvas(1000, 1000, caption="Benchmark canvas")
+        clear_saved_objects()
+        for i in range(element_count):
+            x, y = i % 100 * 10, i // 100 % 100 * 10
+            kind = i % 6
+            if kind == 0:
+                canvas.add(Rectangle(x, y, 8, 6, fill="gray"))
+            elif kind == 1:
+                canvas.add(Circle(x, y, 3))
+            elif kind == 2:
+                canvas.add(Line(x, y, x + 9, y + 9, marker_end=ArrowMarker()))
+            elif kind == 3:
+                canvas.add(Polyline([(x, y), (x + 5, y + 2), (x + 9, y)]))
+            elif kind == 4:
+                canvas.add(Text(f"T{i}", x, y, font_size=4))
+            else:
+                canvas.add(Dimension(x, y, x + 9, y, unit="in"))
+        return canvas.to_svg, clear_memoized_conversions
+
+    return setup
+
+
+SCENARIOS = [
+    Scenario(
+        "runner_steel_beam_moment_strength",
+        _setup_example_runner(_import_steel_beam_moment_strength),
+    ),
+    Scenario(
+        "runner_rectangular_hss_compression_design",
+        _setup_example_runner(_import_rectangular_hss_compression_design),
+    ),
+    Scenario("runner_conc_col_pmm", _setup_example_runner(_import_conc_col_pmm)),
+    Scenario("generate_html_10_items", _setup_generate_html(10)),
+    Scenario("generate_html_1k_items", _setup_generate_html(1_000)),
+    Scenario("generate_html_10k_items", _setup_generate_html(10_000), slow=True),
+    Scenario("section_query_200_lookups", _setup_section_query()),
+    Scenario("section_catalog_200_lookups", _setup_section_query(use_catalog=True)),
+    Scenario("canvas_to_svg_1k_elements", _setup_canvas_to_svg(1_000)),
+    Scenario("canvas_to_svg_10k_elements", _setup_canvas_to_svg(10_000)),
+]
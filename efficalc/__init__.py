@@ -47,10 +47,13 @@ from .base_definitions.heading import Heading
 from .base_definitions.input import Input
 from .base_definitions.shared import (
     CalculationItem,
+    ResultCacheStats,
     clear_all_input_default_overrides,
     clear_saved_objects,
     get_all_calc_objects,
     get_override_or_default_value,
+    get_result_cache_stats,
+    reset_result_cache_stats,
     save_calculation_item,
     set_input_default_overrides,
 )
@@ -17,5 +17,8 @@ class Assumption(CalculationItem):
         self.text: str = assumption
         save_calculation_item(self)
 
+    def _get_render_key(self) -> tuple:
+        return (self.text,)
+
     def __str__(self):
         return f"{self.text}"
@@ -1,12 +1,18 @@
 from enum import Enum
 
 from latexexpr_efficalc import Expression, Operation, Variable
-from pylatexenc.latex2text import LatexNodes2Text
 
 from .input import Input
+from .latex_text import _latex_to_text
 from .shared import (
     CalculationItem,
+    _ExpressionReference,
     _get_float_or_str_safe_operation,
+    _get_operation_render_key,
+    _memoized_result,
+    _register_result_dependent,
+    _tracked_value_read,
+    _untracked_value_reads,
     save_calculation_item,
 )
 
@@ -57,13 +63,15 @@ class Calculation(Expression, CalculationItem):
 
         if unit is None:
             unit = ""
-        super().__init__(
-            variable_name, _get_float_or_str_safe_operation(expression), unit
-        )
+        with _untracked_value_reads():
+            super().__init__(
+                variable_name, _get_float_or_str_safe_operation(expression), unit
+            )
         self.description: str = description
         self.reference: str = reference
         self.result_check: bool = result_check
         self.error: str | None = None
+        _register_result_dependent(self, self.operation)
         save_calculation_item(self)
 
     def str_result_with_description(self) -> str:
@@ -85,6 +93,7 @@ class Calculation(Expression, CalculationItem):
     def result(self) -> float:
         """Returns the calculated result of the expression. If there is a ValueError or ZeroDivisionError, this will
         return 0 and set an error message in `self.error`.
+        The result is cached until the value of an upstream :class:`.Input` changes.
 
         :return: The result of the evaluated expression
         :rtype: float
@@ -97,6 +106,9 @@ class Calculation(Expression, CalculationItem):
             >>> print(c.get_value())
             5
         """
+        return _tracked_value_read(self, lambda: _memoized_result(self, self._evaluate))
+
+    def _evaluate(self) -> float:
         try:
             return super().result()
         except ValueError:
@@ -116,26 +128,43 @@ class Calculation(Expression, CalculationItem):
         """Alias for :func:`.Calculation.result`"""
         return self.result()
 
+    def to_variable(self, newName: str = "") -> Variable:
+        """Returns a variable with the current result of this calculation. This is used in place of this calculation
+        whenever it is part of another expression and stays linked to it so the result can be refreshed.
+        """
+        return _ExpressionReference(self, newName)
+
     def _estimate_operation_length(self):
-        latex_code = self.operation.str_substituted()
-        self.str_substituted()
-        return len(LatexNodes2Text().latex_to_text(latex_code))
+        return len(self._get_substituted_string())
 
     def _get_substituted_string(self):
-        latex_code = self.operation.str_substituted()
-        return LatexNodes2Text().latex_to_text(latex_code)
+        return _latex_to_text(self.operation.str_substituted())
 
     def _get_symbolic_string(self):
-        latex_code = self.operation.str_symbolic()
-        return LatexNodes2Text().latex_to_text(latex_code)
+        return _latex_to_text(self.operation.str_symbolic())
 
     def _get_result_string(self):
         try:
-            latex_code = self.operation.str_result()
-            return LatexNodes2Text().latex_to_text(latex_code)
+            return _latex_to_text(self.operation.str_result())
         except (ValueError, ZeroDivisionError):
             return ""
 
+    def _get_render_key(self) -> tuple:
+        # The LaTeX of the calculation is generated from these when it is rendered, which is what the key avoids
+        result = self.result()
+        return (
+            self.name,
+            self.description,
+            self.reference,
+            self.unit,
+            self.format,
+            self.unit_format,
+            self.exponent,
+            self.error,
+            _get_operation_render_key(self.operation),
+            repr(result),
+        )
+
     def estimate_display_length(self) -> CalculationLength:
         """Returns the estimated length of the LaTex formatted operation based on its symbolic and substituted
         representations.
@@ -151,19 +180,15 @@ class Calculation(Expression, CalculationItem):
             >>> c.estimate_display_length()
             CalculationLength.SHORT
         """
+        symbolic = self._get_symbolic_string()
+        substituted = self._get_substituted_string()
         if (
-            (
-                self._get_symbolic_string().strip()
-                == self._get_substituted_string().strip()
-            )
-            or (
-                self._get_substituted_string().strip()
-                == self._get_result_string().strip()
-            )
-            or (self._get_symbolic_string().strip() == f"{self.result()}")
+            symbolic.strip() == substituted.strip()
+            or substituted.strip() == self._get_result_string().strip()
+            or symbolic.strip() == f"{self.result()}"
         ):
             return CalculationLength.NUMBER
-        elif self._estimate_operation_length() <= 50:
+        elif len(substituted) <= 50:
             return CalculationLength.SHORT
         else:
             return CalculationLength.LONG
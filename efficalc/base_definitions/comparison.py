@@ -3,7 +3,13 @@ from typing import Literal
 from latexexpr_efficalc import Expression, Operation, Variable
 
 from .input import Input
-from .shared import OPERATOR_TO_LATEX, CalculationItem, save_calculation_item
+from .shared import (
+    OPERATOR_TO_LATEX,
+    CalculationItem,
+    _get_displayed_value_render_key,
+    _tracked_value_read,
+    save_calculation_item,
+)
 
 
 class Comparison(CalculationItem):
@@ -84,7 +90,9 @@ class Comparison(CalculationItem):
             >>> print(c.is_passing())
             False
         """
+        return _tracked_value_read(self, self._compare)
 
+    def _compare(self) -> bool:
         OPERATORS = {
             "<": "lt",
             "<=": "le",
@@ -182,5 +190,20 @@ class Comparison(CalculationItem):
         else:
             return rf"\ {left} \ & {comparison_symbol} \ {right}"
 
+    def _get_render_key(self) -> tuple:
+        # The LaTeX and message of the comparison are generated from these when it is rendered
+        passing = self.is_passing()
+        return (
+            self.description,
+            self.reference,
+            self.comparator,
+            _get_displayed_value_render_key(self.a),
+            _get_displayed_value_render_key(self.b),
+            passing,
+            self._error,
+            self.true_message,
+            self.false_message,
+        )
+
     def __str__(self) -> str:
         return f"Check {self.str_symbolic()} \\rightarrow {self.str_substituted()} \\therefore {self.get_message()}"
@@ -77,5 +77,8 @@ class ComparisonStatement(CalculationItem):
         else:
             return f"{str_inputs[0]} \ {OPERATOR_TO_LATEX[self.comparator]} \ {str_inputs[1]}"
 
+    def _get_render_key(self) -> tuple:
+        return self.description, self.reference, self.str_symbolic()
+
     def __str__(self):
         return self.str_symbolic()
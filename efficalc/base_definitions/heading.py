@@ -39,5 +39,8 @@ class Heading(CalculationItem):
         self.numbered = numbered
         save_calculation_item(self)
 
+    def _get_render_key(self) -> tuple:
+        return self.text, self.head_level, self.numbered
+
     def __str__(self):
         return f"{self.text}"
@@ -5,6 +5,8 @@ from latexexpr_efficalc import Variable
 
 from .shared import (
     CalculationItem,
+    _invalidate_dependent_results,
+    _tracked_value_read,
     get_override_or_default_value,
     save_calculation_item,
 )
@@ -83,6 +85,7 @@ class Input(Variable, CalculationItem):
             unit = ""
 
         super().__init__(variable_name, override_or_default_value, unit)
+        self.default_value = default_value
         self.description = description
         self.reference = reference
         self.num_step = num_step
@@ -115,7 +118,20 @@ class Input(Variable, CalculationItem):
             >>> print(a.get_value())
             1
         """
-        return self.value
+        return _tracked_value_read(self, lambda: self.value)
+
+    def _replace_value(self, value: int | float | str):
+        """Replaces the input value exactly as it is given, the same way the constructor stores it."""
+        self._value = value
+        self.set_format()
+        _invalidate_dependent_results(self)
+
+    def _set_value(self, value):
+        super()._set_value(value)
+        _invalidate_dependent_results(self)
+
+    # Changing the value of an input clears the cached results of every calculation that depends on it
+    value = property(Variable._get_value, _set_value)
 
     def _get_display_type(self) -> InputDisplayType:
         try:
@@ -124,6 +140,9 @@ class Input(Variable, CalculationItem):
         except ValueError:
             return InputDisplayType.TEXT
 
+    def _get_render_key(self) -> tuple:
+        return str(self), self.description, self.reference
+
     def __str__(self):
         if self._get_display_type() != InputDisplayType.NUMBER:
             text_value = (
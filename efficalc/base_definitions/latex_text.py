@@ -0,0 +1,112 @@
+import functools
+import re
+
+from pylatexenc import latexwalker
+from pylatexenc.latex2text import LatexNodes2Text
+
+# A single converter is shared by all calculation items instead of creating one for every conversion
+_CONVERTER = LatexNodes2Text()
+_LATEX_CONTEXT = latexwalker.get_default_latex_context_db()
+
+# Macros whose text is the text of their single argument
+_PASS_THROUGH_MACROS = {"mathrm", "text", "textrm"}
+# Macros that start environments or verbatim text can't be converted on their own
+_UNSUPPORTED_MACROS = {"begin", "end", "verb", "item", "url"}
+_CONTROL_SYMBOLS = {
+    "\\ ",
+    "\\,",
+    "\\;",
+    "\\:",
+    "\\!",
+    "\\{",
+    "\\}",
+    "\\#",
+    "\\%",
+    "\\&",
+    "\\_",
+}
+
+_PLAIN_TEXT = re.compile(r"[A-Za-z0-9 .,+\-*/=()\[\]<>!?:;|^_'`]+")
+# Character sequences that are converted to a different text (e.g. "--" to an en dash)
+_LIGATURES = ("--", "''", "``", "!`", "?`")
+_CONTROL_WORD = re.compile(r"\\([A-Za-z]+) *")
+
+
+def _latex_to_text(latex_code: str) -> str:
+    """Returns the plain text of a LaTeX string, the same as `LatexNodes2Text().latex_to_text(latex_code)`. Common
+    LaTeX of calculation expressions is converted with a fast tokenizer and everything else with the shared pylatexenc
+    converter. Results are memoized by LaTeX string."""
+    return _memoized_latex_to_text(latex_code)
+
+
+@functools.lru_cache(maxsize=8192)
+def _memoized_latex_to_text(latex_code: str) -> str:
+    text = _fast_latex_to_text(latex_code)
+    if text is None:
+        text = _CONVERTER.latex_to_text(latex_code)
+    return text
+
+
+def _fast_latex_to_text(latex_code: str) -> str | None:
+    """Converts LaTeX made of plain text, groups, macros without arguments, and text macros (e.g. `\\mathrm{in}`) to
+    plain text. Returns None for any LaTeX it does not handle exactly like pylatexenc.
+    """
+    if any(ligature in latex_code for ligature in _LIGATURES):
+        return None
+
+    parts = []
+    depth = 0
+    position = 0
+    length = len(latex_code)
+    while position < length:
+        char = latex_code[position]
+        if char == "{":
+            depth += 1
+            position += 1
+        elif char == "}":
+            depth -= 1
+            if depth < 0:
+                return None
+            position += 1
+        elif char == "\\":
+            word = _CONTROL_WORD.match(latex_code, position)
+            if word is None:
+                # A control symbol, e.g. "\ " or "\{"
+                symbol = latex_code[position : position + 2]
+                if symbol not in _CONTROL_SYMBOLS:
+                    return None
+                parts.append(_get_macro_text(symbol))
+                position += 2
+                continue
+
+            name = word.group(1)
+            position = word.end()
+            if name in _PASS_THROUGH_MACROS:
+                # The argument must be a group, which is then converted like any other group
+                if position >= length or latex_code[position] != "{":
+                    return None
+            elif name in _UNSUPPORTED_MACROS or not _has_no_arguments(name):
+                return None
+            else:
+                parts.append(_get_macro_text("\\" + name))
+        else:
+            plain = _PLAIN_TEXT.match(latex_code, position)
+            if plain is None:
+                return None
+            parts.append(plain.group())
+            position = plain.end()
+
+    if depth != 0:
+        return None
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _has_no_arguments(macro_name: str) -> bool:
+    spec = _LATEX_CONTEXT.get_macro_spec(macro_name)
+    return spec is None or getattr(spec.args_parser, "argspec", None) == ""
+
+
+@functools.lru_cache(maxsize=None)
+def _get_macro_text(macro: str) -> str:
+    return _CONVERTER.latex_to_text(macro)
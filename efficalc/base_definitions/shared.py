@@ -1,4 +1,8 @@
-import threading
+import dataclasses
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
 
 from latexexpr_efficalc import Expression, Operation, Variable
 
@@ -14,7 +18,15 @@ OPERATOR_TO_LATEX = {
 
 _DEFAULT_OVERRIDE_KEY = "default_overrides"
 _ALL_CALC_ITEMS_KEY = "all_calc_items"
-_THREAD_LOCAL_STORE = threading.local()
+_VALUE_READS_KEY = "value_reads"
+_UNTRACKED_READ_DEPTH_KEY = "untracked_read_depth"
+_RESULT_CACHE_STATS_KEY = "result_cache_stats"
+_PROFILER_KEY = "profiler"
+_ITEM_LISTENER_KEY = "item_listener"
+
+# Every thread and every asyncio task has its own context. Tasks start with a copy of the context they were created
+# in, so calculation runs set a new store of their own to never share one with runs on other tasks.
+_CALCULATION_STORE: ContextVar[dict] = ContextVar("efficalc_store")
 
 
 class CalculationItem(object):
@@ -22,32 +34,78 @@ class CalculationItem(object):
 
     super_type = "CalculationItem"
 
+    def _get_render_key(self) -> tuple | None:
+        """Returns everything the report HTML of this item is generated from, so items with equal keys have equal
+        HTML. Returns None if the HTML of this item type can't be cached."""
+        return None
+
+    def __getstate__(self):
+        # The links to dependent items are weak references, which can not be pickled. They are rebuilt on unpickling.
+        state = self.__dict__.copy()
+        state.pop("_result_dependents", None)
+        return state
 
-def _get_thread_local_store():
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if isinstance(self, Expression):
+            _register_result_dependent(self, self.operation)
 
-    if not hasattr(_THREAD_LOCAL_STORE, "efficalc_store"):
-        _THREAD_LOCAL_STORE.efficalc_store = {
+
+def _get_store() -> dict:
+    try:
+        return _CALCULATION_STORE.get()
+    except LookupError:
+        store = {
             _DEFAULT_OVERRIDE_KEY: {},
             _ALL_CALC_ITEMS_KEY: [],
+            _VALUE_READS_KEY: None,
+            _UNTRACKED_READ_DEPTH_KEY: 0,
+            _RESULT_CACHE_STATS_KEY: {"hits": 0, "misses": 0},
+            _PROFILER_KEY: None,
+            _ITEM_LISTENER_KEY: None,
         }
+        _CALCULATION_STORE.set(store)
+        return store
+
 
-    return _THREAD_LOCAL_STORE.efficalc_store
+@contextmanager
+def _isolated_calculation_store():
+    """Calculation items and input default overrides within this context are kept in a new store that is discarded
+    when the context exits, leaving the store of the current context unchanged. Value read recording and result cache
+    stats are shared with the current store, while item listeners only receive the items of their own store.
+    """
+    store = {
+        **_get_store(),
+        _DEFAULT_OVERRIDE_KEY: {},
+        _ALL_CALC_ITEMS_KEY: [],
+        _ITEM_LISTENER_KEY: None,
+    }
+    token = _CALCULATION_STORE.set(store)
+    try:
+        yield
+    finally:
+        _CALCULATION_STORE.reset(token)
 
 
 def save_calculation_item(item):
     """Save an item to the global store of all calculation items."""
-    _get_thread_local_store()[_ALL_CALC_ITEMS_KEY].append(item)
+    store = _get_store()
+    store[_ALL_CALC_ITEMS_KEY].append(item)
+    if store[_PROFILER_KEY] is not None:
+        store[_PROFILER_KEY]._record_item(item)
+    if store[_ITEM_LISTENER_KEY] is not None:
+        store[_ITEM_LISTENER_KEY](item)
 
 
 def clear_saved_objects():
     """Clear all saved calculation items from the global store."""
-    _get_thread_local_store()[_ALL_CALC_ITEMS_KEY] = []
+    _get_store()[_ALL_CALC_ITEMS_KEY] = []
 
 
 def get_override_or_default_value(input_name: str, default_value: any):
     """Get the default override value for a given input name from the global store. If no override is found, returns
     the default value."""
-    default_overrides: dict = _get_thread_local_store()[_DEFAULT_OVERRIDE_KEY]
+    default_overrides: dict = _get_store()[_DEFAULT_OVERRIDE_KEY]
     if default_overrides is not None and input_name in default_overrides:
         return default_overrides.get(input_name)
     else:
@@ -56,17 +114,310 @@ def get_override_or_default_value(input_name: str, default_value: any):
 
 def set_input_default_overrides(default_overrides: dict[str, any]):
     """Set default override values for input names in the global store."""
-    _get_thread_local_store()[_DEFAULT_OVERRIDE_KEY] = default_overrides
+    _get_store()[_DEFAULT_OVERRIDE_KEY] = default_overrides
 
 
 def get_all_calc_objects() -> list:
     """Get all calculation objects saved in the global store."""
-    return _get_thread_local_store()[_ALL_CALC_ITEMS_KEY]
+    return _get_store()[_ALL_CALC_ITEMS_KEY]
 
 
 def clear_all_input_default_overrides():
     """Clear all input default overrides from the global store."""
-    _get_thread_local_store()[_DEFAULT_OVERRIDE_KEY] = {}
+    _get_store()[_DEFAULT_OVERRIDE_KEY] = {}
+
+
+@contextmanager
+def _active_profiler(profiler):
+    """Items saved and results evaluated within this context are recorded by the profiler."""
+    store = _get_store()
+    previous_profiler = store[_PROFILER_KEY]
+    store[_PROFILER_KEY] = profiler
+    try:
+        yield
+    finally:
+        store[_PROFILER_KEY] = previous_profiler
+
+
+def _set_item_listener(listener: Callable[[any], None]):
+    """Call the listener with every item saved to the current store from now on."""
+    _get_store()[_ITEM_LISTENER_KEY] = listener
+
+
+def _start_recording_value_reads():
+    """Start recording the item values that are read by the calculation function itself (e.g. with
+    `Input.get_value()`), as opposed to the values read internally while evaluating calculation items.
+    """
+    store = _get_store()
+    store[_VALUE_READS_KEY] = []
+    store[_UNTRACKED_READ_DEPTH_KEY] = 0
+
+
+def _stop_recording_value_reads() -> list[tuple[any, any]]:
+    """Stop recording value reads and return the recorded `(item, value)` pairs in the order they were read."""
+    store = _get_store()
+    value_reads = store[_VALUE_READS_KEY]
+    store[_VALUE_READS_KEY] = None
+    return value_reads if value_reads is not None else []
+
+
+@contextmanager
+def _untracked_value_reads():
+    """Value reads within this context are internal to efficalc and are never recorded."""
+    store = _get_store()
+    store[_UNTRACKED_READ_DEPTH_KEY] += 1
+    try:
+        yield
+    finally:
+        store[_UNTRACKED_READ_DEPTH_KEY] -= 1
+
+
+def _tracked_value_read(item, read_value: Callable[[], any]):
+    """Read an item value with `read_value` and record it if value reads are being recorded. Any values read
+    while evaluating `read_value` are internal and are not recorded themselves."""
+    store = _get_store()
+    value_reads = store[_VALUE_READS_KEY]
+    if value_reads is None or store[_UNTRACKED_READ_DEPTH_KEY] > 0:
+        return read_value()
+
+    with _untracked_value_reads():
+        value = read_value()
+    value_reads.append((item, value))
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class ResultCacheStats(object):
+    """The number of :class:`.Calculation` and :class:`.Symbolic` results that were reused from the result cache
+    (hits) and that had to be evaluated (misses) in the current context (a thread or an asyncio task).
+
+    :param hits: The number of results returned from the cache
+    :type hits: int
+    :param misses: The number of results that were evaluated
+    :type misses: int
+    """
+
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of results returned from the cache, or 0 if no results have been requested."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def get_result_cache_stats() -> ResultCacheStats:
+    """Get the result cache hits and misses of the current context since the last
+    :func:`reset_result_cache_stats`."""
+    stats = _get_store()[_RESULT_CACHE_STATS_KEY]
+    return ResultCacheStats(stats["hits"], stats["misses"])
+
+
+def reset_result_cache_stats():
+    """Reset the result cache hits and misses of the current context to zero."""
+    stats = _get_store()[_RESULT_CACHE_STATS_KEY]
+    stats["hits"] = 0
+    stats["misses"] = 0
+
+
+def _get_result_dependents(item) -> weakref.WeakValueDictionary:
+    """The items whose cached results are computed directly from this item, by id. Dependents are only weakly
+    referenced so items that are shared between calculation runs (e.g. module level inputs) do not keep every
+    run alive."""
+    return item.__dict__.setdefault("_result_dependents", weakref.WeakValueDictionary())
+
+
+def _register_result_dependent(dependent, value):
+    """Register `dependent` as a dependent of every calculation item used within `value`."""
+    if isinstance(value, _ExpressionReference):
+        _register_result_dependent(dependent, value.expression)
+    elif isinstance(value, CalculationItem):
+        _get_result_dependents(value)[id(dependent)] = dependent
+    elif isinstance(value, Operation):
+        for arg in value.args:
+            _register_result_dependent(dependent, arg)
+    elif isinstance(value, Expression):
+        _register_result_dependent(dependent, value.operation)
+
+
+def _invalidate_dependent_results(item):
+    """Clear the cached results of every item that depends on this item, directly or indirectly."""
+    visited = set()
+    to_visit = [item]
+    while to_visit:
+        for dependent in list(_get_result_dependents(to_visit.pop()).values()):
+            if id(dependent) not in visited:
+                visited.add(id(dependent))
+                dependent._cached_result = None
+                to_visit.append(dependent)
+
+
+def _get_plain_variables(item) -> tuple:
+    """The plain latexexpr variables (e.g. unit conversion constants) used within the operation of an item or any of
+    its upstream items. Their values can change without invalidating the dependent results, so the cached results are
+    checked against their values instead."""
+    plain_variables = item.__dict__.get("_plain_variables")
+    if plain_variables is None:
+        found = {}
+        _collect_plain_variables(item.operation, found)
+        plain_variables = item._plain_variables = tuple(found.values())
+    return plain_variables
+
+
+def _collect_plain_variables(value, found: dict):
+    if isinstance(value, _ExpressionReference):
+        value = value.expression
+    if isinstance(value, CalculationItem):
+        if isinstance(value, Expression):
+            for variable in _get_plain_variables(value):
+                found[id(variable)] = variable
+    elif isinstance(value, Operation):
+        for arg in value.args:
+            _collect_plain_variables(arg, found)
+    elif isinstance(value, Expression):
+        _collect_plain_variables(value.operation, found)
+    elif isinstance(value, Variable):
+        found[id(value)] = value
+
+
+def _refresh_expression_references(value):
+    """Refresh the copied value of every :class:`_ExpressionReference` used within an operation."""
+    if isinstance(value, _ExpressionReference):
+        value.refresh()
+    elif isinstance(value, Operation):
+        for arg in value.args:
+            _refresh_expression_references(arg)
+
+
+def _memoized_result(item, evaluate: Callable[[], float]) -> float:
+    """Return the cached result of a calculation item or evaluate it with `evaluate` and cache it. The error message
+    set while evaluating (or None) is cached with the result and set again every time the cached result is returned,
+    the same as evaluating the item again would. The cached result is only returned while the plain variables used
+    upstream still have the values it was evaluated with."""
+    store = _get_store()
+    stats = store[_RESULT_CACHE_STATS_KEY]
+    cached_result = item.__dict__.get("_cached_result")
+    variable_values = tuple(v.value for v in _get_plain_variables(item))
+    if cached_result is not None and cached_result[2] == variable_values:
+        stats["hits"] += 1
+        value, item.error, _ = cached_result
+        return value
+
+    stats["misses"] += 1
+    # The copied values of upstream calculations are refreshed first. Their own results are cached, so this does not
+    # evaluate the rest of the upstream tree again.
+    _refresh_expression_references(item.operation)
+
+    # An item that was evaluated before is being evaluated again because an upstream value changed. Its error and
+    # format belong to the previous value, so they are replaced with those of the new value.
+    is_reevaluation = "_cached_result" in item.__dict__
+    item.error = None
+    profiler = store[_PROFILER_KEY]
+    if profiler is None:
+        value = evaluate()
+    else:
+        value = profiler._measure(item, "evaluate", evaluate)
+
+    item._cached_result = (value, item.error, variable_values)
+    if is_reevaluation:
+        _set_result_format(item, value)
+    return value
+
+
+def _set_result_format(item, value: float):
+    """Set the format of an item for its new result the same way `Expression.set_format` does, without reading
+    (and counting) the cached result again."""
+    if item.is_symbolic() or not isinstance(value, (int, float)):
+        return
+    item.format = "%.4g" if float(f"{value:.4g}") < 1000 else "%.0f"
+
+
+class _ExpressionReference(Variable):
+    """A copy of an expression's value that is used in place of the expression within an operation, the same as the
+    static variable latexexpr creates. It keeps a link back to the expression it was copied from so the copied value
+    can be refreshed when the value of the expression changes."""
+
+    def __init__(self, expression: Expression, name: str = ""):
+        self.expression = expression
+        super().__init__(
+            name if name else expression.name,
+            None,
+            expression.unit,
+            expression.format,
+            expression.unit_format,
+            expression.exponent,
+        )
+        self.refresh()
+
+    def refresh(self):
+        """Copy the current value of the linked expression."""
+        with _untracked_value_reads():
+            self.value = (
+                None if self.expression.is_symbolic() else float(self.expression)
+            )
+
+
+def _get_operation_render_key(value) -> tuple:
+    """Returns the structure of an operation with the displayed attributes of every variable in it. This is everything
+    the symbolic and substituted strings of the operation are generated from, without generating them.
+    """
+    if isinstance(value, Operation):
+        return (
+            value.type,
+            value.format,
+            value.exponent,
+            tuple(_get_operation_render_key(arg) for arg in value.args),
+        )
+    elif isinstance(value, Expression):
+        return (
+            value.name,
+            value.unit,
+            value.format,
+            value.unit_format,
+            value.exponent,
+            _get_operation_render_key(value.operation),
+        )
+    elif isinstance(value, Variable):
+        return (
+            type(value).__name__,
+            value.name,
+            value.value,
+            value.unit,
+            value.format,
+            value.unit_format,
+            value.exponent,
+        )
+    return (type(value).__name__, value)
+
+
+def _get_displayed_value_render_key(value) -> tuple:
+    """Returns the displayed attributes of a value that is shown by its name and result (e.g. an operand of a
+    comparison). Expressions are keyed on their cached result instead of the strings generated from it.
+    """
+    if isinstance(value, Expression):
+        return (
+            type(value).__name__,
+            value.name,
+            value.unit,
+            value.format,
+            value.unit_format,
+            value.exponent,
+            None if value.is_symbolic() else repr(value.result()),
+        )
+    return _get_operation_render_key(value)
+
+
+def _has_numeric_value(value) -> bool:
+    """Returns whether every variable within an operation has a numeric value, so the operation has a result to
+    evaluate. Checking never evaluates the operation."""
+    if isinstance(value, Operation):
+        return all(_has_numeric_value(arg) for arg in value.args)
+    elif isinstance(value, Expression):
+        return _has_numeric_value(value.operation)
+    elif isinstance(value, Variable):
+        return isinstance(value.value, (int, float))
+    return isinstance(value, (int, float))
 
 
 def _get_float_or_str_safe_operation(
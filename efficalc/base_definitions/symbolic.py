@@ -1,11 +1,17 @@
 from latexexpr_efficalc import Expression, Operation, Variable
-from pylatexenc.latex2text import LatexNodes2Text
 
 from .. import CalculationLength
 from .input import Input
+from .latex_text import _latex_to_text
 from .shared import (
     CalculationItem,
+    _ExpressionReference,
     _get_float_or_str_safe_operation,
+    _get_operation_render_key,
+    _memoized_result,
+    _register_result_dependent,
+    _tracked_value_read,
+    _untracked_value_reads,
     save_calculation_item,
 )
 
@@ -45,13 +51,15 @@ class Symbolic(Expression, CalculationItem):
         result_check: bool = False,
     ):
 
-        super().__init__(
-            variable_name, _get_float_or_str_safe_operation(expression), ""
-        )
+        with _untracked_value_reads():
+            super().__init__(
+                variable_name, _get_float_or_str_safe_operation(expression), ""
+            )
         self.description: str = description
         self.reference: str = reference
         self.result_check: bool = result_check
         self.error: str | None = None
+        _register_result_dependent(self, self.operation)
         save_calculation_item(self)
 
     def str_result_with_description(self) -> str:
@@ -71,6 +79,7 @@ class Symbolic(Expression, CalculationItem):
     def result(self) -> float:
         """Returns the calculated result of the expression. If there is a ValueError or ZeroDivisionError, this will
         return 0 and set an error message in `self.error`.
+        The result is cached until the value of an upstream :class:`.Input` changes.
 
         :return: The result of the evaluated expression
         :rtype: float
@@ -83,6 +92,9 @@ class Symbolic(Expression, CalculationItem):
             >>> print(c.result())
             5
         """
+        return _tracked_value_read(self, lambda: _memoized_result(self, self._evaluate))
+
+    def _evaluate(self) -> float:
         try:
             return super().result()
         except ValueError:
@@ -102,13 +114,26 @@ class Symbolic(Expression, CalculationItem):
         """Alias for :func:`.Symbolic.result`"""
         return self.result()
 
+    def to_variable(self, newName: str = "") -> Variable:
+        """Returns a variable with the current result of this expression. This is used in place of this expression
+        whenever it is part of another expression and stays linked to it so the result can be refreshed.
+        """
+        return _ExpressionReference(self, newName)
+
     def _estimate_operation_length(self):
-        latex_code = self.operation.str_symbolic()
-        return len(LatexNodes2Text().latex_to_text(latex_code))
+        return len(self._get_symbolic_string())
 
     def _get_symbolic_string(self):
-        latex_code = self.operation.str_symbolic()
-        return LatexNodes2Text().latex_to_text(latex_code)
+        return _latex_to_text(self.operation.str_symbolic())
+
+    def _get_render_key(self) -> tuple:
+        return (
+            self.name,
+            self.description,
+            self.reference,
+            self.error,
+            _get_operation_render_key(self.operation),
+        )
 
     def estimate_display_length(self) -> CalculationLength:
         """Returns the estimated length of the LaTex formatted operation based on its symbolic
@@ -16,5 +16,8 @@ class TextBlock(CalculationItem):
         self.reference: str = reference
         save_calculation_item(self)
 
+    def _get_render_key(self) -> tuple:
+        return self.text, self.reference
+
     def __str__(self):
         return f"{self.text}" if self.text else ""
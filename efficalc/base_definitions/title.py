@@ -13,5 +13,8 @@ class Title(CalculationItem):
         self.text: str = title
         save_calculation_item(self)
 
+    def _get_render_key(self) -> tuple:
+        return (self.text,)
+
     def __str__(self):
         return f"{self.text}"
@@ -0,0 +1,119 @@
+from typing import Iterable, List
+
+from latexexpr_efficalc import Expression, Operation
+
+from efficalc import Calculation, Comparison, Input, Symbolic
+from efficalc.base_definitions.shared import (
+    _ExpressionReference,
+    _refresh_expression_references,
+)
+
+
+def get_direct_dependencies(item) -> list:
+    """Returns the :class:`.Input`, :class:`.Calculation`, and :class:`.Symbolic` items that the value of a
+    calculation item is computed from directly. Items that do not have a value (e.g. :class:`.Heading`) have no
+    dependencies.
+
+    :param item: The calculation item to find the dependencies of
+    :return: The unique direct dependencies of the item in the order they appear in its expression
+    :rtype: list
+
+    .. code-block:: python
+
+        >>> a = Input("a", 1)
+        >>> b = Calculation("b", a * 2)
+        >>> c = Calculation("c", a + b)
+        >>> get_direct_dependencies(c)
+        [a, b]
+    """
+    if isinstance(item, (Calculation, Symbolic)):
+        values = [item.operation]
+    elif isinstance(item, Comparison):
+        values = [item.a, item.b]
+    else:
+        return []
+
+    dependencies = {}
+    for value in values:
+        _collect_dependencies(value, dependencies)
+    return list(dependencies.values())
+
+
+def _collect_dependencies(value, dependencies: dict):
+    if isinstance(value, (Input, Calculation, Symbolic)):
+        dependencies.setdefault(id(value), value)
+    elif isinstance(value, _ExpressionReference):
+        dependencies.setdefault(id(value.expression), value.expression)
+    elif isinstance(value, Operation):
+        for arg in value.args:
+            _collect_dependencies(arg, dependencies)
+    elif isinstance(value, Expression):
+        _collect_dependencies(value.operation, dependencies)
+
+
+def refresh_expression_references(item):
+    """Refreshes the copied values of every :class:`.Calculation` and :class:`.Symbolic` that is used within the
+    expression of a calculation item. Call this after the values of upstream items have changed, in topological order,
+    so the item evaluates with the new upstream values.
+
+    :param item: The calculation item whose expression references should be refreshed
+    """
+    if isinstance(item, (Calculation, Symbolic)):
+        _refresh_expression_references(item.operation)
+    elif isinstance(item, Comparison):
+        _refresh_expression_references(item.a)
+        _refresh_expression_references(item.b)
+
+
+class CalculationGraph(object):
+    """The dependency graph between the items of a single calculation run. Every item is a node and every
+    :class:`.Calculation`, :class:`.Symbolic` and :class:`.Comparison` has an edge from each of its direct
+    dependencies (see :func:`get_direct_dependencies`).
+
+    Calculation items can only be built from items that already exist, so the order the items were created in is
+    always a valid topological order of the graph.
+
+    :param calculation_items: All items created by a calculation function, in the order they were created
+    :type calculation_items: list
+    """
+
+    def __init__(self, calculation_items: list):
+        self.items = list(calculation_items)
+        self._order = {id(item): index for index, item in enumerate(self.items)}
+        self._dependents = {id(item): [] for item in self.items}
+
+        for item in self.items:
+            for dependency in get_direct_dependencies(item):
+                # Items created outside of this calculation run (e.g. module level constants) are not part of the graph
+                if id(dependency) in self._dependents:
+                    self._dependents[id(dependency)].append(item)
+
+    def get_dependents(self, item) -> list:
+        """Returns the items that are computed directly from the given item.
+
+        :param item: An item in this graph
+        :return: The direct dependents of the item in topological order
+        :rtype: list
+        """
+        return list(self._dependents.get(id(item), []))
+
+    def get_downstream_items(self, changed_items: Iterable) -> List:
+        """Returns every item whose value depends on any of the changed items, directly or indirectly. The changed
+        items themselves are not included.
+
+        :param changed_items: The items whose values have changed
+        :type changed_items: Iterable
+        :return: All downstream items in topological order
+        :rtype: list
+        """
+        changed_ids = {id(item) for item in changed_items}
+        downstream = {}
+        to_visit = list(changed_items)
+        while to_visit:
+            for dependent in self._dependents.get(id(to_visit.pop()), []):
+                dependent_id = id(dependent)
+                if dependent_id not in downstream and dependent_id not in changed_ids:
+                    downstream[dependent_id] = dependent
+                    to_visit.append(dependent)
+
+        return sorted(downstream.values(), key=lambda i: self._order[id(i)])
@@ -1,14 +1,46 @@
-from typing import Callable, Dict, List, Literal, Union, overload
+import contextvars
+import inspect
+import os
+import queue
+import threading
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    TextIO,
+    Tuple,
+    Union,
+    overload,
+)
 
 from efficalc import (
     Calculation,
     Comparison,
-    clear_all_input_default_overrides,
-    clear_saved_objects,
     get_all_calc_objects,
     set_input_default_overrides,
     Symbolic,
 )
+from efficalc.base_definitions.shared import (
+    _isolated_calculation_store,
+    _set_item_listener,
+    _start_recording_value_reads,
+    _stop_recording_value_reads,
+)
+from efficalc.profiling import CalculationProfiler
+from efficalc.result_cache import ResultCache
+from efficalc.result_export import to_result_record, write_jsonl
+from efficalc.vectorized import (
+    VectorizedResults,
+    _evaluate_vectorized,
+    _to_scalar_input_vals,
+)
 
 ResultType = Union[Calculation, Comparison]
 
@@ -20,16 +52,25 @@ class CalculationRunner(object):
 
     :param calc_function: The calculation function to be executed. This function should instantiate the relevant
                           calculation objects and perform the necessary calculations. The function is executed without
-                          input parameters and returned values are ignored.
+                          input parameters and returned values are ignored. It may be a coroutine function when it
+                          is run with the async methods.
     :type calc_function: Callable
     :param input_vals: A dictionary of input values to override default values in the calculation function's Input objects.
                        Defaults to an empty dictionary if not provided.
     :type input_vals: dict[str, any], optional
+    :param profiler: A profiler to record the time spent on each calculation item, defaults to None
+    :type profiler: :class:`.CalculationProfiler`, optional
     """
 
-    def __init__(self, calc_function: Callable, input_vals: dict[str, any] = None):
+    def __init__(
+        self,
+        calc_function: Callable,
+        input_vals: dict[str, any] = None,
+        profiler: CalculationProfiler = None,
+    ):
         self.calc_function = calc_function
         self.input_vals = input_vals if input_vals is not None else {}
+        self.profiler = profiler
 
     def calculate_all_items(self) -> list:
         """
@@ -39,27 +80,138 @@ class CalculationRunner(object):
         :return: A list of all calculation objects instantiated by the calculation function.
         :rtype: list
         """
-        clear_saved_objects()
-        clear_all_input_default_overrides()
+        with _isolated_calculation_store(), self._profile_phase("calc_function"):
+            set_input_default_overrides(self.input_vals)
+            self.calc_function()
+            return get_all_calc_objects()
+
+    async def calculate_all_items_async(self) -> list:
+        """
+        The async variant of :func:`calculate_all_items`. The calculation function may be a regular function or a
+        coroutine function. Every run keeps its calculation objects separate from any other run, so many
+        calculations can run concurrently as tasks on the same event loop without worker threads.
+
+        :return: A list of all calculation objects instantiated by the calculation function.
+        :rtype: list
+
+        .. code-block:: python
+
+            >>> runners = [CalculationRunner(calculation, inputs) for inputs in input_sets]
+            >>> all_results = await asyncio.gather(*(r.calculate_results_async() for r in runners))
+        """
+        with _isolated_calculation_store(), self._profile_phase("calc_function"):
+            set_input_default_overrides(self.input_vals)
+            result = self.calc_function()
+            if inspect.isawaitable(result):
+                await result
+            return get_all_calc_objects()
+
+    def stream_all_items(self, max_queued: int = 64) -> Iterator:
+        """
+        Executes the calculation function and yields each calculation object while the calculation function is still
+        running, instead of waiting for the whole calculation function to finish like :func:`calculate_all_items`.
+
+        Each item is yielded once the calculation function has created the next item (or finished), so the item is
+        completely constructed and evaluated and can be rendered or exported right away, unless the calculation
+        function changes it again later (e.g. by setting the value of an input). Pass the iterator to
+        :func:`.write_html_for_calc_items` to write the report HTML of each item while the calculation is running,
+        with the headings numbered the same as a report of all items.
+
+        The calculation function runs on a worker thread. When `max_queued` items are waiting to be consumed, the
+        calculation function is paused until the next item is taken, so a slow consumer never holds more than
+        `max_queued` unconsumed items. Any exception raised by the calculation function is raised by the iterator
+        after the items created before it. If the iterator is closed before the end, the calculation function is
+        stopped the next time it creates an item.
+
+        :param max_queued: The maximum number of created items waiting to be consumed, defaults to 64
+        :type max_queued: int, optional
+        :return: An iterator of all calculation objects instantiated by the calculation function, in order.
+        :rtype: Iterator
+
+        .. code-block:: python
+
+            >>> stream = CalculationRunner(calculation, inputs).stream_all_items()
+            >>> write_html_for_calc_items(stream, response)
+        """
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1.")
+
+        messages = queue.Queue(maxsize=max_queued)
+        closed = threading.Event()
+
+        def put_message(message) -> bool:
+            while not closed.is_set():
+                try:
+                    messages.put(message, timeout=0.05)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        # An item can still be changed right after it is saved (e.g. by the constructor of a subclass), so each item is
+        # held back until the next one is saved
+        created_item = None
+
+        def send_created_item() -> bool:
+            return created_item is None or put_message(("item", created_item))
 
-        set_input_default_overrides(self.input_vals)
-        self.calc_function()
-        all_calc_objects = get_all_calc_objects()
+        def send_item(item):
+            nonlocal created_item
+            if not send_created_item():
+                raise _StreamClosed()
+            created_item = item
 
-        clear_all_input_default_overrides()
-        clear_saved_objects()
-        return all_calc_objects
+        def run_calc_function():
+            try:
+                with (
+                    _isolated_calculation_store(),
+                    self._profile_phase("calc_function"),
+                ):
+                    _set_item_listener(send_item)
+                    set_input_default_overrides(self.input_vals)
+                    self.calc_function()
+            except _StreamClosed:
+                return
+            except BaseException as error:
+                if send_created_item():
+                    put_message(("error", error))
+                return
+            if send_created_item():
+                put_message(("done", None))
+
+        # The worker starts with a copy of the current context so it shares the result cache stats of this one
+        worker = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(run_calc_function,),
+            name="efficalc-stream",
+            daemon=True,
+        )
+        worker.start()
+        try:
+            while True:
+                kind, value = messages.get()
+                if kind == "item":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            closed.set()
+            worker.join()
 
     @overload
-    def calculate_results(self, return_type: Literal["list"]) -> List[ResultType]: ...
+    def calculate_results(
+        self, return_type: Literal["list"], cache: ResultCache = None
+    ) -> List[ResultType]: ...
 
     @overload
     def calculate_results(
-        self, return_type: Literal["dict"]
+        self, return_type: Literal["dict"], cache: ResultCache = None
     ) -> Dict[str, ResultType]: ...
 
     def calculate_results(
-        self, return_type: Literal["list", "dict"] = "list"
+        self, return_type: Literal["list", "dict"] = "list", cache: ResultCache = None
     ) -> Union[List[ResultType], Dict[str, ResultType]]:
         """
         Executes the calculation function and filters the results to return only those Calculation and Comparison
@@ -69,17 +221,213 @@ class CalculationRunner(object):
         :param return_type: The type of the return value, "list" for a list of calculation objects,
                             "dict" for a dictionary of calculation objects with their names as keys, defaults to "list"
         :type: return_type: "list" or "dict", optional
+        :param cache: A cache to return the results from if this calculation function was already run with the same
+                      input values, defaults to None
+        :type cache: :class:`.ResultCache`, optional
         :return: A list or a dictionary of calculation objects where result_check=True.
         """
-        all_calc_objects = self.calculate_all_items()
+        if cache is None:
+            return self._filter_results(self.calculate_all_items(), return_type)
+
+        if return_type not in ("list", "dict"):
+            raise ValueError("Invalid return_type specified. Use 'list' or 'dict'.")
+
+        key = cache.make_key(
+            self.calc_function, self.input_vals, f"results-{return_type}"
+        )
+        return cache.get_or_compute(
+            key,
+            lambda: self._filter_results(self.calculate_all_items(), return_type),
+        )
+
+    async def calculate_results_async(
+        self, return_type: Literal["list", "dict"] = "list"
+    ) -> Union[List[ResultType], Dict[str, ResultType]]:
+        """
+        The async variant of :func:`calculate_results`, see :func:`calculate_all_items_async`.
+
+        :param return_type: The type of the return value, "list" for a list of calculation objects,
+                            "dict" for a dictionary of calculation objects with their names as keys, defaults to "list"
+        :type: return_type: "list" or "dict", optional
+        :return: A list or a dictionary of calculation objects where result_check=True.
+        """
+        all_calc_objects = await self.calculate_all_items_async()
+        return self._filter_results(all_calc_objects, return_type)
+
+    def iter_result_records(
+        self, results_only: bool = False, include_symbolic: bool = False
+    ) -> Iterator[dict]:
+        """
+        Executes the calculation function and yields a plain dictionary with the name, value, unit, pass/fail status,
+        message, and error of every calculation object with a result (see :func:`.to_result_record`). The records
+        can be serialized as JSON or sent between processes, unlike the calculation objects themselves, and are
+        produced without generating any report HTML.
 
+        :param results_only: Only include the objects where result_check=True, defaults to False
+        :type results_only: bool, optional
+        :param include_symbolic: Include the symbolic and substituted LaTeX strings of every object, defaults to False
+        :type include_symbolic: bool, optional
+        :return: An iterator of the result records in the order the objects were created.
+        :rtype: Iterator[dict]
+        """
+        for item in self.calculate_all_items():
+            if results_only and not self._is_calculated_result(item):
+                continue
+            record = to_result_record(item, include_symbolic)
+            if record is not None:
+                yield record
+
+    def write_results_jsonl(
+        self,
+        writer: TextIO,
+        results_only: bool = False,
+        include_symbolic: bool = False,
+    ) -> int:
+        """
+        Executes the calculation function and writes the result records (see :func:`iter_result_records`) as JSON
+        Lines, one JSON object per line.
+
+        :param writer: Any object with a `write(str)` method, e.g. an open text file or a `io.StringIO`
+        :type writer: TextIO
+        :param results_only: Only include the objects where result_check=True, defaults to False
+        :type results_only: bool, optional
+        :param include_symbolic: Include the symbolic and substituted LaTeX strings of every object, defaults to False
+        :type include_symbolic: bool, optional
+        :return: The number of records written
+        :rtype: int
+
+        .. code-block:: python
+
+            >>> with open("results.jsonl", "w") as file:
+            ...     CalculationRunner(calculation, {"L_b": 20}).write_results_jsonl(file, results_only=True)
+        """
+        return write_jsonl(
+            self.iter_result_records(results_only, include_symbolic), writer
+        )
+
+    def calculate_vectorized_results(self) -> VectorizedResults:
+        """
+        Evaluates the calculation function for arrays of input values at once. Any input value may be a NumPy array
+        and all array input values are broadcast together, so every element of the results is the result of a single
+        run with the matching elements of the input arrays. Requires NumPy to be installed.
+
+        The calculation function is run once with the first element of each array to record its calculation items,
+        then every result is computed with array operations instead of running the calculation function for every
+        element. Calculation functions that read the value of an item that depends on an array input to control
+        their flow (e.g. ``if M_u.result() > M_n.result():``) may take a different path for each element, so they are
+        run once for every element instead. This gives the same results but is not faster than running each element
+        on its own.
+
+        :return: The result arrays and error masks of every Calculation and Comparison where result_check=True,
+            see :class:`.VectorizedResults`.
+        :rtype: VectorizedResults
+
+        .. code-block:: python
+
+            >>> spans = numpy.linspace(10, 40, 1000)
+            >>> results = CalculationRunner(calculation, {"L_b": spans}).calculate_vectorized_results()
+            >>> results.values["M_n"]
+            array([...])
+        """
+        scalar_input_vals = _to_scalar_input_vals(self.input_vals)
+
+        _start_recording_value_reads()
+        try:
+            all_calc_objects = CalculationRunner(
+                self.calc_function, scalar_input_vals
+            ).calculate_all_items()
+        finally:
+            value_reads = _stop_recording_value_reads()
+
+        return _evaluate_vectorized(
+            all_calc_objects,
+            value_reads,
+            self.input_vals,
+            lambda input_vals: CalculationRunner(
+                self.calc_function, input_vals
+            ).calculate_all_items(),
+        )
+
+    @classmethod
+    def run_many(
+        cls,
+        calc_function: Callable,
+        input_sets: Iterable[dict[str, any]],
+        return_type: Literal["list", "dict"] = "list",
+        max_workers: int = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        initializer: Callable = None,
+        initargs: tuple = (),
+    ) -> Iterator[Tuple[int, Union[List[ResultType], Dict[str, ResultType]]]]:
+        """
+        Runs the calculation function once for every set of input values on a pool of worker processes and yields the
+        results of each run as they become available. Each worker process keeps its own calculation item store, so
+        runs never share state with each other.
+
+        The calculation function (and the initializer, if one is provided) must be picklable, i.e. defined at the top
+        level of a module. Lambdas and nested functions can not be sent to worker processes.
+
+        :param calc_function: The calculation function to be executed for every set of input values.
+        :type calc_function: Callable
+        :param input_sets: An iterable of input value dictionaries. Each one is used as the `input_vals` of a single
+            :class:`CalculationRunner` run.
+        :type input_sets: Iterable[dict[str, any]]
+        :param return_type: The type of the results for each run, see :func:`calculate_results`, defaults to "list"
+        :type return_type: "list" or "dict", optional
+        :param max_workers: The number of worker processes, defaults to the number of processors on the machine
+        :type max_workers: int, optional
+        :param chunksize: The number of input sets sent to a worker process at a time. Larger chunks reduce the
+            inter-process overhead for very fast calculation functions, defaults to 1
+        :type chunksize: int, optional
+        :param ordered: If True, results are yielded in the same order as `input_sets`. If False, results are yielded
+            as soon as each run finishes, defaults to True
+        :type ordered: bool, optional
+        :param initializer: A callable that is run once at the start of each worker process, defaults to None
+        :type initializer: Callable, optional
+        :param initargs: The arguments passed to the `initializer`, defaults to ()
+        :type initargs: tuple, optional
+        :return: An iterator of `(index, results)` tuples where `index` is the position of the input set in
+            `input_sets` and `results` is the return value of :func:`calculate_results` for that input set.
+
+        .. code-block:: python
+
+            >>> all_inputs = [{"M_u": 30, "L_b": 10}, {"M_u": 50, "L_b": 20}]
+            >>> for index, results in CalculationRunner.run_many(calculation, all_inputs):
+            ...     print(index, [r.get_value() for r in results])
+        """
+        if return_type not in ("list", "dict"):
+            raise ValueError("Invalid return_type specified. Use 'list' or 'dict'.")
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1.")
+
+        yield from _run_chunks_in_process_pool(
+            _run_calculation_chunk,
+            (calc_function, return_type),
+            input_sets,
+            max_workers,
+            chunksize,
+            ordered,
+            initializer,
+            initargs,
+        )
+
+    def _profile_phase(self, phase: str):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler._run_phase(phase)
+
+    @classmethod
+    def _filter_results(
+        cls, all_calc_objects: list, return_type: Literal["list", "dict"]
+    ) -> Union[List[ResultType], Dict[str, ResultType]]:
         if return_type == "list":
-            return list(filter(self._is_calculated_result, all_calc_objects))
+            return list(filter(cls._is_calculated_result, all_calc_objects))
         elif return_type == "dict":
             return {
                 item.name: item
                 for item in all_calc_objects
-                if self._is_calculated_result(item)
+                if cls._is_calculated_result(item)
             }
         else:
             raise ValueError("Invalid return_type specified. Use 'list' or 'dict'.")
@@ -93,3 +441,87 @@ class CalculationRunner(object):
         ):
             return False
         return ob.result_check
+
+
+class _StreamClosed(BaseException):
+    """Stops a streamed calculation function after its iterator was closed. This is not an Exception subclass so it is
+    not caught by the calculation function itself."""
+
+
+def _chunk_input_sets(
+    input_sets: Iterable[dict[str, any]], chunksize: int
+) -> Iterator[List[Tuple[int, dict[str, any]]]]:
+    indexed_input_sets = enumerate(input_sets)
+    while True:
+        chunk = list(islice(indexed_input_sets, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunks_in_process_pool(
+    chunk_function: Callable,
+    chunk_args: tuple,
+    input_sets: Iterable[dict[str, any]],
+    max_workers: int = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    initializer: Callable = None,
+    initargs: tuple = (),
+) -> Iterator[tuple[int, any]]:
+    """Calls `chunk_function(*chunk_args, chunk)` for chunks of the indexed input sets on a pool of worker processes and
+    yields the `(index, result)` tuples returned for every chunk."""
+    worker_count = max_workers if max_workers is not None else os.cpu_count() or 1
+    # Keep a bounded number of chunks in flight so very large input iterables are consumed lazily
+    max_pending = 2 * worker_count
+    chunks = _chunk_input_sets(input_sets, chunksize)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=initializer, initargs=initargs
+    ) as executor:
+
+        def submit_next_chunk():
+            chunk = next(chunks, None)
+            if chunk is None:
+                return None
+            return executor.submit(chunk_function, *chunk_args, chunk)
+
+        pending = deque()
+        for _ in range(max_pending):
+            future = submit_next_chunk()
+            if future is None:
+                break
+            pending.append(future)
+
+        try:
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    done_set, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [f for f in pending if f in done_set]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    next_future = submit_next_chunk()
+                    if next_future is not None:
+                        pending.append(next_future)
+                    yield from future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _run_calculation_chunk(
+    calc_function: Callable,
+    return_type: Literal["list", "dict"],
+    chunk: List[Tuple[int, dict[str, any]]],
+) -> list:
+    return [
+        (
+            index,
+            CalculationRunner(calc_function, input_vals).calculate_results(return_type),
+        )
+        for index, input_vals in chunk
+    ]
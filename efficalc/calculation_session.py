@@ -0,0 +1,115 @@
+import heapq
+from typing import Callable
+
+from efficalc import Calculation, Comparison, Input, Symbolic
+from efficalc.calculation_graph import refresh_expression_references
+from efficalc.compiled_calculation import CompiledCalculation
+
+
+class CalculationSession(object):
+    """A live calculation for interactive use (e.g. a notebook slider or a design portal). The calculation function is
+    run once and then single input values can be changed one at a time. Each change only recomputes the items
+    downstream of the changed input, in topological order, and stops early wherever a recomputed value did not
+    change. The items that changed are returned so a user interface can update just those items.
+
+    If the calculation function reads a value to change its control flow (see :class:`.CompiledCalculation`) and that
+    value changes, the calculation function is run again in full and every item is new.
+
+    :param calc_function: The calculation function for the session. See :class:`.CalculationRunner`.
+    :type calc_function: Callable
+    :param input_vals: The starting input values of the session, defaults to the default values
+    :type input_vals: dict[str, any], optional
+
+    .. code-block:: python
+
+        >>> session = CalculationSession(calculation)
+        >>> changed = session.set_input_value("L_b", 24)
+        >>> for item in changed:
+        ...     update_display(item)
+    """
+
+    def __init__(self, calc_function: Callable, input_vals: dict[str, any] = None):
+        self.calc_function = calc_function
+        self.input_vals = dict(input_vals) if input_vals is not None else {}
+        self._compile()
+
+    @property
+    def items(self) -> list:
+        """All calculation items of the session with the current input values, in the order they were created."""
+        return list(self._compiled.graph.items)
+
+    def set_input_value(self, name: str, value: int | float | str) -> list:
+        """Changes the value of a single input and recomputes the items that depend on it.
+
+        :param name: The name of the :class:`.Input` to change
+        :type name: str
+        :param value: The new value of the input
+        :type value: int, float, or str
+        :return: The items that changed, including the input itself, in the order they were created. The list is
+            empty if the value did not change.
+        :rtype: list
+        """
+        if name not in self._inputs:
+            raise ValueError(f"The calculation does not have an input named {name}.")
+
+        input_item = self._inputs[name]
+        if value == input_item.value and type(value) is type(input_item.value):
+            return []
+
+        self.input_vals[name] = value
+        input_item._replace_value(value)
+
+        graph = self._compiled.graph
+        order = {id(item): index for index, item in enumerate(graph.items)}
+        changed = [input_item]
+        to_update = []
+        queued = set()
+
+        def queue_dependents(item):
+            for dependent in graph.get_dependents(item):
+                if id(dependent) not in queued:
+                    queued.add(id(dependent))
+                    heapq.heappush(to_update, (order[id(dependent)], dependent))
+
+        queue_dependents(input_item)
+        while to_update:
+            _, item = heapq.heappop(to_update)
+            refresh_expression_references(item)
+            if isinstance(item, (Calculation, Symbolic)):
+                item.set_format()
+                item.error = None
+
+            # The item is displayed with the changed values of its dependencies, so it has always changed, but the
+            # items downstream of it only need to be recomputed if its own value changed
+            changed.append(item)
+            new_value = self._get_item_value(item)
+            if new_value != self._values.get(id(item)):
+                self._values[id(item)] = new_value
+                queue_dependents(item)
+
+        if not self._compiled._guards_hold():
+            self._compile()
+            return self.items
+
+        return changed
+
+    def _compile(self):
+        self._compiled = CompiledCalculation(self.calc_function, self.input_vals)
+        self._inputs = {
+            item.name: item
+            for item in self._compiled.graph.items
+            if isinstance(item, Input)
+        }
+        self._values = {
+            id(item): self._get_item_value(item)
+            for item in self._compiled.graph.items
+            if isinstance(item, (Calculation, Symbolic, Comparison))
+        }
+
+    @staticmethod
+    def _get_item_value(item):
+        if isinstance(item, Comparison):
+            return item.is_passing()
+        if item.is_symbolic():
+            return None
+        return item.result(), item.error
@@ -0,0 +1,163 @@
+from typing import Callable, Dict, List, Literal, Union
+
+from efficalc import Calculation, Comparison, Input, InputTable, Symbolic
+from efficalc.base_definitions.shared import (
+    _start_recording_value_reads,
+    _stop_recording_value_reads,
+)
+from efficalc.calculation_graph import (
+    CalculationGraph,
+    refresh_expression_references,
+)
+from efficalc.calculation_runner import CalculationRunner, ResultType
+
+
+class CompiledCalculation(object):
+    """A calculation function that is run once and then re-evaluated for new input values without running the
+    calculation function again. The calculation items from the first run are kept along with the dependency graph
+    between them, so new input values only update the numbers of the :class:`.Calculation` and :class:`.Comparison`
+    items that depend on the changed inputs.
+
+    Calculation functions may read values to change their control flow, for example
+    ``if fc.get_value() <= 4000:``. Every value that the calculation function reads itself with `get_value()`,
+    `result()`, or `is_passing()` is recorded as a guard. If new input values change a guarded value, the
+    calculation function is run again in full instead. Values read in other ways (e.g. ``float(fc)``) are not
+    detected, so use `get_value()` in calculation functions that are compiled. The full run is compiled again
+    and replaces the template, so later calls with the same control flow are re-evaluated without running the
+    calculation function.
+
+    The returned calculation items are shared with the compiled template and are updated in place by the next call,
+    so use the results of one call before making the next one. Compiled calculations are not thread-safe.
+
+    :param calc_function: The calculation function to be compiled. See :class:`.CalculationRunner`.
+    :type calc_function: Callable
+    :param input_vals: The input values to record the calculation function with, defaults to the default values
+    :type input_vals: dict[str, any], optional
+
+    .. code-block:: python
+
+        >>> compiled = CompiledCalculation(calculation)
+        >>> for span in range(10, 40):
+        ...     results = compiled.calculate_results({"L_b": span}, "dict")
+        ...     print(results["M_n"].result())
+    """
+
+    def __init__(self, calc_function: Callable, input_vals: dict[str, any] = None):
+        self.calc_function = calc_function
+        self._compile(input_vals if input_vals is not None else {})
+
+    def _compile(self, input_vals: dict[str, any]):
+        """Run the calculation function in full with the given input values and keep its items as the template for
+        the next calls."""
+        self.input_vals = input_vals
+
+        _start_recording_value_reads()
+        try:
+            self._items = CalculationRunner(
+                self.calc_function, self.input_vals
+            ).calculate_all_items()
+        finally:
+            self._guards = _stop_recording_value_reads()
+
+        self.graph = CalculationGraph(self._items)
+        self._inputs = [item for item in self._items if isinstance(item, Input)]
+        self._input_tables = [
+            item for item in self._items if isinstance(item, InputTable)
+        ]
+
+    @property
+    def has_guards(self) -> bool:
+        """True if the calculation function read any values itself while it was compiled. New input values that
+        change those values will cause a full run of the calculation function."""
+        return len(self._guards) > 0
+
+    def calculate_all_items(self, input_vals: dict[str, any] = None) -> list:
+        """Returns all calculation items for the given input values, see :func:`.CalculationRunner.calculate_all_items`.
+        Inputs that are not provided use their default values.
+
+        :param input_vals: The input values to override the default values of the calculation function's inputs,
+            defaults to None
+        :type input_vals: dict[str, any], optional
+        :return: A list of all calculation items evaluated with the given input values.
+        :rtype: list
+        """
+        input_vals = input_vals if input_vals is not None else {}
+
+        if self._input_tables_changed(input_vals):
+            return self._run_full_calculation(input_vals)
+
+        changed_inputs = []
+        for input_item in self._inputs:
+            new_value = input_vals.get(input_item.name, input_item.default_value)
+            if new_value != input_item.value or type(new_value) is not type(
+                input_item.value
+            ):
+                input_item._replace_value(new_value)
+                changed_inputs.append(input_item)
+
+        for item in self.graph.get_downstream_items(changed_inputs):
+            refresh_expression_references(item)
+            if isinstance(item, (Calculation, Symbolic)):
+                item.set_format()
+                item.error = None
+
+        if not self._guards_hold():
+            return self._run_full_calculation(input_vals)
+
+        return list(self._items)
+
+    def calculate_results(
+        self,
+        input_vals: dict[str, any] = None,
+        return_type: Literal["list", "dict"] = "list",
+    ) -> Union[List[ResultType], Dict[str, ResultType]]:
+        """Returns the calculation items marked as results for the given input values, see
+        :func:`.CalculationRunner.calculate_results`.
+
+        :param input_vals: The input values to override the default values of the calculation function's inputs,
+            defaults to None
+        :type input_vals: dict[str, any], optional
+        :param return_type: The type of the return value, "list" for a list of calculation objects,
+            "dict" for a dictionary of calculation objects with their names as keys, defaults to "list"
+        :type: return_type: "list" or "dict", optional
+        :return: A list or a dictionary of calculation objects where result_check=True.
+        """
+        all_calc_objects = self.calculate_all_items(input_vals)
+
+        if return_type == "list":
+            return list(
+                filter(CalculationRunner._is_calculated_result, all_calc_objects)
+            )
+        elif return_type == "dict":
+            return {
+                item.name: item
+                for item in all_calc_objects
+                if CalculationRunner._is_calculated_result(item)
+            }
+        else:
+            raise ValueError("Invalid return_type specified. Use 'list' or 'dict'.")
+
+    def _input_tables_changed(self, input_vals: dict[str, any]) -> bool:
+        return any(
+            input_vals.get(table.identifier) != self.input_vals.get(table.identifier)
+            for table in self._input_tables
+        )
+
+    def _guards_hold(self) -> bool:
+        for item, recorded_value in self._guards:
+            if isinstance(item, Input):
+                current_value = item.value
+            elif isinstance(item, Comparison):
+                current_value = item.is_passing()
+            else:
+                current_value = item.result()
+
+            if current_value != recorded_value:
+                return False
+        return True
+
+    def _run_full_calculation(self, input_vals: dict[str, any]) -> list:
+        # The template no longer matches the control flow of the calculation function for these input values, so it
+        # is compiled again from this run. Later calls that keep the new control flow are re-evaluated again.
+        self._compile(dict(input_vals))
+        return list(self._items)
@@ -1,8 +1,25 @@
+import contextvars
+import functools
+import hashlib
 import html
+import importlib.util
+import os
+import re
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Literal, TextIO
+
+# Check whether latex2mathml is installed. If so, import it to pre-render report math as MathML.
+# Do not attempt to import if not installed.
+latex2mathml_installed = importlib.util.find_spec("latex2mathml")
+if latex2mathml_installed:
+    from latex2mathml.converter import convert as convert_latex_to_mathml
 
 from efficalc import (
     Assumption,
     Calculation,
+    CalculationItem,
     CalculationLength,
     Comparison,
     ComparisonStatement,
@@ -15,109 +32,284 @@ from efficalc import (
     Title,
 )
 from efficalc.canvas import Canvas
+from efficalc.renderers import (
+    RendererRegistry,
+    RenderContext,
+    _iter_with_header_numbers,
+)
+from efficalc.result_cache import ResultCache
 
 CALC_MARGIN = "margin-left: 2rem;"
 ALIGN = "&"
 LINE_BREAK = r"\\[4pt]"
 CALC_ITEM_WRAPPER_CLASS = "calc-item"
-
-
-def generate_html_for_calc_items(calculation_items: list) -> str:
+LAZY_ROWS_CLASS = "lazy-rows"
+
+# Expands the lazy table rows written by _iter_result_table_html when their table is scrolled into view or printed
+LAZY_ROWS_SCRIPT = f"""
+    <script>
+        (() => {{
+            const expand = (root) => root.querySelectorAll("template.{LAZY_ROWS_CLASS}").forEach(
+                (template) => template.replaceWith(template.content)
+            );
+            const observer = new IntersectionObserver((entries) => entries.forEach((entry) => {{
+                if (entry.isIntersecting) {{
+                    observer.unobserve(entry.target);
+                    expand(entry.target);
+                }}
+            }}), {{ rootMargin: "1000px" }});
+            document.querySelectorAll("template.{LAZY_ROWS_CLASS}").forEach(
+                (template) => observer.observe(template.closest("table"))
+            );
+            window.addEventListener("beforeprint", () => expand(document));
+        }})();
+    </script>"""
+
+# The display and inline math written by _wrap_math and _wrap_math_inline
+_DISPLAY_MATH = re.compile(r"(?<!\\)\\\[ (.*?) \\\]", re.DOTALL)
+_INLINE_MATH = re.compile(r"(?<!\\)\\\( (.*?) \\\)", re.DOTALL)
+
+_TABLE_ROWS_PER_PART = 500
+
+
+def generate_html_for_calc_items(
+    calculation_items: list,
+    max_workers: int = None,
+    prerender_math: bool = False,
+    fragment_cache: ResultCache = None,
+) -> str:
     """Generates a string containing HTML elements for displaying the provided calculation items. The calculations
     within the HTML elements will be written as plain LaTex to be reformatted via a polyfill or other formatter.
 
     :param calculation_items: A list of calculation items to generate the HTML for.
     :type calculation_items: list
+    :param max_workers: The number of threads that render items (and load figure images) concurrently. The HTML is
+        always the same as rendering the items one by one. Defaults to None, which renders items one by one.
+    :type max_workers: int, optional
+    :param prerender_math: Convert the LaTeX to static MathML instead of leaving it to be typeset in the browser.
+        Requires the `latex2mathml` package to be installed, defaults to False
+    :type prerender_math: bool, optional
+    :param fragment_cache: A cache for the HTML of single items. Items with the same content (e.g. the same text, or
+        the same expression and result) reuse the cached HTML instead of being rendered again, also across runs and
+        reports. Tables, figures, and canvases are always rendered. Defaults to None
+    :type fragment_cache: :class:`.ResultCache`, optional
     :return: HTML for the provided calculation items.
     :rtype: str
     """
-    header_numbers = [0]
-    report_items_html = ""
-
-    for item in calculation_items:
-        if isinstance(item, Heading) and item.numbered:
-            header_numbers = _increment_headers_and_get_next(
-                header_numbers, item.head_level
-            )
-
-        report_items_html += _generate_html_for_calc_item(item, header_numbers)
-
-    return report_items_html
+    return "".join(
+        _iter_html_for_calc_items(
+            calculation_items,
+            max_workers,
+            prerender_math=prerender_math,
+            fragment_cache=fragment_cache,
+        )
+    )
 
 
-def _generate_html_for_calc_item(calculation_item, header_numbers: list[int]) -> str:
-    if isinstance(calculation_item, Assumption):
-        return _wrap_p(
-            f'<span style="padding-right:0.5rem;">[ASSUME]</span> {_esc(calculation_item.text)}',
-            CALC_MARGIN,
+def write_html_for_calc_items(
+    calculation_items: Iterable,
+    writer: TextIO,
+    max_workers: int = None,
+    prerender_math: bool = False,
+    fragment_cache: ResultCache = None,
+) -> None:
+    """Writes the HTML elements for displaying the provided calculation items to a file-like object, one item at a
+    time. This is the same HTML as :func:`generate_html_for_calc_items` without ever holding the HTML of all items in
+    memory at once. Items are rendered as they are taken from `calculation_items`, so the items of
+    :func:`.CalculationRunner.stream_all_items` are written while the calculation function is still running.
+
+    :param calculation_items: The calculation items to generate the HTML for.
+    :type calculation_items: Iterable
+    :param writer: Any object with a `write(str)` method, e.g. an open text file or a `io.StringIO`.
+    :type writer: TextIO
+    :param max_workers: The number of threads that render items concurrently, see
+        :func:`generate_html_for_calc_items`, defaults to None
+    :type max_workers: int, optional
+    :param prerender_math: Convert the LaTeX to static MathML, see :func:`generate_html_for_calc_items`, defaults
+        to False
+    :type prerender_math: bool, optional
+    :param fragment_cache: A cache for the HTML of single items, see :func:`generate_html_for_calc_items`, defaults
+        to None
+    :type fragment_cache: :class:`.ResultCache`, optional
+    """
+    for item_html in _iter_html_for_calc_items(
+        calculation_items,
+        max_workers,
+        prerender_math=prerender_math,
+        fragment_cache=fragment_cache,
+    ):
+        writer.write(item_html)
+
+
+def _iter_html_for_calc_items(
+    calculation_items: Iterable,
+    max_workers: int = None,
+    figure_assets: "_FigureAssetWriter" = None,
+    prerender_math: bool = False,
+    fragment_cache: ResultCache = None,
+) -> Iterator[str]:
+    """Generates the HTML for each of the provided calculation items in order. Figures are written with
+    `figure_assets` if it is provided, otherwise they are inlined as base64."""
+    _check_prerender_math(prerender_math)
+
+    if max_workers is not None and max_workers > 1:
+        yield from _iter_html_for_calc_items_concurrently(
+            calculation_items,
+            max_workers,
+            figure_assets,
+            prerender_math,
+            fragment_cache,
         )
+        return
 
-    elif isinstance(calculation_item, Calculation):
-        return _generate_calculation_html(calculation_item)
+    for item, header_numbers in _iter_with_header_numbers(calculation_items):
+        yield from _iter_rendered_calc_item(
+            item, header_numbers, figure_assets, prerender_math, fragment_cache
+        )
 
-    elif isinstance(calculation_item, Canvas):
-        return _generate_canvas_html(calculation_item)
 
-    elif isinstance(calculation_item, Comparison):
-        return _generate_comparison_html(calculation_item)
+def _check_prerender_math(prerender_math: bool):
+    if prerender_math and not latex2mathml_installed:
+        raise ImportError(
+            "The latex2mathml package is required to pre-render math. Install it with `pip install latex2mathml`."
+        )
 
-    elif isinstance(calculation_item, ComparisonStatement):
-        return _generate_comparison_statement_html(calculation_item)
 
-    elif isinstance(calculation_item, FigureBase):
-        return _generate_figure_html(calculation_item)
+def _iter_html_for_calc_items_concurrently(
+    calculation_items: Iterable,
+    max_workers: int,
+    figure_assets: "_FigureAssetWriter" = None,
+    prerender_math: bool = False,
+    fragment_cache: ResultCache = None,
+) -> Iterator[str]:
+    # Results are evaluated first so the threads only read cached results and never evaluate (and set the error of)
+    # the same item at the same time. Only calculations are evaluated: a Symbolic is never evaluated when it is
+    # rendered, and evaluating one with a text expression here would add an error that the serial report doesn't have.
+    calculation_items = list(calculation_items)
+    for item in calculation_items:
+        if isinstance(item, Calculation) and not item.is_symbolic():
+            item.result()
+
+    # Keep a bounded number of items in flight so the HTML of all items is never held at once
+    max_pending = 4 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item, header_numbers in _iter_with_header_numbers(calculation_items):
+            # Each item is rendered in a copy of the current context so the workers use the calculation store of
+            # this run (e.g. its result cache stats), the same as rendering the items one by one
+            pending.append(
+                executor.submit(
+                    contextvars.copy_context().run,
+                    _render_calc_item,
+                    item,
+                    header_numbers,
+                    figure_assets,
+                    prerender_math,
+                    fragment_cache,
+                )
+            )
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _render_calc_item(
+    item,
+    header_numbers: list[int],
+    figure_assets: "_FigureAssetWriter",
+    prerender_math: bool,
+    fragment_cache: ResultCache = None,
+    lazy_table_rows: int = None,
+) -> str:
+    return "".join(
+        _iter_rendered_calc_item(
+            item,
+            header_numbers,
+            figure_assets,
+            prerender_math,
+            fragment_cache,
+            lazy_table_rows,
+        )
+    )
 
-    elif isinstance(calculation_item, Heading):
-        heading_text = _esc(calculation_item.text)
-        if calculation_item.numbered:
-            number = ".".join(map(str, header_numbers)) + "."
-            text = f"{number}\u00A0 {heading_text}"
-        else:
-            text = heading_text
 
-        heading_size = min(4, max(1, calculation_item.head_level) + 1)
+def _iter_rendered_calc_item(
+    item,
+    header_numbers: list[int],
+    figure_assets: "_FigureAssetWriter",
+    prerender_math: bool,
+    fragment_cache: ResultCache = None,
+    lazy_table_rows: int = None,
+) -> Iterator[str]:
+    """Yields the HTML of an item in the chunks returned by its renderer (e.g. the rows of a large table in parts), so
+    the HTML of a large item is never joined. Cached HTML is yielded in one chunk."""
+    render_key = None
+    if fragment_cache is not None and isinstance(item, CalculationItem):
+        render_key = item._get_render_key()
+
+    if render_key is None:
+        item_chunks = HTML_RENDERERS.iter_render(
+            item, RenderContext(header_numbers, figure_assets, lazy_table_rows)
+        )
+    else:
+        # Numbered headings also depend on their position in the report
+        if isinstance(item, Heading):
+            render_key = (*render_key, header_numbers)
+        render_key = (*render_key, lazy_table_rows)
+        # The key includes the renderer so a replaced renderer never gets the HTML of the previous one
+        fragment_key = fragment_cache.make_fragment_key(
+            type(item).__name__,
+            list(render_key),
+            HTML_RENDERERS.get_renderer(type(item)),
+        )
+        item_chunks = (
+            fragment_cache.get_or_compute(
+                fragment_key,
+                lambda: _generate_html_for_calc_item(
+                    item, header_numbers, figure_assets, lazy_table_rows
+                ),
+            ),
+        )
 
-        return _wrap_h(text, heading_size)
+    for item_html in item_chunks:
+        yield _prerender_math(item_html) if prerender_math else item_html
 
-    elif isinstance(calculation_item, Input):
-        return _generate_input_html(calculation_item)
 
-    elif isinstance(calculation_item, Symbolic):
-        return _generate_symbolic_html(calculation_item)
+def _generate_html_for_calc_item(
+    calculation_item,
+    header_numbers: list[int],
+    figure_assets: "_FigureAssetWriter" = None,
+    lazy_table_rows: int = None,
+) -> str:
+    return HTML_RENDERERS.render(
+        calculation_item,
+        RenderContext(header_numbers, figure_assets, lazy_table_rows),
+    )
 
-    elif isinstance(calculation_item, Table):
-        return _generate_result_table_html(calculation_item)
 
-    elif isinstance(calculation_item, TextBlock):
-        return _wrap_with_reference(
-            _wrap_p(_esc(calculation_item.text)), _esc(calculation_item.reference)
-        )
+def _generate_assumption_html(item: Assumption, context: RenderContext) -> str:
+    return _wrap_p(
+        f'<span style="padding-right:0.5rem;">[ASSUME]</span> {_esc(item.text)}',
+        CALC_MARGIN,
+    )
 
-    elif isinstance(calculation_item, Title):
-        return _wrap_h(_esc(calculation_item.text), 1)
 
+def _generate_heading_html(item: Heading, context: RenderContext) -> str:
+    heading_text = _esc(item.text)
+    if item.numbered:
+        number = ".".join(map(str, context.header_numbers)) + "."
+        text = f"{number}\u00A0 {heading_text}"
     else:
-        return _esc(str(calculation_item))
+        text = heading_text
 
+    heading_size = min(4, max(1, item.head_level) + 1)
 
-def _increment_headers_and_get_next(
-    current_headers: list[int], next_level: int
-) -> list[int]:
+    return _wrap_h(text, heading_size)
 
-    if next_level < 1:
-        next_level = 1
 
-    current_size = len(current_headers)
-
-    if next_level > current_size:
-        new_headers = current_headers.copy()
-        for i in range(current_size, next_level):
-            new_headers.append(1)
-        return new_headers
-    else:
-        new_headers = current_headers[:next_level]
-        new_headers[next_level - 1] += 1
-        return new_headers
+def _generate_text_block_html(item: TextBlock, context: RenderContext) -> str:
+    return _wrap_with_reference(_wrap_p(_esc(item.text)), _esc(item.reference))
 
 
 def _generate_calculation_html(item: Calculation) -> str:
@@ -214,30 +406,47 @@ def _generate_comparison_html(item: Comparison) -> str:
     return _wrap_div(comp_html, class_name=CALC_ITEM_WRAPPER_CLASS)
 
 
-def _generate_result_table_html(item: Table) -> str:
+def _iter_result_table_html(item: Table, lazy_rows: int = None) -> Iterator[str]:
+    """Yields the HTML of a table in parts of at most `_TABLE_ROWS_PER_PART` rows, so large tables can be written
+    without holding all of their cells in memory. If `lazy_rows` is provided, the rows after the first `lazy_rows`
+    are written in a `<template>` that the browser does not render until the page expands it (see
+    `LAZY_ROWS_SCRIPT`)."""
     full_width = " width:100%;" if item.full_width else ""
     striped_class = ' class="striped"' if item.striped else ""
     style = f' style="margin:auto;{full_width}"'
-    table_html = f"<table{striped_class}{style}>"
+    table_parts = [
+        f'<div class="{CALC_ITEM_WRAPPER_CLASS}" style="{CALC_MARGIN}">',
+        f"<table{striped_class}{style}>",
+    ]
     if item.title:
-        table_html += f"<caption><b>{item.title}</b></caption>"
+        table_parts.append(f"<caption><b>{item.title}</b></caption>")
     if item.headers:
-        table_html += "<thead><tr>"
+        table_parts.append("<thead><tr>")
         if item.numbered_rows:
-            table_html += "<th></th>"
-        for header in item.headers:
-            table_html += f"<th>{header}</th>"
-        table_html += "</tr></thead>"
-    table_html += "<tbody>"
+            table_parts.append("<th></th>")
+        table_parts.extend(f"<th>{header}</th>" for header in item.headers)
+        table_parts.append("</tr></thead>")
+    table_parts.append("<tbody>")
+
+    # Parts are joined once per batch of rows since large tables have many thousands of cells
+    lazy = False
     for row_num, row in enumerate(item.data):
-        table_html += "<tr>"
+        if row_num == lazy_rows:
+            table_parts.append(f'<template class="{LAZY_ROWS_CLASS}">')
+            lazy = True
+        table_parts.append("<tr>")
         if item.numbered_rows:
-            table_html += f"<td>{row_num+1}</td>"
-        for cell in row:
-            table_html += f"<td>{cell}</td>"
-        table_html += "</tr>"
-    table_html += "</tbody></table>"
-    return _wrap_div(table_html, CALC_MARGIN, class_name=CALC_ITEM_WRAPPER_CLASS)
+            table_parts.append(f"<td>{row_num+1}</td>")
+        table_parts.extend(f"<td>{cell}</td>" for cell in row)
+        table_parts.append("</tr>")
+        if (row_num + 1) % _TABLE_ROWS_PER_PART == 0:
+            yield "".join(table_parts)
+            table_parts = []
+
+    if lazy:
+        table_parts.append("</template>")
+    table_parts.append("</tbody></table></div>")
+    yield "".join(table_parts)
 
 
 def _generate_comparison_statement_html(item: ComparisonStatement) -> str:
@@ -255,9 +464,14 @@ def _generate_comparison_statement_html(item: ComparisonStatement) -> str:
     return _wrap_div(comp_html, class_name=CALC_ITEM_WRAPPER_CLASS)
 
 
-def _generate_figure_html(item: FigureBase) -> str:
+def _generate_figure_html(
+    item: FigureBase, figure_assets: "_FigureAssetWriter" = None
+) -> str:
     try:
-        base64_figure = item.get_base64_str()
+        if figure_assets is None:
+            image_src = f"data:image/png;base64,{_esc(item.get_base64_str())}"
+        else:
+            image_src = _esc(figure_assets.write(item.figure_bytes))
     except Exception as e:
         return _wrap_p(
             f"<b>There was an error loading this image:</b>{e}",
@@ -265,10 +479,8 @@ def _generate_figure_html(item: FigureBase) -> str:
         )
 
     caption = _esc(item.caption)
-    base64_figure = _esc(base64_figure)
     return _wrap_fig(
-        _wrap_img_base64(base64_figure, caption, item.full_width)
-        + _wrap_caption(caption)
+        _wrap_img(image_src, caption, item.full_width) + _wrap_caption(caption)
     )
 
 
@@ -365,9 +577,13 @@ def _wrap_fig(html_content: str) -> str:
 def _wrap_img_base64(
     img_base64: str, description: str = None, full_width: bool = False
 ) -> str:
+    return _wrap_img(f"data:image/png;base64,{img_base64}", description, full_width)
+
+
+def _wrap_img(src: str, description: str = None, full_width: bool = False) -> str:
     alt_text = "Calculation figure" if description is None else description
     full_width_style = "width:100%;" if full_width else ""
-    return f'<img src="data:image/png;base64,{img_base64}" alt="{alt_text}" style="max-width:100%; {full_width_style}"/>'
+    return f'<img src="{src}" alt="{alt_text}" style="max-width:100%; {full_width_style}"/>'
 
 
 def _wrap_caption(caption: str) -> str:
@@ -381,3 +597,93 @@ def _esc(user_text: str | None) -> str | None:
         return None
     """Escape HTML special characters."""
     return html.escape(user_text)
+
+
+class _FigureAssetWriter(object):
+    """Writes figure images as files named by the SHA-256 hash of their content, instead of inlining them in the
+    report. Identical images are only written once, including images from other reports saved to the same folder.
+
+    :param folder: The folder where the image files are written, or None to only collect the images in `collected`
+        by filename (e.g. to write them to a zip archive later)
+    :param url_prefix: The prefix of the image URLs in the report, e.g. the folder path relative to the report
+    """
+
+    def __init__(self, folder: str | None, url_prefix: str):
+        self.folder = folder
+        self.url_prefix = url_prefix
+        self.collected = {}
+
+    def write(self, figure_bytes: bytes) -> str:
+        """Writes the image file if it does not exist yet and returns its URL."""
+        filename = f"{hashlib.sha256(figure_bytes).hexdigest()}.{_get_image_extension(figure_bytes)}"
+        if self.folder is None:
+            self.collected[filename] = figure_bytes
+            return f"{self.url_prefix}/{filename}"
+
+        file_path = os.path.join(self.folder, filename)
+        if not os.path.exists(file_path):
+            os.makedirs(self.folder, exist_ok=True)
+            # Write to a temporary file first so a concurrent writer never sees a partial image
+            temp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(figure_bytes)
+            os.replace(temp_path, file_path)
+        return f"{self.url_prefix}/{filename}"
+
+
+def _get_image_extension(image_bytes: bytes) -> str:
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if image_bytes.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if image_bytes[:5] == b"<?xml" or image_bytes[:4] == b"<svg":
+        return "svg"
+    return "png"
+
+
+def _prerender_math(item_html: str) -> str:
+    """Replaces the display and inline LaTeX math of an item with MathML. Math that can't be converted is kept as
+    LaTeX."""
+    item_html = _DISPLAY_MATH.sub(
+        lambda match: _convert_math(match, "block"), item_html
+    )
+    return _INLINE_MATH.sub(lambda match: _convert_math(match, "inline"), item_html)
+
+
+def _convert_math(match: re.Match, display: Literal["block", "inline"]) -> str:
+    try:
+        return _latex_to_mathml(html.unescape(match.group(1)), display)
+    except Exception:
+        return match.group(0)
+
+
+@functools.lru_cache(maxsize=4096)
+def _latex_to_mathml(latex_code: str, display: Literal["block", "inline"]) -> str:
+    return convert_latex_to_mathml(latex_code, display=display)
+
+
+HTML_RENDERERS = RendererRegistry(
+    {
+        Assumption: _generate_assumption_html,
+        Calculation: lambda item, context: _generate_calculation_html(item),
+        Canvas: lambda item, context: _generate_canvas_html(item),
+        Comparison: lambda item, context: _generate_comparison_html(item),
+        ComparisonStatement: lambda item, context: _generate_comparison_statement_html(
+            item
+        ),
+        FigureBase: lambda item, context: _generate_figure_html(
+            item, context.figure_assets
+        ),
+        Heading: _generate_heading_html,
+        Input: lambda item, context: _generate_input_html(item),
+        Symbolic: lambda item, context: _generate_symbolic_html(item),
+        Table: lambda item, context: _iter_result_table_html(
+            item, context.lazy_table_rows
+        ),
+        TextBlock: _generate_text_block_html,
+        Title: lambda item, context: _wrap_h(_esc(item.text), 1),
+    },
+    default=lambda item, context: _esc(str(item)),
+)
+"""Renders calculation items as the HTML of a calculation report. Register renderers for other item types to include
+them in reports, see :class:`.RendererRegistry`."""
@@ -0,0 +1,283 @@
+import dataclasses
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Literal
+
+import latexexpr_efficalc
+
+from efficalc.base_definitions.shared import _active_profiler
+
+_EFFICALC_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_LATEXEXPR_DIR = os.path.dirname(os.path.abspath(latexexpr_efficalc.__file__)) + os.sep
+
+PHASES = ("construct", "evaluate", "render")
+
+
+@dataclasses.dataclass
+class ItemProfile(object):
+    """The time and memory spent on a single calculation item, by phase.
+
+    :param index: The position of the item in the calculation report
+    :type index: int
+    :param item_type: The class name of the item
+    :type item_type: str
+    :param name: The name (or text) of the item
+    :type name: str
+    :param source: The line of the calculation function that created the item, as "file:line (function)"
+    :type source: str
+    :param times: The wall time in seconds for each phase ("construct", "evaluate", and "render"). Construct time
+        includes the calculation function code that ran since the previous item was created and does not include the
+        evaluate time.
+    :type times: dict[str, float]
+    :param memory: The change in traced memory in bytes for each phase, only recorded when memory is traced
+    :type memory: dict[str, int]
+    """
+
+    index: int
+    item_type: str
+    name: str
+    source: str
+    times: dict = dataclasses.field(default_factory=dict)
+    memory: dict = dataclasses.field(default_factory=dict)
+
+    @property
+    def total_time(self) -> float:
+        """The wall time of all phases in seconds."""
+        return sum(self.times.values())
+
+
+class CalculationProfiler(object):
+    """Records where the time (and optionally the memory) of a calculation run and report goes. Pass a profiler to a
+    :class:`.CalculationRunner` or :class:`.ReportBuilder` and every item the calculation function creates is
+    recorded with the line of code that created it and its time in each phase:
+
+    - construct: running the calculation function up to and including the creation of the item
+    - evaluate: evaluating the result of a :class:`.Calculation` or :class:`.Symbolic`
+    - render: generating the report HTML of the item
+
+    The whole run is also recorded by phase of the run ("calc_function", "render", and "assemble"). Results are
+    available as a sorted table or as a Chrome trace that can be loaded in a flame graph viewer (e.g.
+    chrome://tracing or https://ui.perfetto.dev).
+
+    :param trace_memory: Record the change in traced memory of every phase with `tracemalloc`. This slows down the
+        run considerably, defaults to False
+    :type trace_memory: bool, optional
+
+    .. code-block:: python
+
+        >>> profiler = CalculationProfiler()
+        >>> ReportBuilder(calculation, profiler=profiler).get_html_as_str()
+        >>> print(profiler.format_table(limit=10))
+        >>> profiler.save_chrome_trace("calc_trace.json")
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.items: list[ItemProfile] = []
+        self.run_times: dict[str, float] = {}
+        self._events = []
+        self._profiles_by_id = {}
+        self._origin = time.perf_counter()
+        self._last_save = None
+        self._tracing_depth = 0
+        self._started_tracemalloc = False
+
+    def format_table(
+        self,
+        sort_by: Literal["total", "construct", "evaluate", "render", "index"] = "total",
+        limit: int = None,
+    ) -> str:
+        """Returns a plain text table of the recorded items, sorted with the slowest items first.
+
+        :param sort_by: The phase time to sort by, "total" for the time of all phases, or "index" to keep the report
+            order, defaults to "total"
+        :type sort_by: str, optional
+        :param limit: The maximum number of items in the table, defaults to all items
+        :type limit: int, optional
+        :return: The formatted table
+        :rtype: str
+        """
+        if sort_by == "index":
+            profiles = list(self.items)
+        elif sort_by == "total":
+            profiles = sorted(self.items, key=lambda p: p.total_time, reverse=True)
+        elif sort_by in PHASES:
+            profiles = sorted(
+                self.items, key=lambda p: p.times.get(sort_by, 0.0), reverse=True
+            )
+        else:
+            raise ValueError(
+                "Invalid sort_by specified. Use 'total', 'construct', 'evaluate', 'render', or 'index'."
+            )
+
+        columns = ["#", "type", "name", "source"]
+        columns += [f"{phase} ms" for phase in PHASES] + ["total ms"]
+        if self.trace_memory:
+            columns += [f"{phase} KiB" for phase in PHASES]
+
+        rows = []
+        for profile in profiles[:limit]:
+            row = [str(profile.index), profile.item_type, profile.name[:30]]
+            row.append(profile.source)
+            row += [f"{profile.times.get(phase, 0.0) * 1000:.3f}" for phase in PHASES]
+            row.append(f"{profile.total_time * 1000:.3f}")
+            if self.trace_memory:
+                row += [f"{profile.memory.get(p, 0) / 1024:.1f}" for p in PHASES]
+            rows.append(row)
+
+        widths = [max(len(r[i]) for r in rows + [columns]) for i in range(len(columns))]
+        lines = [
+            "  ".join(value.ljust(width) for value, width in zip(row, widths))
+            for row in [columns] + rows
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        for phase, run_time in self.run_times.items():
+            lines.append(f"{phase}: {run_time * 1000:.3f} ms")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict:
+        """Returns the recorded phases as a Chrome trace (the Trace Event Format). Item phases are nested within the
+        run phases, and evaluations are nested within the item that triggered them.
+
+        :return: The trace as a JSON serializable dictionary
+        :rtype: dict
+        """
+        return {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, file_path: str) -> str:
+        """Saves the Chrome trace (see :func:`to_chrome_trace`) as a JSON file.
+
+        :param file_path: The path of the JSON file
+        :type file_path: str
+        :return: The path of the saved file
+        :rtype: str
+        """
+        with open(file_path, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
+        return file_path
+
+    @contextmanager
+    def _run_phase(self, phase: str):
+        """Profiles a phase of a calculation run or report. Memory is traced while any phase is active."""
+        if self._tracing_depth == 0 and self.trace_memory:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+        self._tracing_depth += 1
+
+        start, start_memory = time.perf_counter(), self._get_traced_memory()
+        if phase == "calc_function":
+            self._last_save = (start, start_memory)
+        try:
+            with _active_profiler(self):
+                yield
+        finally:
+            duration = time.perf_counter() - start
+            self.run_times[phase] = self.run_times.get(phase, 0.0) + duration
+            self._add_event(phase, "run", start, duration, {})
+
+            self._tracing_depth -= 1
+            if self._tracing_depth == 0 and self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def _measure(self, item, phase: str, function: Callable[[], any]):
+        profile = self._get_profile(item)
+        nested_time, nested_memory = profile.total_time, sum(profile.memory.values())
+        start, start_memory = time.perf_counter(), self._get_traced_memory()
+        try:
+            return function()
+        finally:
+            duration = time.perf_counter() - start
+            memory = self._get_traced_memory() - start_memory
+            # Phases of the same item that ran within this phase (e.g. evaluating a result while rendering it) are
+            # only counted once, in their own phase
+            nested_time = profile.total_time - nested_time
+            nested_memory = sum(profile.memory.values()) - nested_memory
+            profile.times[phase] = (
+                profile.times.get(phase, 0.0) + duration - nested_time
+            )
+            if self.trace_memory:
+                profile.memory[phase] = (
+                    profile.memory.get(phase, 0) + memory - nested_memory
+                )
+            self._add_event(
+                profile.name or profile.item_type,
+                phase,
+                start,
+                duration,
+                {"type": profile.item_type},
+            )
+
+    def _record_item(self, item):
+        """Called when the calculation function creates an item."""
+        now, memory = time.perf_counter(), self._get_traced_memory()
+        last_time, last_memory = (
+            self._last_save if self._last_save is not None else (now, memory)
+        )
+        self._last_save = (now, memory)
+
+        profile = self._get_profile(item)
+        profile.index = len(self.items)
+        profile.source = _get_source_line()
+        self.items.append(profile)
+
+        # Evaluations within the constructor of the item are recorded as their own phase
+        construct_time = now - last_time - profile.times.get("evaluate", 0.0)
+        construct_memory = memory - last_memory - profile.memory.get("evaluate", 0)
+        profile.times["construct"] = max(construct_time, 0.0)
+        if self.trace_memory:
+            profile.memory["construct"] = construct_memory
+        self._add_event(
+            profile.name or profile.item_type,
+            "construct",
+            last_time,
+            now - last_time,
+            {"source": profile.source, "type": profile.item_type},
+        )
+
+    def _get_profile(self, item) -> ItemProfile:
+        if id(item) in self._profiles_by_id:
+            return self._profiles_by_id[id(item)][1]
+
+        name = getattr(item, "name", None) or getattr(item, "text", None) or ""
+        profile = ItemProfile(-1, type(item).__name__, str(name), "")
+        # The item is kept with its profile so its id is never reused for another item while profiling
+        self._profiles_by_id[id(item)] = (item, profile)
+        return profile
+
+    def _add_event(self, name, category, start, duration, args):
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    def _get_traced_memory(self) -> int:
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+
+def _get_source_line() -> str:
+    """The first line outside of efficalc (and latexexpr) in the current call stack, i.e. the line of the calculation
+    function that created the item."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith((_EFFICALC_DIR, _LATEXEXPR_DIR)):
+            return f"{os.path.basename(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return ""
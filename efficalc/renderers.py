@@ -0,0 +1,464 @@
+import dataclasses
+import json
+from typing import Callable, Iterable, Iterator
+
+from efficalc import (
+    Assumption,
+    Calculation,
+    CalculationLength,
+    Comparison,
+    ComparisonStatement,
+    FigureBase,
+    Heading,
+    Input,
+    Symbolic,
+    Table,
+    TextBlock,
+    Title,
+)
+from efficalc.base_definitions.latex_text import _latex_to_text
+from efficalc.canvas import Canvas
+from efficalc.result_export import to_result_record
+
+
+@dataclasses.dataclass
+class RenderContext(object):
+    """The state of the report that an item is rendered in.
+
+    :param header_numbers: The numbers of the last heading before the item, e.g. [2, 1] for heading "2.1."
+    :type header_numbers: list[int]
+    :param figure_assets: An object with a `write(bytes) -> str` method that saves a figure image and returns its URL.
+        Figures are embedded as base64 if this is None, defaults to None
+    :param lazy_table_rows: The number of rows of each table to display before the rest are loaded lazily, for
+        outputs that support it (e.g. paginated HTML reports), or None to display all rows, defaults to None
+    """
+
+    header_numbers: list[int]
+    figure_assets: any = None
+    lazy_table_rows: int | None = None
+
+
+class RendererRegistry(object):
+    """A set of functions that render calculation items in one output format, e.g. HTML or Markdown.
+
+    Each renderer is registered for an item type and is called as `renderer(item, context)` with a
+    :class:`.RenderContext`, returning the output for the item as a string. Renderers of items with a large output
+    (e.g. tables) may return an iterator of strings instead, so the output can be written one chunk at a time (see
+    :func:`iter_render`). Items use the renderer of their exact type, or else of their closest base class, which is
+    looked up once per type. Items without any registered renderer use the `default` renderer.
+
+    :param renderers: The renderers by item type, defaults to None
+    :type renderers: dict[type, Callable], optional
+    :param default: The renderer for items of any other type, defaults to None, which raises a ValueError for
+        items of any other type
+    :type default: Callable, optional
+
+    .. code-block:: python
+
+        >>> from efficalc.renderers import MARKDOWN_RENDERERS
+        >>> renderers = MARKDOWN_RENDERERS.copy()
+        >>> renderers.register(Note, lambda item, context: f"> {item.text}\\n\\n")
+        >>> markdown = renderers.render_to_str(CalculationRunner(calculation).calculate_all_items())
+    """
+
+    def __init__(
+        self,
+        renderers: dict[type, Callable[[any, RenderContext], str]] = None,
+        default: Callable[[any, RenderContext], str] = None,
+    ):
+        self._renderers = dict(renderers) if renderers is not None else {}
+        self._default = default
+        self._dispatch_cache = {}
+
+    def register(self, item_type: type, renderer: Callable[[any, RenderContext], str]):
+        """Registers the renderer for items of a type and its subclasses, replacing any renderer already registered
+        for the type.
+
+        :param item_type: The type of items to render
+        :type item_type: type
+        :param renderer: The function that renders an item as `renderer(item, context)`
+        :type renderer: Callable[[any, RenderContext], str]
+        """
+        self._renderers[item_type] = renderer
+        self._dispatch_cache.clear()
+
+    def get_renderer(self, item_type: type) -> Callable[[any, RenderContext], str]:
+        """Returns the renderer for items of a type, see :class:`.RendererRegistry`.
+
+        :param item_type: The type of the item
+        :type item_type: type
+        :return: The renderer for the type
+        :rtype: Callable[[any, RenderContext], str]
+        """
+        renderer = self._dispatch_cache.get(item_type)
+        if renderer is not None:
+            return renderer
+
+        renderer = next(
+            (
+                self._renderers[base]
+                for base in item_type.__mro__
+                if base in self._renderers
+            ),
+            self._default,
+        )
+        if renderer is None:
+            raise ValueError(f"No renderer is registered for {item_type.__name__}.")
+        self._dispatch_cache[item_type] = renderer
+        return renderer
+
+    def render(self, item, context: RenderContext = None) -> str:
+        """Renders a single calculation item.
+
+        :param item: The calculation item
+        :param context: The state of the report the item is in, defaults to a report without headings
+        :type context: :class:`.RenderContext`, optional
+        :return: The output for the item
+        :rtype: str
+        """
+        if context is None:
+            context = RenderContext([0])
+        output = self.get_renderer(type(item))(item, context)
+        return output if isinstance(output, str) else "".join(output)
+
+    def iter_render(self, item, context: RenderContext = None) -> Iterator[str]:
+        """Renders a single calculation item in the chunks returned by its renderer, or in one chunk if the renderer
+        returns a string.
+
+        :param item: The calculation item
+        :param context: The state of the report the item is in, defaults to a report without headings
+        :type context: :class:`.RenderContext`, optional
+        :return: An iterator of the output chunks of the item
+        :rtype: Iterator[str]
+        """
+        if context is None:
+            context = RenderContext([0])
+        output = self.get_renderer(type(item))(item, context)
+        if isinstance(output, str):
+            yield output
+        else:
+            yield from output
+
+    def render_items(
+        self, calculation_items: Iterable, figure_assets=None
+    ) -> Iterator[str]:
+        """Renders the calculation items in order, numbering the headings the same as a calculation report.
+
+        :param calculation_items: The calculation items to render, e.g. from
+            :func:`.CalculationRunner.calculate_all_items`
+        :type calculation_items: Iterable
+        :param figure_assets: See :class:`.RenderContext`, defaults to None
+        :return: An iterator of the output of each item
+        :rtype: Iterator[str]
+        """
+        for item, header_numbers in _iter_with_header_numbers(calculation_items):
+            yield self.render(item, RenderContext(header_numbers, figure_assets))
+
+    def render_to_str(self, calculation_items: Iterable, figure_assets=None) -> str:
+        """Renders the calculation items in order (see :func:`render_items`) and joins the output in one string.
+
+        :param calculation_items: The calculation items to render
+        :type calculation_items: Iterable
+        :param figure_assets: See :class:`.RenderContext`, defaults to None
+        :return: The output of all items
+        :rtype: str
+        """
+        return "".join(self.render_items(calculation_items, figure_assets))
+
+    def copy(self) -> "RendererRegistry":
+        """Returns a new registry with the same renderers, which can be changed without changing this registry.
+
+        :return: The copy of this registry
+        :rtype: :class:`.RendererRegistry`
+        """
+        return RendererRegistry(self._renderers, self._default)
+
+
+def _iter_with_header_numbers(
+    calculation_items: Iterable,
+) -> Iterator[tuple[any, list[int]]]:
+    header_numbers = [0]
+
+    for item in calculation_items:
+        if isinstance(item, Heading) and item.numbered:
+            header_numbers = _increment_headers_and_get_next(
+                header_numbers, item.head_level
+            )
+
+        yield item, header_numbers
+
+
+def _increment_headers_and_get_next(
+    current_headers: list[int], next_level: int
+) -> list[int]:
+
+    if next_level < 1:
+        next_level = 1
+
+    current_size = len(current_headers)
+
+    if next_level > current_size:
+        new_headers = current_headers.copy()
+        for i in range(current_size, next_level):
+            new_headers.append(1)
+        return new_headers
+    else:
+        new_headers = current_headers[:next_level]
+        new_headers[next_level - 1] += 1
+        return new_headers
+
+
+def _get_heading_text(item: Heading, context: RenderContext) -> str:
+    if item.numbered:
+        return ".".join(map(str, context.header_numbers)) + ". " + item.text
+    return item.text
+
+
+def _get_heading_size(item: Heading) -> int:
+    # The same heading sizes as the HTML report, where level 1 is reserved for the title
+    return min(4, max(1, item.head_level) + 1)
+
+
+def _get_figure_src(item: FigureBase, context: RenderContext) -> str:
+    if context.figure_assets is None:
+        return f"data:image/png;base64,{item.get_base64_str()}"
+    return context.figure_assets.write(item.figure_bytes)
+
+
+def _get_calculation_tex(item: Calculation) -> str:
+    item.result()
+    str_with_unit = item.str_result_with_unit()
+    if item.estimate_display_length() == CalculationLength.NUMBER:
+        return f"{item.name} = {str_with_unit}"
+    return f"{item.name} = {item.str_symbolic()} = {item.str_substituted()} = {str_with_unit}"
+
+
+def _get_comparison_tex(item: Comparison) -> str:
+    symbolic = item.str_symbolic()
+    substituted = item.str_substituted()
+    sym_and_sub = (
+        f"{symbolic} \\rightarrow {substituted}"
+        if symbolic != substituted
+        else substituted
+    )
+    # Comparisons are written for an align environment
+    return f"Check {sym_and_sub.replace('&', '')} \\therefore {item.get_message()}"
+
+
+def _with_description(content: str, item, line_end: str) -> str:
+    lines = []
+    if item.description:
+        lines.append(item.description)
+    error = getattr(item, "error", None)
+    if error:
+        lines.append(f"ERROR: {error}")
+    lines.append(_with_reference(content, item, ""))
+    return line_end.join(lines) + line_end
+
+
+def _with_reference(content: str, item, line_end: str, description: str = None) -> str:
+    if description:
+        content = f"{description}; {content}"
+    if item.reference:
+        content = f"{content} [{item.reference}]"
+    return content + line_end
+
+
+def _escape_markdown_cell(cell) -> str:
+    return str(cell).replace("|", "\\|").replace("\n", " ")
+
+
+def _generate_markdown_table(item: Table, context: RenderContext) -> str:
+    headers = list(item.headers) if item.headers else []
+    column_count = max([len(headers)] + [len(row) for row in item.data])
+    if item.numbered_rows:
+        headers = ["#"] + headers
+        column_count += 1
+    headers += [""] * (column_count - len(headers))
+
+    lines = [f"**{item.title}**", ""] if item.title else []
+    lines.append("| " + " | ".join(map(_escape_markdown_cell, headers)) + " |")
+    lines.append("|" + " --- |" * column_count)
+    for row_num, row in enumerate(item.data):
+        cells = [row_num + 1] + list(row) if item.numbered_rows else list(row)
+        cells += [""] * (column_count - len(cells))
+        lines.append("| " + " | ".join(map(_escape_markdown_cell, cells)) + " |")
+    return "\n".join(lines) + "\n\n"
+
+
+def _generate_markdown_figure(item: FigureBase, context: RenderContext) -> str:
+    try:
+        src = _get_figure_src(item, context)
+    except Exception as e:
+        return f"**There was an error loading this image:** {e}\n\n"
+    figure = f"![{item.caption or ''}]({src})"
+    return f"{figure}\n\n*{item.caption}*\n\n" if item.caption else f"{figure}\n\n"
+
+
+def _generate_markdown_canvas(item: Canvas, context: RenderContext) -> str:
+    # Markdown allows inline HTML such as SVG
+    svg = item.to_svg()
+    return f"{svg}\n\n*{item.caption}*\n\n" if item.caption else f"{svg}\n\n"
+
+
+def _generate_markdown_heading(item: Heading, context: RenderContext) -> str:
+    return f"{'#' * _get_heading_size(item)} {_get_heading_text(item, context)}\n\n"
+
+
+def _generate_markdown_input(item: Input, context: RenderContext) -> str:
+    return _with_reference(f"${item}$", item, "\n\n", item.description)
+
+
+MARKDOWN_RENDERERS = RendererRegistry(
+    {
+        Assumption: lambda item, context: f"**[ASSUME]** {item.text}\n\n",
+        Calculation: lambda item, context: _with_description(
+            f"$${_get_calculation_tex(item)}$$", item, "\n\n"
+        ),
+        Canvas: _generate_markdown_canvas,
+        Comparison: lambda item, context: _with_description(
+            f"$${_get_comparison_tex(item)}$$", item, "\n\n"
+        ),
+        ComparisonStatement: lambda item, context: _with_description(
+            f"$$\\rightarrow {item.str_symbolic()}$$", item, "\n\n"
+        ),
+        FigureBase: _generate_markdown_figure,
+        Heading: _generate_markdown_heading,
+        Input: _generate_markdown_input,
+        Symbolic: lambda item, context: _with_description(
+            f"$${item.name} = {item.str_symbolic()}$$", item, "\n\n"
+        ),
+        Table: _generate_markdown_table,
+        TextBlock: lambda item, context: _with_reference(item.text, item, "\n\n"),
+        Title: lambda item, context: f"# {item.text}\n\n",
+    },
+    default=lambda item, context: f"{item}\n\n",
+)
+"""Renders calculation items as Markdown, with math as LaTeX between `$` or `$$` delimiters."""
+
+
+def _to_text(latex_code: str) -> str:
+    return " ".join(_latex_to_text(latex_code).split())
+
+
+def _generate_text_table(item: Table, context: RenderContext) -> str:
+    rows = [list(map(str, row)) for row in item.data]
+    if item.numbered_rows:
+        rows = [[str(row_num + 1)] + row for row_num, row in enumerate(rows)]
+    if item.headers:
+        headers = list(map(str, item.headers))
+        rows.insert(0, ([""] if item.numbered_rows else []) + headers)
+
+    column_count = max((len(row) for row in rows), default=0)
+    widths = [
+        max((len(row[i]) for row in rows if i < len(row)), default=0)
+        for i in range(column_count)
+    ]
+    lines = [item.title] if item.title else []
+    lines.extend(
+        "  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip()
+        for row in rows
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _generate_text_input(item: Input, context: RenderContext) -> str:
+    return _with_reference(_to_text(str(item)), item, "\n", item.description)
+
+
+TEXT_RENDERERS = RendererRegistry(
+    {
+        Assumption: lambda item, context: f"[ASSUME] {item.text}\n",
+        Calculation: lambda item, context: _with_description(
+            _to_text(_get_calculation_tex(item)), item, "\n"
+        ),
+        Canvas: lambda item, context: f"[Canvas: {item.caption or ''}]\n",
+        Comparison: lambda item, context: _with_description(
+            _to_text(_get_comparison_tex(item)), item, "\n"
+        ),
+        ComparisonStatement: lambda item, context: _with_description(
+            _to_text(item.str_symbolic()), item, "\n"
+        ),
+        FigureBase: lambda item, context: f"[Figure: {item.caption or ''}]\n",
+        Heading: lambda item, context: f"{_get_heading_text(item, context)}\n",
+        Input: _generate_text_input,
+        Symbolic: lambda item, context: _with_description(
+            _to_text(f"{item.name} = {item.str_symbolic()}"), item, "\n"
+        ),
+        Table: _generate_text_table,
+        TextBlock: lambda item, context: _with_reference(item.text, item, "\n"),
+        Title: lambda item, context: f"{item.text}\n",
+    },
+    default=lambda item, context: f"{item}\n",
+)
+"""Renders calculation items as plain text, with math converted from LaTeX to text."""
+
+
+def _to_json_line(record: dict) -> str:
+    return json.dumps(record, default=str) + "\n"
+
+
+def _generate_json_record(item, context: RenderContext) -> str:
+    return _to_json_line(to_result_record(item, include_symbolic=True))
+
+
+def _generate_json_heading(item: Heading, context: RenderContext) -> str:
+    number = ".".join(map(str, context.header_numbers)) if item.numbered else None
+    return _to_json_line(
+        {
+            "type": type(item).__name__,
+            "text": item.text,
+            "head_level": item.head_level,
+            "number": number,
+        }
+    )
+
+
+def _generate_json_table(item: Table, context: RenderContext) -> str:
+    return _to_json_line(
+        {
+            "type": type(item).__name__,
+            "title": item.title,
+            "headers": item.headers,
+            "data": item.data,
+        }
+    )
+
+
+def _generate_json_text(item, context: RenderContext) -> str:
+    return _to_json_line(
+        {
+            "type": type(item).__name__,
+            "text": item.text,
+            "reference": getattr(item, "reference", None),
+        }
+    )
+
+
+def _generate_json_caption(item, context: RenderContext) -> str:
+    return _to_json_line({"type": type(item).__name__, "caption": item.caption})
+
+
+JSON_RENDERERS = RendererRegistry(
+    {
+        Assumption: _generate_json_text,
+        Calculation: _generate_json_record,
+        Canvas: _generate_json_caption,
+        Comparison: _generate_json_record,
+        ComparisonStatement: lambda item, context: _to_json_line(
+            {"type": type(item).__name__, "symbolic": item.str_symbolic()}
+        ),
+        FigureBase: _generate_json_caption,
+        Heading: _generate_json_heading,
+        Input: _generate_json_record,
+        Symbolic: _generate_json_record,
+        Table: _generate_json_table,
+        TextBlock: _generate_json_text,
+        Title: _generate_json_text,
+    },
+    default=lambda item, context: _to_json_line(
+        {"type": type(item).__name__, "text": str(item)}
+    ),
+)
+"""Renders calculation items as JSON Lines, one JSON object per item. Items with results are written as result
+records, see :func:`.to_result_record`."""
@@ -1,8 +1,11 @@
+import html
 import os
 import tempfile
 import webbrowser
+import zipfile
+from contextlib import nullcontext
 from enum import Enum
-from typing import Callable
+from typing import BinaryIO, Callable, Iterable, Iterator, TextIO
 import importlib.util
 
 # Check whether IPython is installed. If so, import HTML display function to render outputs in Jupyter notebook.
@@ -11,8 +14,22 @@ ipython_installed = importlib.util.find_spec("IPython")
 if ipython_installed:
     from IPython.display import HTML
 
-from efficalc.calculation_runner import CalculationRunner
-from efficalc.generate_html import generate_html_for_calc_items
+from efficalc.calculation_runner import (
+    CalculationRunner,
+    _run_chunks_in_process_pool,
+)
+from efficalc import Heading
+from efficalc.generate_html import (
+    LAZY_ROWS_SCRIPT,
+    _FigureAssetWriter,
+    _check_prerender_math,
+    _iter_html_for_calc_items,
+    _iter_rendered_calc_item,
+    _iter_with_header_numbers,
+    _render_calc_item,
+)
+from efficalc.profiling import CalculationProfiler
+from efficalc.result_cache import ResultCache
 
 
 class LongCalcDisplayType(Enum):
@@ -46,6 +63,23 @@ class ReportBuilder(object):
         This can be either SCALE for scaling down the display size of the expression or LINEBREAK to break the
         expression into multiple lines. defaults to SCALE
     :type long_calc_display: LongCalcDisplayType, optional
+    :param profiler: A profiler to record the time spent on each calculation item while running the calculation
+        function and rendering the report, defaults to None
+    :type profiler: :class:`.CalculationProfiler`, optional
+    :param render_workers: The number of threads that render report items and load figure images concurrently, e.g.
+        for reports with many Matplotlib figures. The report is always the same as a report rendered item by item.
+        Rendering is done item by item when profiling. Defaults to None, which renders item by item.
+    :type render_workers: int, optional
+    :param prerender_math: Convert the report math to static MathML when the report is generated, instead of
+        typesetting it in the browser with MathJax. The report then loads no scripts and can be viewed offline. Math
+        that can't be converted is left as LaTeX. Requires the `latex2mathml` package to be installed, defaults to
+        False
+    :type prerender_math: bool, optional
+    :param fragment_cache: A cache for the HTML of single report items. Items that are unchanged from an earlier
+        report (e.g. the same text, or the same expression and result) reuse their cached HTML instead of being
+        rendered again. Share one cache between the reports of a calculation function to re-render only the items
+        changed by new input values. Defaults to None
+    :type fragment_cache: :class:`.ResultCache`, optional
     """
 
     def __init__(
@@ -53,10 +87,18 @@ class ReportBuilder(object):
         calc_function: Callable,
         input_vals: dict[str, any] = None,
         long_calc_display: LongCalcDisplayType = LongCalcDisplayType.SCALE,
+        profiler: CalculationProfiler = None,
+        render_workers: int = None,
+        prerender_math: bool = False,
+        fragment_cache: ResultCache = None,
     ):
         self.calc_function = calc_function
         self.input_default_overrides = input_vals if input_vals is not None else {}
         self.long_calc_display = long_calc_display
+        self.profiler = profiler
+        self.render_workers = render_workers
+        self.prerender_math = prerender_math
+        self.fragment_cache = fragment_cache
 
     def view_report(self) -> str:
         """Runs the calculation function with the provided input overrides and opens up the calculation report in the
@@ -66,24 +108,75 @@ class ReportBuilder(object):
         :return: The path to the temporary HTML file.
         :rtype: str
         """
-        html_content = self.__generate_report_html()
-
         # Create a temporary HTML file and get its path
-        temp_file_path = _create_temp_html_file(html_content)
+        temp_file_path = _create_temp_html_file(self.iter_html())
 
         # Open the temporary file in the default web browser
         webbrowser.open("file://" + os.path.realpath(temp_file_path))
 
         return temp_file_path
 
-    def get_html_as_str(self) -> str:
+    def get_html_as_str(self, cache: ResultCache = None) -> str:
         """Runs the calculation function with the provided input overrides and generates a string that is a complete
         HTML document with the calculation report.
 
+        :param cache: A cache to return the report from if it was already generated for the same calculation function
+            and input values, defaults to None
+        :type cache: :class:`.ResultCache`, optional
         :return: The HTML report as a string.
         :rtype: str
         """
-        return self.__generate_report_html()
+        if cache is None:
+            return self.__generate_report_html()
+
+        key = cache.make_key(
+            self.calc_function,
+            self.input_default_overrides,
+            f"html-{self.long_calc_display.value}"
+            + ("-mathml" if self.prerender_math else ""),
+        )
+        return cache.get_or_compute(key, self.__generate_report_html)
+
+    def iter_html(self) -> Iterator[str]:
+        """Runs the calculation function with the provided input overrides and yields the complete HTML document with
+        the calculation report in chunks, one calculation item at a time. The chunks can be written or sent as soon
+        as each one is rendered, so the complete HTML document is never held in memory. Items are rendered while the
+        calculation function is still running (see :func:`.CalculationRunner.stream_all_items`), except when
+        profiling.
+
+        :return: An iterator of the HTML document chunks, in order.
+        :rtype: Iterator[str]
+
+        .. code-block:: python
+
+            >>> for chunk in ReportBuilder(calculation, inputs).iter_html():
+            ...     response.write(chunk)
+        """
+        yield from self.__iter_calculated_report_html()
+
+    def write_report(self, writer: TextIO) -> None:
+        """Runs the calculation function with the provided input overrides and writes the complete HTML document with
+        the calculation report to a file-like object, one calculation item at a time (see :func:`iter_html`).
+
+        :param writer: Any object with a `write(str)` method, e.g. an open text file, a `io.StringIO`, or a socket
+            file from `socket.makefile("w")`.
+        :type writer: TextIO
+        """
+        for chunk in self.iter_html():
+            writer.write(chunk)
+
+    async def get_html_as_str_async(self) -> str:
+        """The async variant of :func:`get_html_as_str`. The calculation function may be a regular function or a
+        coroutine function, see :func:`.CalculationRunner.calculate_all_items_async`.
+
+        :return: The HTML report as a string.
+        :rtype: str
+        """
+        calculation = CalculationRunner(
+            self.calc_function, self.input_default_overrides, self.profiler
+        )
+        all_items = await calculation.calculate_all_items_async()
+        return self.__build_report_html(all_items)
     
     def ipy_display(self) -> HTML:
         """Gets the HTML report and uses IPython to render it as output in a Jupyter notebook.
@@ -96,6 +189,7 @@ class ReportBuilder(object):
         save_folder: str,
         filename: str = "calc_report",
         open_on_save: bool = False,
+        external_figures: bool = False,
     ) -> str:
         """Runs the calculation function with the provided input overrides and saves the calculation report at the
         specified location.
@@ -110,35 +204,554 @@ class ReportBuilder(object):
         :type filename: str, optional
         :param open_on_save: if True, the report will be opened in the default web browser, defaults to False
         :type open_on_save: bool
+        :param external_figures: if True, figures are saved as image files in an "assets" folder next to the report
+            instead of being embedded in the html file. Image files are named by the hash of their content, so an image
+            that is in many reports saved to the same folder is only saved once. Defaults to False
+        :type external_figures: bool, optional
 
         :return: the complete filepath of the saved html file
         :rtype: str
         """
+        figure_assets = _get_figure_assets(save_folder, external_figures)
+        return _save_report_html(
+            self.__iter_calculated_report_html(figure_assets),
+            save_folder,
+            filename,
+            open_on_save,
+        )
 
-        _create_folder_if_not_exists(save_folder)
+    async def save_report_async(
+        self,
+        save_folder: str,
+        filename: str = "calc_report",
+        open_on_save: bool = False,
+        external_figures: bool = False,
+    ) -> str:
+        """The async variant of :func:`save_report`. The calculation function may be a regular function or a
+        coroutine function, see :func:`.CalculationRunner.calculate_all_items_async`.
 
-        full_file_path = os.path.join(save_folder, f"{filename}.html")
+        :param save_folder: the path to the folder where the report will be saved
+        :type save_folder: str
+        :param filename: the name of the html file that will be created in the `folder_path`, defaults to "calc_report"
+        :type filename: str, optional
+        :param open_on_save: if True, the report will be opened in the default web browser, defaults to False
+        :type open_on_save: bool
+        :param external_figures: if True, figures are saved as image files in an "assets" folder next to the report
+            instead of being embedded in the html file. Image files are named by the hash of their content, so an image
+            that is in many reports saved to the same folder is only saved once. Defaults to False
+        :type external_figures: bool, optional
+
+        :return: the complete filepath of the saved html file
+        :rtype: str
+        """
+        calculation = CalculationRunner(
+            self.calc_function, self.input_default_overrides, self.profiler
+        )
+        all_items = await calculation.calculate_all_items_async()
+        figure_assets = _get_figure_assets(save_folder, external_figures)
+        return _save_report_html(
+            self.__iter_report_html(all_items, figure_assets),
+            save_folder,
+            filename,
+            open_on_save,
+        )
 
-        html_content = self.__generate_report_html()
+    def save_paginated_report(
+        self,
+        save_folder: str,
+        filename: str = "calc_report",
+        split_heading_level: int | None = 1,
+        items_per_page: int = None,
+        lazy_table_rows: int | None = 50,
+        external_figures: bool = False,
+        open_on_save: bool = False,
+    ) -> list[str]:
+        """Runs the calculation function with the provided input overrides and saves the calculation report as linked
+        pages, for reports that are too large to open as a single html file.
+
+        A new page starts at every heading with a `head_level` of `split_heading_level` or lower, and after every
+        `items_per_page` items. The pages are saved as "{filename}_1.html", "{filename}_2.html", etc., along with a
+        table of contents "{filename}.html" that links to every heading. Each page is written one item at a time.
 
-        with open(full_file_path, "w") as file:
-            file.write(html_content)
+        :param save_folder: the path to the folder where the report will be saved
+        :type save_folder: str
+        :param filename: the name of the table of contents html file and the prefix of the page html files, defaults
+            to "calc_report"
+        :type filename: str, optional
+        :param split_heading_level: start a new page at headings of this level or lower, or None to only split pages
+            by `items_per_page`, defaults to 1
+        :type split_heading_level: int or None, optional
+        :param items_per_page: the maximum number of items on a page, defaults to None for no maximum
+        :type items_per_page: int, optional
+        :param lazy_table_rows: the number of rows of each table that are displayed when the page is opened. The
+            remaining rows are only displayed when the table is scrolled into view or the page is printed. Use None to
+            display all rows, defaults to 50
+        :type lazy_table_rows: int or None, optional
+        :param external_figures: if True, figures are saved as image files in an "assets" folder next to the report,
+            see :func:`save_report`, defaults to False
+        :type external_figures: bool, optional
+        :param open_on_save: if True, the table of contents will be opened in the default web browser, defaults to
+            False
+        :type open_on_save: bool, optional
+        :return: the complete filepaths of the table of contents followed by the pages
+        :rtype: list[str]
+
+        .. code-block:: python
+
+            >>> ReportBuilder(calculation).save_paginated_report("reports", "column", items_per_page=500)
+            ['reports/column.html', 'reports/column_1.html', 'reports/column_2.html']
+        """
+        if items_per_page is not None and items_per_page < 1:
+            raise ValueError(
+                f"The items per page must be at least 1, not {items_per_page}."
+            )
+
+        calculation = CalculationRunner(
+            self.calc_function, self.input_default_overrides, self.profiler
+        )
+        pages = _split_report_pages(
+            calculation.calculate_all_items(), split_heading_level, items_per_page
+        )
+
+        _create_folder_if_not_exists(save_folder)
+        figure_assets = _get_figure_assets(save_folder, external_figures)
+        page_filenames = [f"{filename}_{i + 1}.html" for i in range(len(pages))]
+        contents_filename = f"{filename}.html"
+        page_start = _get_report_page_start(self.long_calc_display, self.prerender_math)
+        page_end = _get_report_page_end()
+        if lazy_table_rows is not None:
+            page_end = LAZY_ROWS_SCRIPT + page_end
+
+        saved_paths = [os.path.join(save_folder, contents_filename)]
+        contents = []
+        with self.__profile_phase("render"):
+            for page_num, page in enumerate(pages):
+                navigation = _generate_page_navigation_html(
+                    page_filenames, page_num, contents_filename
+                )
+                full_file_path = os.path.join(save_folder, page_filenames[page_num])
+                with open(full_file_path, "w") as file:
+                    file.write(page_start)
+                    file.write(navigation)
+                    for item, header_numbers in page:
+                        if isinstance(item, Heading):
+                            anchor = f"section-{len(contents) + 1}"
+                            contents.append(
+                                (item, header_numbers, page_filenames[page_num], anchor)
+                            )
+                            file.write(f'<a id="{anchor}"></a>')
+                        for chunk in self.__iter_paginated_item_html(
+                            item, header_numbers, figure_assets, lazy_table_rows
+                        ):
+                            file.write(chunk)
+                    file.write(navigation)
+                    file.write(page_end)
+                saved_paths.append(full_file_path)
+
+        _save_batch_file(
+            None,
+            save_folder,
+            contents_filename,
+            (_generate_contents_html(contents, self.long_calc_display),),
+        )
 
         if open_on_save:
-            # Open the created file in the default web browser
-            webbrowser.open("file://" + os.path.realpath(full_file_path))
+            webbrowser.open("file://" + os.path.realpath(saved_paths[0]))
+
+        return saved_paths
+
+    def __profile_phase(self, phase: str):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler._run_phase(phase)
 
-        return full_file_path
+    def __iter_paginated_item_html(
+        self,
+        item,
+        header_numbers: list[int],
+        figure_assets: _FigureAssetWriter,
+        lazy_table_rows: int | None,
+    ) -> Iterable[str]:
+        if self.profiler is None:
+            return _iter_rendered_calc_item(
+                item,
+                header_numbers,
+                figure_assets,
+                self.prerender_math,
+                self.fragment_cache,
+                lazy_table_rows,
+            )
+        # The render time of an item is measured as a whole, so its HTML is rendered in one chunk
+        return (
+            self.__render_measured_item(
+                item, header_numbers, figure_assets, lazy_table_rows
+            ),
+        )
+
+    def __render_measured_item(
+        self,
+        item,
+        header_numbers: list[int],
+        figure_assets: _FigureAssetWriter,
+        lazy_table_rows: int | None = None,
+    ) -> str:
+        return self.profiler._measure(
+            item,
+            "render",
+            lambda: _render_calc_item(
+                item,
+                header_numbers,
+                figure_assets,
+                self.prerender_math,
+                self.fragment_cache,
+                lazy_table_rows,
+            ),
+        )
 
     def __generate_report_html(self):
         calculation = CalculationRunner(
-            self.calc_function, self.input_default_overrides
+            self.calc_function, self.input_default_overrides, self.profiler
         )
 
         all_items = calculation.calculate_all_items()
-        report_items_html = generate_html_for_calc_items(all_items)
+        return self.__build_report_html(all_items)
+
+    @classmethod
+    def save_reports(
+        cls,
+        calc_function: Callable,
+        input_sets: Iterable[dict[str, any]],
+        save_to: str | os.PathLike | BinaryIO,
+        filename_template: str = "calc_report_{index}",
+        long_calc_display: LongCalcDisplayType = LongCalcDisplayType.SCALE,
+        max_workers: int = None,
+        chunksize: int = 1,
+        external_figures: bool = False,
+        prerender_math: bool = False,
+        render_workers: int = None,
+    ) -> list[str]:
+        """Runs the calculation function once for every set of input values and saves a calculation report for each
+        run, along with an "index.html" page that links to every report with its input values. Reports are generated
+        in parallel on a pool of worker processes (see :func:`.CalculationRunner.run_many`) and written as soon as
+        each one is ready.
+
+        Reports are saved to a folder, or to a zip archive if `save_to` is a path ending in ".zip" or a writable binary
+        file object (e.g. a network response). Zip archives are written as a stream and never need to be held in
+        memory or seeked.
+
+        Every report must have its own filename, and no report can be named "index" (case is ignored, since many file
+        systems ignore it too).
+
+        :param calc_function: The calculation function to run for every set of input values. It must be picklable,
+            i.e. defined at the top level of a module.
+        :type calc_function: Callable
+        :param input_sets: An iterable of input value dictionaries, one for each report.
+        :type input_sets: Iterable[dict[str, any]]
+        :param save_to: The folder, zip archive path, or binary file object to save the reports to.
+        :type save_to: str, os.PathLike, or BinaryIO
+        :param filename_template: The name of each html file without the extension, formatted with the input values
+            by name and the position of the input set as `index` (which takes the place of an input named "index"),
+            e.g. "beam_{index}_{span}", defaults to "calc_report_{index}"
+        :type filename_template: str, optional
+        :param long_calc_display: How long expressions are displayed in every report, defaults to SCALE
+        :type long_calc_display: LongCalcDisplayType, optional
+        :param max_workers: The number of worker processes, defaults to the number of processors on the machine
+        :type max_workers: int, optional
+        :param chunksize: The number of reports generated by a worker process at a time, defaults to 1
+        :type chunksize: int, optional
+        :param external_figures: if True, figures are saved as image files in an "assets" folder (or folder in the zip
+            archive) next to the reports instead of being embedded in every html file, see :func:`save_report`.
+            Defaults to False
+        :type external_figures: bool, optional
+        :param prerender_math: if True, the math of every report is converted to MathML when it is generated instead
+            of being typeset by MathJax in the browser, see :class:`ReportBuilder`. Defaults to False
+        :type prerender_math: bool, optional
+        :param render_workers: The number of threads each worker process renders the items of a report with, see
+            :class:`ReportBuilder`. Defaults to None
+        :type render_workers: int, optional
+        :return: The paths of the saved reports in the same order as `input_sets`, or the names of the reports within
+            the zip archive.
+        :rtype: list[str]
+        :raises ValueError: If the filename template gives the same filename for two reports or the name "index".
+
+        .. code-block:: python
+
+            >>> members = [{"M_u": 30, "L_b": 10}, {"M_u": 50, "L_b": 20}]
+            >>> ReportBuilder.save_reports(calculation, members, "reports.zip", "member_{index}")
+            ['member_0.html', 'member_1.html']
+        """
+        if isinstance(save_to, (str, os.PathLike)):
+            save_to = os.fspath(save_to)
+            is_zip = save_to.lower().endswith(".zip")
+        else:
+            is_zip = True
+        if not is_zip:
+            _create_folder_if_not_exists(save_to)
+
+        # The page header and footer are shared by every report
+        page_start = _get_report_page_start(long_calc_display, prerender_math)
+        page_end = _get_report_page_end()
+
+        # Figures are written to the assets folder by the worker processes, or sent back to be written to the archive
+        assets_folder = None
+        if external_figures and not is_zip:
+            assets_folder = os.path.join(save_to, "assets")
+
+        saved_paths = []
+        manifest = []
+        filenames = {"index.html"}
+        saved_assets = set()
+        archive = (
+            zipfile.ZipFile(save_to, "w", zipfile.ZIP_DEFLATED) if is_zip else None
+        )
+        try:
+            for index, (input_vals, items_html, assets) in _run_chunks_in_process_pool(
+                _generate_report_items_html_chunk,
+                (
+                    calc_function,
+                    external_figures,
+                    assets_folder,
+                    prerender_math,
+                    render_workers,
+                ),
+                input_sets,
+                max_workers,
+                chunksize,
+            ):
+                filename = (
+                    filename_template.format_map({**input_vals, "index": index})
+                    + ".html"
+                )
+                if filename.lower() in filenames:
+                    raise ValueError(
+                        f"The filename template produced the same filename more than once or the reserved "
+                        f"filename index.html: {filename}"
+                    )
+                filenames.add(filename.lower())
+
+                for asset_name, asset_bytes in assets.items():
+                    if asset_name not in saved_assets:
+                        saved_assets.add(asset_name)
+                        archive.writestr(f"assets/{asset_name}", asset_bytes)
+
+                chunks = (page_start, items_html, page_end)
+                saved_paths.append(_save_batch_file(archive, save_to, filename, chunks))
+                manifest.append((index, filename, input_vals))
+
+            index_html = _generate_report_index_html(manifest, long_calc_display)
+            _save_batch_file(archive, save_to, "index.html", (index_html,))
+        finally:
+            if archive is not None:
+                archive.close()
+
+        return saved_paths
+
+    def __iter_calculated_report_html(
+        self, figure_assets: _FigureAssetWriter = None
+    ) -> Iterator[str]:
+        calculation = CalculationRunner(
+            self.calc_function, self.input_default_overrides, self.profiler
+        )
+        if self.profiler is None:
+            # Items are rendered while the calculation function is still running
+            all_items = calculation.stream_all_items()
+        else:
+            all_items = calculation.calculate_all_items()
+        yield from self.__iter_report_html(all_items, figure_assets)
+
+    def __iter_report_html(
+        self, all_items: Iterable, figure_assets: _FigureAssetWriter = None
+    ) -> Iterator[str]:
+        if self.profiler is not None:
+            # Rendering is profiled as a whole phase, which can't be suspended between chunks
+            yield self.__build_report_html(all_items, figure_assets)
+            return
+
+        yield _get_report_page_start(self.long_calc_display, self.prerender_math)
+        yield from _iter_html_for_calc_items(
+            all_items,
+            self.render_workers,
+            figure_assets,
+            self.prerender_math,
+            self.fragment_cache,
+        )
+        yield _get_report_page_end()
+
+    def __build_report_html(
+        self, all_items: list, figure_assets: _FigureAssetWriter = None
+    ) -> str:
+        if self.profiler is None:
+            report_items_html = "".join(
+                _iter_html_for_calc_items(
+                    all_items,
+                    self.render_workers,
+                    figure_assets,
+                    self.prerender_math,
+                    self.fragment_cache,
+                )
+            )
+            return _wrap_report_in_html_page(
+                report_items_html, self.long_calc_display, self.prerender_math
+            )
+
+        _check_prerender_math(self.prerender_math)
+        with self.profiler._run_phase("render"):
+            report_items_html = "".join(
+                self.__render_measured_item(item, header_numbers, figure_assets)
+                for item, header_numbers in _iter_with_header_numbers(all_items)
+            )
+        with self.profiler._run_phase("assemble"):
+            return _wrap_report_in_html_page(
+                report_items_html, self.long_calc_display, self.prerender_math
+            )
+
+
+def _generate_report_items_html_chunk(
+    calc_function: Callable,
+    external_figures: bool,
+    assets_folder: str | None,
+    prerender_math: bool,
+    render_workers: int | None,
+    chunk: list[tuple[int, dict[str, any]]],
+) -> list[tuple[int, tuple[dict[str, any], str, dict[str, bytes]]]]:
+    results = []
+    for index, input_vals in chunk:
+        # Without an assets folder, the figure images are collected and returned to be written to the zip archive
+        figure_assets = (
+            _FigureAssetWriter(assets_folder, "assets") if external_figures else None
+        )
+        all_items = CalculationRunner(calc_function, input_vals).calculate_all_items()
+        items_html = "".join(
+            _iter_html_for_calc_items(
+                all_items, render_workers, figure_assets, prerender_math
+            )
+        )
+        assets = figure_assets.collected if figure_assets is not None else {}
+        results.append((index, (input_vals, items_html, assets)))
+    return results
 
-        return _wrap_report_in_html_page(report_items_html, self.long_calc_display)
+
+def _save_batch_file(
+    archive: zipfile.ZipFile | None,
+    save_folder: str,
+    filename: str,
+    html_chunks: Iterable[str],
+) -> str:
+    if archive is not None:
+        with archive.open(filename, "w") as file:
+            for chunk in html_chunks:
+                file.write(chunk.encode("utf-8"))
+        return filename
+
+    full_file_path = os.path.join(save_folder, filename)
+    with open(full_file_path, "w") as file:
+        for chunk in html_chunks:
+            file.write(chunk)
+    return full_file_path
+
+
+def _generate_report_index_html(
+    manifest: list[tuple[int, str, dict[str, any]]],
+    long_calc_display: LongCalcDisplayType,
+) -> str:
+    input_names = list(
+        dict.fromkeys(name for _, _, input_vals in manifest for name in input_vals)
+    )
+    header_cells = "".join(
+        f"<th>{html.escape(name)}</th>" for name in ["#", "Report"] + input_names
+    )
+    rows = []
+    for index, filename, input_vals in manifest:
+        link = f'<a href="{html.escape(filename)}">{html.escape(filename)}</a>'
+        cells = [str(index), link] + [
+            html.escape(str(input_vals.get(name, ""))) for name in input_names
+        ]
+        rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+
+    content = (
+        "<h1>Calculation reports</h1>"
+        f'<table class="striped"><thead><tr>{header_cells}</tr></thead>'
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+    # The index page has no math to typeset
+    return _wrap_report_in_html_page(content, long_calc_display, prerender_math=True)
+
+
+def _split_report_pages(
+    all_items: list, split_heading_level: int | None, items_per_page: int | None
+) -> list[list[tuple[any, list[int]]]]:
+    pages = [[]]
+    for item, header_numbers in _iter_with_header_numbers(all_items):
+        page = pages[-1]
+        starts_section = (
+            split_heading_level is not None
+            and isinstance(item, Heading)
+            and item.head_level <= split_heading_level
+        )
+        is_full = items_per_page is not None and len(page) >= items_per_page
+        if page and (starts_section or is_full):
+            pages.append([])
+        pages[-1].append((item, header_numbers))
+    return pages
+
+
+def _generate_page_navigation_html(
+    page_filenames: list[str], page_num: int, contents_filename: str
+) -> str:
+    links = []
+    if page_num > 0:
+        links.append(
+            f'<a href="{html.escape(page_filenames[page_num - 1])}">Previous</a>'
+        )
+    links.append(f'<a href="{html.escape(contents_filename)}">Contents</a>')
+    if page_num < len(page_filenames) - 1:
+        links.append(f'<a href="{html.escape(page_filenames[page_num + 1])}">Next</a>')
+    links.append(f"Page {page_num + 1} of {len(page_filenames)}")
+    return f'<nav style="margin-block: 1rem;">{" | ".join(links)}</nav>'
+
+
+def _generate_contents_html(
+    contents: list[tuple[Heading, list[int], str, str]],
+    long_calc_display: LongCalcDisplayType,
+) -> str:
+    entries = []
+    for heading, header_numbers, page_filename, anchor in contents:
+        text = html.escape(heading.text)
+        if heading.numbered:
+            text = ".".join(map(str, header_numbers)) + ". " + text
+        indent = 1.5 * (max(1, heading.head_level) - 1)
+        link = f'<a href="{html.escape(page_filename)}#{anchor}">{text}</a>'
+        entries.append(f'<p style="margin-left: {indent}rem;">{link}</p>')
+
+    content = "<h1>Contents</h1>" + "".join(entries)
+    # The contents page has no math to typeset
+    return _wrap_report_in_html_page(content, long_calc_display, prerender_math=True)
+
+
+def _get_figure_assets(
+    save_folder: str, external_figures: bool
+) -> _FigureAssetWriter | None:
+    if not external_figures:
+        return None
+    return _FigureAssetWriter(os.path.join(save_folder, "assets"), "assets")
+
+
+def _save_report_html(
+    html_chunks: Iterable[str], save_folder: str, filename: str, open_on_save: bool
+) -> str:
+    _create_folder_if_not_exists(save_folder)
+
+    full_file_path = os.path.join(save_folder, f"{filename}.html")
+
+    with open(full_file_path, "w") as file:
+        for chunk in html_chunks:
+            file.write(chunk)
+
+    if open_on_save:
+        # Open the created file in the default web browser
+        webbrowser.open("file://" + os.path.realpath(full_file_path))
+
+    return full_file_path
 
 
 def _create_folder_if_not_exists(folder_path):
@@ -146,23 +759,34 @@ def _create_folder_if_not_exists(folder_path):
         os.makedirs(folder_path)
 
 
-def _create_temp_html_file(html_content):
+def _create_temp_html_file(html_chunks: Iterable[str]):
     # Create a temporary file to write HTML content
     # Use delete=False to keep the file after closing
     with tempfile.NamedTemporaryFile("w", delete=False, suffix=".html") as temp_file:
-        temp_file.write(html_content)
+        for chunk in html_chunks:
+            temp_file.write(chunk)
         # Return the path of the temporary file
         return temp_file.name
 
 
 def _wrap_report_in_html_page(
-    content: str, long_calc_display: LongCalcDisplayType
+    content: str, long_calc_display: LongCalcDisplayType, prerender_math: bool = False
 ) -> str:
+    return (
+        _get_report_page_start(long_calc_display, prerender_math)
+        + content
+        + _get_report_page_end()
+    )
 
-    start = f"""
-    <!DOCTYPE html>
-    <html style="background-color: #eeeeee;">
-    <head>
+
+def _get_report_page_start(
+    long_calc_display: LongCalcDisplayType, prerender_math: bool = False
+) -> str:
+    # Pre-rendered math is static MathML that the browser displays without MathJax
+    mathjax_scripts = (
+        ""
+        if prerender_math
+        else f"""
     <script>
         window.MathJax = {{
             output: {{
@@ -171,7 +795,12 @@ def _wrap_report_in_html_page(
         }};
     </script>
     <script type="text/javascript" async
-    src="https://cdnjs.cloudflare.com/ajax/libs/mathjax/4.0.0-beta.7/tex-mml-chtml.min.js"></script>
+    src="https://cdnjs.cloudflare.com/ajax/libs/mathjax/4.0.0-beta.7/tex-mml-chtml.min.js"></script>"""
+    )
+    return f"""
+    <!DOCTYPE html>
+    <html style="background-color: #eeeeee;">
+    <head>{mathjax_scripts}
     <style>
         body {{
             box-shadow: rgba(0, 0, 0, 0.24) 0px 3px 8px;
@@ -209,8 +838,10 @@ def _wrap_report_in_html_page(
     </head>
     <body style="margin-inline: auto; padding: 1rem; background-color: #ffffff;">
     """
-    end = """
+
+
+def _get_report_page_end() -> str:
+    return """
     </body>
     </html>
     """
-    return start + content + end
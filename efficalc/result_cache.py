@@ -0,0 +1,328 @@
+import functools
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+# NumPy is not required for any other functionality in the efficalc package, so only import it if it is installed.
+numpy_installed = importlib.util.find_spec("numpy")
+if numpy_installed:
+    import numpy as np
+
+try:
+    _EFFICALC_VERSION = importlib.metadata.version("efficalc")
+except importlib.metadata.PackageNotFoundError:
+    _EFFICALC_VERSION = "unknown"
+
+
+class ResultCache(object):
+    """A cache of calculation results and reports that can be passed to :func:`.CalculationRunner.calculate_results`
+    and :func:`.ReportBuilder.get_html_as_str`. Repeated runs of the same calculation function with the same input
+    values return the cached results instead of running the calculation function (and rendering the report) again.
+
+    Entries are keyed by the qualified name of the calculation function, a fingerprint of its code and the efficalc
+    version, and a canonical hash of the input values. The fingerprint only covers the code of the calculation
+    function itself, so pass a new `version` whenever a function it calls changes.
+
+    The cache has an in-memory least-recently-used tier and an optional disk tier in either a directory or a SQLite
+    database, which keeps entries between processes. Disk entries are pickled, so only use a location you trust. The
+    calculation items returned from the in-memory tier are shared between callers and should not be modified.
+
+    :param max_entries: The maximum number of entries in the in-memory tier, defaults to 128
+    :type max_entries: int, optional
+    :param max_bytes: The maximum approximate size of all entries in the in-memory tier, defaults to no limit
+    :type max_bytes: int, optional
+    :param directory: A directory for the disk tier with one file per entry, defaults to None
+    :type directory: str, optional
+    :param sqlite_path: A SQLite database file for the disk tier, defaults to None
+    :type sqlite_path: str, optional
+    :param version: A version of the calculation functions that is part of every key, defaults to ""
+    :type version: str, optional
+
+    .. code-block:: python
+
+        >>> cache = ResultCache(max_entries=1000, sqlite_path="calc_cache.db")
+        >>> builder = ReportBuilder(calculation, {"L_b": 20})
+        >>> html = builder.get_html_as_str(cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: int = None,
+        directory: str = None,
+        sqlite_path: str = None,
+        version: str = "",
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        if directory is not None and sqlite_path is not None:
+            raise ValueError("Use either a directory or a sqlite_path, not both.")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.sqlite_path = sqlite_path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        if sqlite_path is not None:
+            self._connection = sqlite3.connect(sqlite_path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+                )
+
+    def make_key(
+        self, calc_function: Callable, input_vals: dict[str, any], kind: str
+    ) -> str:
+        """Returns the cache key for a calculation function run with the given input values.
+
+        :param calc_function: The calculation function
+        :type calc_function: Callable
+        :param input_vals: The input values of the run
+        :type input_vals: dict[str, any]
+        :param kind: The kind of value that is cached, e.g. "results-list" or "html"
+        :type kind: str
+        :return: A hex digest that identifies the cached value
+        :rtype: str
+        :raises TypeError: If an input value is not a number, string, list, tuple, dict, or NumPy array.
+        """
+        key = json.dumps(
+            [
+                kind,
+                getattr(calc_function, "__module__", None),
+                getattr(calc_function, "__qualname__", repr(calc_function)),
+                _get_code_fingerprint(calc_function),
+                _EFFICALC_VERSION,
+                self.version,
+                _canonical_input_vals(input_vals),
+            ]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def make_fragment_key(
+        self, item_type: str, render_key: list, renderer: Callable = None
+    ) -> str:
+        """Returns the cache key for the report HTML of a single calculation item.
+
+        :param item_type: The class name of the item
+        :type item_type: str
+        :param render_key: Everything the HTML of the item is generated from
+        :type render_key: list
+        :param renderer: The function that renders the item, so HTML is never shared between renderers, defaults to
+            None
+        :type renderer: Callable, optional
+        :return: A hex digest that identifies the cached HTML
+        :rtype: str
+        :raises TypeError: If a part of the render key is not a number, string, list, tuple, dict, or NumPy array.
+        """
+        key = json.dumps(
+            [
+                "fragment",
+                item_type,
+                _EFFICALC_VERSION,
+                self.version,
+                _get_function_identity(renderer) if renderer is not None else None,
+                _canonical_value(render_key),
+            ]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], any]):
+        """Returns the cached value for the key, or computes, caches, and returns it if it is not cached.
+
+        :param key: The cache key, see :func:`make_key`
+        :type key: str
+        :param compute: A function that computes the value when it is not cached
+        :type compute: Callable
+        :return: The cached or computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        stored = self._load_from_disk(key)
+        if stored is not None:
+            value = pickle.loads(stored)
+            with self._lock:
+                self.hits += 1
+            self._add_to_memory(key, value, len(stored))
+            return value
+
+        with self._lock:
+            self.misses += 1
+        value = compute()
+        if (
+            self.directory is None
+            and self._connection is None
+            and self.max_bytes is None
+        ):
+            # Without a disk tier or a size limit the pickled entry is not needed, so skip pickling
+            self._add_to_memory(key, value, 0)
+            return value
+
+        stored = pickle.dumps(value)
+        self._save_to_disk(key, stored)
+        self._add_to_memory(key, value, len(stored))
+        return value
+
+    def clear(self):
+        """Removes every entry from the in-memory tier and the disk tier."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            if self.directory is not None:
+                for filename in os.listdir(self.directory):
+                    if filename.endswith(".pickle"):
+                        os.remove(os.path.join(self.directory, filename))
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM result_cache")
+
+    def close(self):
+        """Closes the SQLite database of the disk tier, if there is one."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _add_to_memory(self, key: str, value, size: int):
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def _load_from_disk(self, key: str) -> bytes | None:
+        if self.directory is not None:
+            try:
+                with open(self._get_entry_path(key), "rb") as file:
+                    return file.read()
+            except FileNotFoundError:
+                return None
+        if self._connection is not None:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT value FROM result_cache WHERE key = ?", (key,)
+                ).fetchone()
+            return row[0] if row is not None else None
+        return None
+
+    def _save_to_disk(self, key: str, stored: bytes):
+        if self.directory is not None:
+            # Write to a temporary file first so other processes never read a partially written entry
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.directory, suffix=".tmp", delete=False
+            ) as temp_file:
+                temp_file.write(stored)
+            os.replace(temp_file.name, self._get_entry_path(key))
+        if self._connection is not None:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, value) VALUES (?, ?)",
+                    (key, stored),
+                )
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+
+@functools.lru_cache(maxsize=256)
+def _get_function_identity(function: Callable) -> tuple:
+    # Identifies a function the same way in every process, like the calculation functions of result keys
+    return (
+        getattr(function, "__module__", None),
+        getattr(function, "__qualname__", repr(function)),
+        _get_code_fingerprint(function),
+    )
+
+
+def _get_code_fingerprint(calc_function: Callable) -> str:
+    code = getattr(calc_function, "__code__", None)
+    if code is None:
+        return ""
+    fingerprint = hashlib.sha256()
+    _update_code_fingerprint(fingerprint, code)
+    return fingerprint.hexdigest()
+
+
+def _update_code_fingerprint(fingerprint, code):
+    # The bytecode, names, and constants define what a function does. Nested functions, comprehensions, and lambdas are
+    # code object constants of their own.
+    fingerprint.update(code.co_code)
+    fingerprint.update(repr((code.co_names, code.co_varnames)).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _update_code_fingerprint(fingerprint, const)
+        elif isinstance(const, frozenset):
+            # The iteration order of sets depends on the hash seed of the process
+            fingerprint.update(repr(sorted(repr(c) for c in const)).encode())
+        else:
+            fingerprint.update(repr(const).encode())
+
+
+def _canonical_input_vals(input_vals: dict[str, any]) -> str:
+    # Keys are sorted so equal inputs always hash the same regardless of the order they were given in
+    return json.dumps(
+        {str(name): _canonical_value(value) for name, value in input_vals.items()},
+        sort_keys=True,
+    )
+
+
+def _canonical_value(value):
+    """Returns a JSON serializable form of a value for a cache key. Values keep their types (e.g. 1 and 1.0 are
+    different values) and NumPy arrays are hashed with their data type and shape.
+
+    :raises TypeError: If the value has no canonical form. The repr of other objects can be equal for different
+        values (e.g. large NumPy arrays are truncated), so they are never used in a key.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return [type(value).__name__, value]
+    if isinstance(value, (list, tuple)):
+        return [type(value).__name__, [_canonical_value(v) for v in value]]
+    if isinstance(value, dict):
+        return [
+            type(value).__name__,
+            sorted(
+                [json.dumps(_canonical_value(k)), _canonical_value(v)]
+                for k, v in value.items()
+            ),
+        ]
+    if numpy_installed and isinstance(value, (np.ndarray, np.generic)):
+        array = np.ascontiguousarray(value)
+        if array.dtype.hasobject:
+            data = _canonical_value(array.tolist())
+        else:
+            data = hashlib.sha256(array.tobytes()).hexdigest()
+        return [type(value).__name__, array.dtype.str, list(array.shape), data]
+
+    raise TypeError(
+        f"A value of type {type(value).__name__} can not be used in a cache key. Use numbers, strings, lists, "
+        "tuples, dicts, or NumPy arrays."
+    )
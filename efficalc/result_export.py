@@ -0,0 +1,104 @@
+import json
+from typing import Iterable, TextIO
+
+from efficalc import Calculation, Comparison, Input, Symbolic
+from efficalc.base_definitions.shared import _has_numeric_value
+
+
+def to_result_record(item, include_symbolic: bool = False) -> dict | None:
+    """Returns a plain dictionary with the result of a calculation item that can be serialized as JSON or sent between
+    processes without the expression tree of the item. No report HTML or LaTeX text conversion is involved.
+
+    Records of :class:`.Input`, :class:`.Calculation`, :class:`.Symbolic`, and :class:`.Comparison` items have the
+    keys:
+
+    - type: The class name of the item
+    - name: The name of the item, or the LaTeX of the comparison for comparisons
+    - value: The value or result of the item, True or False for comparisons, None for a :class:`.Symbolic` that is
+      only symbolic (e.g. it has a text expression)
+    - unit: The unit of the item, None for comparisons
+    - result_check: Whether the item is marked as a result
+    - passing: Whether a comparison passes, None for other items
+    - message: The message of a comparison, None for other items
+    - error: The error message of the item, None if there was no error
+
+    :param item: The calculation item
+    :param include_symbolic: Include the "symbolic" and "substituted" LaTeX strings of the item, defaults to False
+    :type include_symbolic: bool, optional
+    :return: The result record, or None for items without a result (e.g. :class:`.Heading`)
+    :rtype: dict or None
+    """
+    if isinstance(item, Comparison):
+        passing = item.is_passing()
+        record = {
+            "type": type(item).__name__,
+            "name": item.name,
+            "value": passing,
+            "unit": None,
+            "result_check": item.result_check,
+            "passing": passing,
+            "message": item.get_message(),
+            "error": item._error,
+        }
+    elif isinstance(item, Input):
+        record = {
+            "type": type(item).__name__,
+            "name": item.name,
+            "value": item.get_value(),
+            "unit": item.unit,
+            "result_check": False,
+            "passing": None,
+            "message": None,
+            "error": None,
+        }
+    elif isinstance(item, (Calculation, Symbolic)):
+        if isinstance(item, Symbolic) and not _has_numeric_value(item.operation):
+            # A symbolic-only expression has no result, and it is never evaluated in a report either
+            value, error = None, item.error
+        else:
+            value, error = _read_result(item)
+        record = {
+            "type": type(item).__name__,
+            "name": item.name,
+            "value": value,
+            "unit": item.unit,
+            "result_check": item.result_check,
+            "passing": None,
+            "message": None,
+            "error": error,
+        }
+    else:
+        return None
+
+    if include_symbolic:
+        record["symbolic"] = item.str_symbolic()
+        record["substituted"] = item.str_substituted()
+    return record
+
+
+def _read_result(item: Calculation | Symbolic) -> tuple[any, str | None]:
+    # Evaluating an item sets its error, which is put back afterwards so exporting a record never changes the item
+    previous_error = item.error
+    try:
+        value = item.get_value()
+        return value, item.error
+    finally:
+        item.error = previous_error
+
+
+def write_jsonl(records: Iterable[dict], writer: TextIO) -> int:
+    """Writes records as JSON Lines, one JSON object per line, as each record is produced. Values that are not JSON
+    serializable are written as strings.
+
+    :param records: The records to write, e.g. from :func:`.CalculationRunner.iter_result_records`
+    :type records: Iterable[dict]
+    :param writer: Any object with a `write(str)` method, e.g. an open text file or a `io.StringIO`
+    :type writer: TextIO
+    :return: The number of records written
+    :rtype: int
+    """
+    count = 0
+    for record in records:
+        writer.write(json.dumps(record, default=str) + "\n")
+        count += 1
+    return count
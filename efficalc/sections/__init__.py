@@ -11,16 +11,34 @@ from .alum_circular import ALL_ALUMINUM_CIRCULAR_NAMES, AluminumCircular
 from .alum_rectangular import ALL_ALUMINUM_RECTANGULAR_NAMES, AluminumRectangular
 from .alum_wide_flange import ALL_ALUMINUM_WIDE_FLANGE_NAMES, AluminumWideFlange
 from .section_query import (
+    INDEXED_SECTION_PROPERTIES,
+    SectionCatalog,
+    disable_section_catalog,
+    enable_section_catalog,
     get_aisc_angle,
+    get_aisc_angles,
     get_aisc_channel,
+    get_aisc_channels,
     get_aisc_circular,
+    get_aisc_circulars,
     get_aisc_double_angle,
+    get_aisc_double_angles,
     get_aisc_rectangular,
+    get_aisc_rectangulars,
     get_aisc_tee,
+    get_aisc_tees,
     get_aisc_wide_flange,
+    get_aisc_wide_flanges,
     get_aluminum_angle,
+    get_aluminum_angles,
     get_aluminum_channel,
+    get_aluminum_channels,
     get_aluminum_circular,
+    get_aluminum_circulars,
     get_aluminum_rectangular,
+    get_aluminum_rectangulars,
     get_aluminum_wide_flange,
+    get_aluminum_wide_flanges,
+    search_sections,
 )
+from .section_table import SectionTable, get_section_table
@@ -1,5 +1,11 @@
+import dataclasses
+import functools
 import os
+import pathlib
 import sqlite3
+import sys
+import threading
+from typing import Iterable, Iterator
 
 from efficalc.sections.aisc_angle import AiscAngle
 from efficalc.sections.aisc_channel import AiscChannel
@@ -32,6 +38,45 @@ ALUM_WIDE_FLANGE_TABLE = "aluminum_wide_flange"
 AISC_SECTION_SIZE_NAME_COLUMN = "AISC_name"
 ALUM_SECTION_SIZE_NAME_COLUMN = "Size"
 
+_SECTIONS_DB_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), SECTIONS_DB_NAME
+)
+_thread_connections = threading.local()
+_MAX_QUERY_PARAMETERS = 500
+
+# The properties with a database index in every section table that has them, for fast section searches
+INDEXED_SECTION_PROPERTIES = (
+    "W",
+    "A",
+    "d",
+    "OD",
+    "Ix",
+    "Iy",
+    "Sx",
+    "Sy",
+    "Zx",
+    "Zy",
+    "I",
+    "S",
+    "Z",
+)
+
+# The table and the section size name column of each section type
+_SECTION_TABLES = {
+    AiscAngle: (AISC_ANGLE_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscChannel: (AISC_CHANNEL_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscCircular: (AISC_CIRCULAR_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscDoubleAngle: (AISC_DOUBLE_ANGLE_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscRectangular: (AISC_RECTANGULAR_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscTee: (AISC_TEE_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AiscWideFlange: (AISC_WIDE_FLANGE_TABLE, AISC_SECTION_SIZE_NAME_COLUMN),
+    AluminumAngle: (ALUM_ANGLE_TABLE, ALUM_SECTION_SIZE_NAME_COLUMN),
+    AluminumChannel: (ALUM_CHANNEL_TABLE, ALUM_SECTION_SIZE_NAME_COLUMN),
+    AluminumCircular: (ALUM_CIRCULAR_TABLE, ALUM_SECTION_SIZE_NAME_COLUMN),
+    AluminumRectangular: (ALUM_RECTANGULAR_TABLE, ALUM_SECTION_SIZE_NAME_COLUMN),
+    AluminumWideFlange: (ALUM_WIDE_FLANGE_TABLE, ALUM_SECTION_SIZE_NAME_COLUMN),
+}
+
 
 def get_aisc_angle(section_size: str) -> AiscAngle:
     """Fetches the properties of a specified AISC Angle section from the sections database and returns an
@@ -43,10 +88,10 @@ def get_aisc_angle(section_size: str) -> AiscAngle:
     :rtype: `efficalc.sections.AiscAngle`
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
-    row = _fetch_aisc_section_row(AISC_ANGLE_TABLE, section_size)
+    section = _fetch_section(AiscAngle, section_size)
 
-    if row:
-        return AiscAngle(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC angle section size named {section_size} could not be found."
@@ -65,10 +110,10 @@ def get_aisc_channel(section_size: str) -> AiscChannel:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_CHANNEL_TABLE, section_size)
+    section = _fetch_section(AiscChannel, section_size)
 
-    if row:
-        return AiscChannel(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC channel section size named {section_size} could not be found."
@@ -87,10 +132,10 @@ def get_aisc_circular(section_size: str) -> AiscCircular:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_CIRCULAR_TABLE, section_size)
+    section = _fetch_section(AiscCircular, section_size)
 
-    if row:
-        return AiscCircular(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC circular section size named {section_size} could not be found."
@@ -109,10 +154,10 @@ def get_aisc_double_angle(section_size: str) -> AiscDoubleAngle:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_DOUBLE_ANGLE_TABLE, section_size)
+    section = _fetch_section(AiscDoubleAngle, section_size)
 
-    if row:
-        return AiscDoubleAngle(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC double angle section size named {section_size} could not be found."
@@ -131,10 +176,10 @@ def get_aisc_rectangular(section_size: str) -> AiscRectangular:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_RECTANGULAR_TABLE, section_size)
+    section = _fetch_section(AiscRectangular, section_size)
 
-    if row:
-        return AiscRectangular(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC rectangular section size named {section_size} could not be found."
@@ -153,10 +198,10 @@ def get_aisc_tee(section_size: str) -> AiscTee:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_TEE_TABLE, section_size)
+    section = _fetch_section(AiscTee, section_size)
 
-    if row:
-        return AiscTee(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC tee section size named {section_size} could not be found."
@@ -175,10 +220,10 @@ def get_aisc_wide_flange(section_size: str) -> AiscWideFlange:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aisc_section_row(AISC_WIDE_FLANGE_TABLE, section_size)
+    section = _fetch_section(AiscWideFlange, section_size)
 
-    if row:
-        return AiscWideFlange(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The AISC wide flange section size named {section_size} could not be found."
@@ -197,10 +242,10 @@ def get_aluminum_angle(section_size: str) -> AluminumAngle:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aluminum_section_row(ALUM_ANGLE_TABLE, section_size)
+    section = _fetch_section(AluminumAngle, section_size)
 
-    if row:
-        return AluminumAngle(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The aluminum angle section size named {section_size} could not be found."
@@ -219,10 +264,10 @@ def get_aluminum_channel(section_size: str) -> AluminumChannel:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aluminum_section_row(ALUM_CHANNEL_TABLE, section_size)
+    section = _fetch_section(AluminumChannel, section_size)
 
-    if row:
-        return AluminumChannel(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The aluminum channel section size named {section_size} could not be found."
@@ -241,10 +286,10 @@ def get_aluminum_circular(section_size: str) -> AluminumCircular:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aluminum_section_row(ALUM_CIRCULAR_TABLE, section_size)
+    section = _fetch_section(AluminumCircular, section_size)
 
-    if row:
-        return AluminumCircular(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The aluminum circular section size named {section_size} could not be found."
@@ -263,10 +308,10 @@ def get_aluminum_rectangular(section_size: str) -> AluminumRectangular:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aluminum_section_row(ALUM_RECTANGULAR_TABLE, section_size)
+    section = _fetch_section(AluminumRectangular, section_size)
 
-    if row:
-        return AluminumRectangular(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The aluminum rectangular section size named {section_size} could not be found."
@@ -285,37 +330,581 @@ def get_aluminum_wide_flange(section_size: str) -> AluminumWideFlange:
     :raises ValueError: If the specified section size cannot be found in the sections database.
     """
 
-    row = _fetch_aluminum_section_row(ALUM_WIDE_FLANGE_TABLE, section_size)
+    section = _fetch_section(AluminumWideFlange, section_size)
 
-    if row:
-        return AluminumWideFlange(**row)
+    if section:
+        return section
     else:
         raise ValueError(
             f"The aluminum wide flange section size named {section_size} could not be found."
         )
 
 
-def _fetch_aisc_section_row(table: str, section_size: str):
-    return _fetch_section_row(table, section_size, AISC_SECTION_SIZE_NAME_COLUMN)
+def get_aisc_angles(section_sizes: Iterable[str]) -> dict[str, AiscAngle]:
+    """
+    Fetches the properties of many Angle sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscAngle` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscAngle`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
 
+    return _fetch_sections_or_raise(AiscAngle, section_sizes, "AISC angle")
 
-def _fetch_aluminum_section_row(table: str, section_size: str):
-    return _fetch_section_row(table, section_size, ALUM_SECTION_SIZE_NAME_COLUMN)
 
+def get_aisc_channels(section_sizes: Iterable[str]) -> dict[str, AiscChannel]:
+    """
+    Fetches the properties of many Channel sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscChannel` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscChannel`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
 
-def _fetch_section_row(table: str, section_size: str, size_field_name: str):
-    database_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(database_dir, SECTIONS_DB_NAME)
-    conn = sqlite3.connect(db_path)
+    return _fetch_sections_or_raise(AiscChannel, section_sizes, "AISC channel")
+
+
+def get_aisc_circulars(section_sizes: Iterable[str]) -> dict[str, AiscCircular]:
+    """
+    Fetches the properties of many Circular sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscCircular` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscCircular`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AiscCircular, section_sizes, "AISC circular")
+
+
+def get_aisc_double_angles(section_sizes: Iterable[str]) -> dict[str, AiscDoubleAngle]:
+    """
+    Fetches the properties of many Double Angle sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscDoubleAngle` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscDoubleAngle`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AiscDoubleAngle, section_sizes, "AISC double angle")
+
+
+def get_aisc_rectangulars(section_sizes: Iterable[str]) -> dict[str, AiscRectangular]:
+    """
+    Fetches the properties of many Rectangular sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscRectangular` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscRectangular`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AiscRectangular, section_sizes, "AISC rectangular")
+
+
+def get_aisc_tees(section_sizes: Iterable[str]) -> dict[str, AiscTee]:
+    """
+    Fetches the properties of many Tee sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscTee` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscTee`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AiscTee, section_sizes, "AISC tee")
+
+
+def get_aisc_wide_flanges(section_sizes: Iterable[str]) -> dict[str, AiscWideFlange]:
+    """
+    Fetches the properties of many Wide Flange sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AiscWideFlange` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the AISC_name property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AiscWideFlange`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AiscWideFlange, section_sizes, "AISC wide flange")
+
+
+def get_aluminum_angles(section_sizes: Iterable[str]) -> dict[str, AluminumAngle]:
+    """
+    Fetches the properties of many Aluminum Angle sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AluminumAngle` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the Size property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AluminumAngle`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
 
-    # Format returned rows as a dictionary-like object with key accessors
-    conn.row_factory = sqlite3.Row
+    return _fetch_sections_or_raise(AluminumAngle, section_sizes, "aluminum angle")
 
-    cursor = conn.cursor()
-    cursor.execute(
-        f"SELECT * FROM {table} WHERE {size_field_name} = ?;",
-        (section_size,),
+
+def get_aluminum_channels(section_sizes: Iterable[str]) -> dict[str, AluminumChannel]:
+    """
+    Fetches the properties of many Aluminum Channel sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AluminumChannel` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the Size property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AluminumChannel`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(AluminumChannel, section_sizes, "aluminum channel")
+
+
+def get_aluminum_circulars(section_sizes: Iterable[str]) -> dict[str, AluminumCircular]:
+    """
+    Fetches the properties of many Aluminum Circular sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AluminumCircular` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the Size property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AluminumCircular`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(
+        AluminumCircular, section_sizes, "aluminum circular"
     )
-    row = cursor.fetchone()
-    conn.close()
-    return row
+
+
+def get_aluminum_rectangulars(
+    section_sizes: Iterable[str],
+) -> dict[str, AluminumRectangular]:
+    """
+    Fetches the properties of many Aluminum Rectangular sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AluminumRectangular` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the Size property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AluminumRectangular`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(
+        AluminumRectangular, section_sizes, "aluminum rectangular"
+    )
+
+
+def get_aluminum_wide_flanges(
+    section_sizes: Iterable[str],
+) -> dict[str, AluminumWideFlange]:
+    """
+    Fetches the properties of many Aluminum Wide Flange sections from the sections database at once and returns a dictionary of
+    :class:`efficalc.sections.AluminumWideFlange` instances by section size.
+
+    :param section_sizes: The designations of the section sizes as the Size property defined in the database.
+    :type section_sizes: Iterable[str]
+    :return: The sections populated with the properties of each specified section size, in the order of
+        `section_sizes`.
+    :rtype: dict[str, `efficalc.sections.AluminumWideFlange`]
+    :raises ValueError: If any of the specified section sizes cannot be found in the sections database. All missing
+        section sizes are listed in the error.
+    """
+
+    return _fetch_sections_or_raise(
+        AluminumWideFlange, section_sizes, "aluminum wide flange"
+    )
+
+
+def search_sections(
+    section_type: type,
+    min_values: dict[str, float] = None,
+    max_values: dict[str, float] = None,
+    order_by: str = None,
+    descending: bool = False,
+    limit: int = None,
+    page_size: int = 100,
+) -> Iterator:
+    """
+    Searches the sections database for the sections of a type with numeric properties within the specified limits.
+    The search is done by the database, which has indexes on common properties (see `INDEXED_SECTION_PROPERTIES`), and
+    the matching sections are fetched a page at a time as the results are iterated, so even large result sets are never
+    loaded at once.
+
+    :param section_type: The section type to search, e.g. :class:`efficalc.sections.AiscWideFlange`
+    :type section_type: type
+    :param min_values: The minimum value of each property by property name, inclusive, defaults to None
+    :type min_values: dict[str, float], optional
+    :param max_values: The maximum value of each property by property name, inclusive, defaults to None
+    :type max_values: dict[str, float], optional
+    :param order_by: The name of the property to sort the sections by, defaults to None for the database order
+    :type order_by: str, optional
+    :param descending: Sort the sections from the largest to the smallest `order_by` value, defaults to False
+    :type descending: bool, optional
+    :param limit: The maximum number of sections to return, defaults to None for all matching sections
+    :type limit: int, optional
+    :param page_size: The number of sections fetched from the database at a time, defaults to 100
+    :type page_size: int, optional
+    :return: An iterator of the matching sections, in order
+    :rtype: Iterator
+    :raises ValueError: If the section type is not in the sections database, or a property is not a numeric
+        property of the section type.
+
+    .. code-block:: python
+
+        >>> beams = search_sections(AiscWideFlange, {"Zx": 120}, {"d": 24}, order_by="W", limit=3)
+        >>> [beam.AISC_name for beam in beams]
+        ['W24X55', 'W21X55', 'W21X57']
+    """
+    if section_type not in _SECTION_TABLES:
+        raise ValueError(
+            f"{section_type} is not a section type in the sections database."
+        )
+    if page_size < 1:
+        raise ValueError(f"The page size must be at least 1, not {page_size}.")
+
+    table, size_field_name = _SECTION_TABLES[section_type]
+    numeric_properties = _get_numeric_properties(section_type)
+    conditions = []
+    parameters = []
+    for operator, values in ((">=", min_values), ("<=", max_values)):
+        for name, value in (values or {}).items():
+            if name not in numeric_properties:
+                raise ValueError(
+                    f"{name} is not a numeric property of {section_type.__name__}."
+                )
+            conditions.append(f"{name} {operator} ?")
+            parameters.append(value)
+
+    order = "rowid"
+    if order_by is not None:
+        if order_by not in _get_property_names(section_type):
+            raise ValueError(
+                f"{order_by} is not a property of {section_type.__name__}."
+            )
+        order = f"{order_by} {'DESC' if descending else 'ASC'}, rowid"
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Catalog sections are looked up by name instead of being created from the rows
+    columns = size_field_name if _section_catalog is not None else "*"
+    sql = f"SELECT {columns} FROM {table}{where} ORDER BY {order} LIMIT ? OFFSET ?;"
+    return _iter_search_pages(section_type, sql, parameters, limit, page_size)
+
+
+class SectionCatalog(object):
+    """An in-memory catalog of the sections database for fast repeated section lookups, e.g. in design optimizers.
+
+    All sections of a type are loaded with a single query the first time a section of that type is looked up, and
+    then every lookup of that type is a dictionary lookup that returns the same instance. Catalog sections are
+    read-only and can be shared between calculations and threads: setting any property raises a
+    `dataclasses.FrozenInstanceError`. Create a new section instance, e.g. `AiscWideFlange(**dataclasses.asdict(w))`,
+    for a section that can be modified.
+
+    Use :func:`enable_section_catalog` to make the section getters (e.g. :func:`get_aisc_wide_flange`) use the
+    catalog.
+
+    .. code-block:: python
+
+        >>> catalog = enable_section_catalog()
+        >>> get_aisc_wide_flange("W14X109") is get_aisc_wide_flange("W14X109")
+        True
+        >>> catalog.get(AiscWideFlange, "W14X109").d
+        14.3
+    """
+
+    def __init__(self):
+        self._sections: dict[type, dict[str, any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, section_type: type, section_size: str):
+        """Returns the read-only section of a type and size.
+
+        :param section_type: The section type, e.g. :class:`efficalc.sections.AiscWideFlange`
+        :type section_type: type
+        :param section_size: The name of the section size as the AISC_name (AISC sections) or Size (aluminum sections)
+            property defined in the database
+        :type section_size: str
+        :return: The section of the specified type and size
+        :raises ValueError: If the specified section size cannot be found in the sections database.
+        """
+        section = self._get_sections(section_type).get(section_size)
+        if section is None:
+            raise ValueError(
+                f"The {section_type.__name__} section size named {section_size} could not be found."
+            )
+        return section
+
+    def load_all(self) -> None:
+        """Loads the sections of every type, e.g. before starting worker threads or forking worker processes."""
+        for section_type in _SECTION_TABLES:
+            self._get_sections(section_type)
+
+    def memory_usage(self) -> int:
+        """Returns the approximate memory used by the loaded sections, including their property values.
+
+        :return: The memory usage in bytes
+        :rtype: int
+        """
+        counted_ids = set()
+
+        def size_of(value) -> int:
+            if id(value) in counted_ids:
+                return 0
+            counted_ids.add(id(value))
+            return sys.getsizeof(value)
+
+        total = size_of(self._sections)
+        for sections in list(self._sections.values()):
+            total += size_of(sections)
+            for section_size, section in sections.items():
+                total += size_of(section_size) + size_of(section)
+                total += size_of(section.__dict__)
+                total += sum(size_of(value) for value in section.__dict__.values())
+        return total
+
+    def _get_sections(self, section_type: type) -> dict[str, any]:
+        sections = self._sections.get(section_type)
+        if sections is None:
+            with self._lock:
+                sections = self._sections.get(section_type)
+                if sections is None:
+                    sections = _load_frozen_sections(section_type)
+                    self._sections[section_type] = sections
+        return sections
+
+
+_section_catalog: SectionCatalog | None = None
+
+
+def enable_section_catalog() -> SectionCatalog:
+    """Makes the section getters (e.g. :func:`get_aisc_wide_flange`) return read-only sections from an in-memory
+    :class:`SectionCatalog` instead of querying the sections database for every lookup. The catalog is shared by all
+    threads and is kept until :func:`disable_section_catalog` is called.
+
+    :return: The catalog used by the section getters
+    :rtype: :class:`SectionCatalog`
+    """
+    global _section_catalog
+    if _section_catalog is None:
+        _section_catalog = SectionCatalog()
+    return _section_catalog
+
+
+def disable_section_catalog() -> None:
+    """Makes the section getters query the sections database and return new sections again, and frees the memory
+    used by the catalog."""
+    global _section_catalog
+    _section_catalog = None
+
+
+def _load_frozen_sections(section_type: type) -> dict[str, any]:
+    table, size_field_name = _SECTION_TABLES[section_type]
+    frozen_type = _get_frozen_section_type(section_type)
+    sections = {}
+    for row in _get_connection().execute(f"SELECT * FROM {table};"):
+        section = section_type(**row)
+        # The section is created as a regular section and then made read-only
+        section.__class__ = frozen_type
+        sections[row[size_field_name]] = section
+    return sections
+
+
+@functools.lru_cache(maxsize=None)
+def _get_frozen_section_type(section_type: type) -> type:
+    """Returns a read-only subclass of a section dataclass that has the same name, fields, and equality."""
+
+    def raise_frozen(self, name, *args):
+        raise dataclasses.FrozenInstanceError(
+            f"cannot assign to field '{name}' of a catalog section"
+        )
+
+    def get_compared_fields(self) -> tuple:
+        return tuple(
+            getattr(self, f.name) for f in dataclasses.fields(self) if f.compare
+        )
+
+    def eq_section(self, other) -> bool:
+        # The dataclass equality only compares sections of the exact same class, so catalog sections are compared
+        # with regular sections of their section type here
+        if other.__class__ not in (section_type, self.__class__):
+            return NotImplemented
+        return get_compared_fields(self) == get_compared_fields(other)
+
+    def hash_section(self) -> int:
+        return hash(get_compared_fields(self))
+
+    def reduce_section(self):
+        # Unpickled sections are regular sections, since the read-only subclass can't be found by name
+        return section_type, tuple(
+            getattr(self, f.name) for f in dataclasses.fields(self)
+        )
+
+    return type(
+        section_type.__name__,
+        (section_type,),
+        {
+            "__module__": section_type.__module__,
+            "__qualname__": section_type.__qualname__,
+            "__setattr__": raise_frozen,
+            "__delattr__": raise_frozen,
+            "__eq__": eq_section,
+            "__hash__": hash_section,
+            "__reduce__": reduce_section,
+        },
+    )
+
+
+def _fetch_section(section_type: type, section_size: str):
+    if _section_catalog is not None:
+        return _section_catalog._get_sections(section_type).get(section_size)
+
+    table, size_field_name = _SECTION_TABLES[section_type]
+    row = _fetch_section_row(table, section_size, size_field_name)
+    return section_type(**row) if row else None
+
+
+def _fetch_sections_or_raise(
+    section_type: type, section_sizes: Iterable[str], family_name: str
+) -> dict[str, any]:
+    # Duplicate sizes are fetched once, in the order they are first requested
+    section_sizes = list(dict.fromkeys(section_sizes))
+    if _section_catalog is not None:
+        catalog_sections = _section_catalog._get_sections(section_type)
+        found = {
+            size: catalog_sections[size]
+            for size in section_sizes
+            if size in catalog_sections
+        }
+    else:
+        table, size_field_name = _SECTION_TABLES[section_type]
+        rows = _fetch_section_rows(table, section_sizes, size_field_name)
+        found = {
+            size: section_type(**rows[size]) for size in section_sizes if size in rows
+        }
+
+    missing = [size for size in section_sizes if size not in found]
+    if missing:
+        raise ValueError(
+            f"The {family_name} section sizes named {', '.join(missing)} could not be found."
+        )
+    return found
+
+
+def _fetch_section_rows(
+    table: str, section_sizes: list[str], size_field_name: str
+) -> dict[str, sqlite3.Row]:
+    rows = {}
+    connection = _get_connection()
+    # Sizes are queried in batches to stay within the sqlite limit on query parameters
+    for start in range(0, len(section_sizes), _MAX_QUERY_PARAMETERS):
+        batch = section_sizes[start : start + _MAX_QUERY_PARAMETERS]
+        placeholders = ", ".join("?" * len(batch))
+        cursor = connection.execute(
+            f"SELECT * FROM {table} WHERE {size_field_name} IN ({placeholders});",
+            batch,
+        )
+        rows.update((row[size_field_name], row) for row in cursor)
+    return rows
+
+
+def _iter_search_pages(
+    section_type: type,
+    sql: str,
+    parameters: list,
+    limit: int | None,
+    page_size: int,
+) -> Iterator:
+    offset = 0
+    while limit is None or offset < limit:
+        count = page_size if limit is None else min(page_size, limit - offset)
+        rows = _get_connection().execute(sql, (*parameters, count, offset)).fetchall()
+        if _section_catalog is not None:
+            catalog_sections = _section_catalog._get_sections(section_type)
+            yield from (catalog_sections[row[0]] for row in rows)
+        else:
+            yield from (section_type(**row) for row in rows)
+
+        if len(rows) < count:
+            return
+        offset += count
+
+
+@functools.lru_cache(maxsize=None)
+def _get_property_names(section_type: type) -> frozenset[str]:
+    return frozenset(f.name for f in dataclasses.fields(section_type))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_numeric_properties(section_type: type) -> frozenset[str]:
+    return frozenset(
+        f.name for f in dataclasses.fields(section_type) if f.type in (float, int)
+    )
+
+
+def _fetch_section_row(table: str, section_size: str, size_field_name: str):
+    cursor = _get_connection().execute(
+        _get_select_row_sql(table, size_field_name), (section_size,)
+    )
+    return cursor.fetchone()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Returns the read-only connection to the sections database for the current thread. Each thread (and each forked
+    process) opens its own connection on its first lookup and reuses it, along with its prepared statements, for every
+    later lookup."""
+    connection = getattr(_thread_connections, "connection", None)
+    if connection is None or _thread_connections.pid != os.getpid():
+        # The database is never written, so it is opened without any file locking or change detection
+        connection = sqlite3.connect(
+            pathlib.Path(_SECTIONS_DB_PATH).as_uri() + "?mode=ro&immutable=1",
+            uri=True,
+        )
+        # Format returned rows as a dictionary-like object with key accessors
+        connection.row_factory = sqlite3.Row
+        _thread_connections.connection = connection
+        _thread_connections.pid = os.getpid()
+    return connection
+
+
+@functools.lru_cache(maxsize=None)
+def _get_select_row_sql(table: str, size_field_name: str) -> str:
+    # The same SQL text for every lookup lets sqlite reuse the prepared statement
+    return f"SELECT * FROM {table} WHERE {size_field_name} = ?;"
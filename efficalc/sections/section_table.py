@@ -0,0 +1,145 @@
+import dataclasses
+import functools
+import importlib.util
+from typing import Iterator
+
+from efficalc.sections.section_query import (
+    _SECTION_TABLES,
+    _fetch_sections_or_raise,
+    _get_connection,
+)
+
+# NumPy is not required for any other functionality in the efficalc package, so only import it if it is installed.
+numpy_installed = importlib.util.find_spec("numpy")
+if numpy_installed:
+    import numpy as np
+
+
+class SectionTable(object):
+    """All sections of a type from the sections database as NumPy columns, for checking every section at once with
+    array expressions. Columns have the same names as the properties of the section dataclass, e.g. `table["Zx"]`.
+    Numeric properties are float arrays, with NaN where a section has no value, and text properties are object arrays.
+
+    Tables are shared and their columns are read-only. Use :func:`get_section_table` to get the table of a section
+    type.
+
+    .. code-block:: python
+
+        >>> table = get_section_table(AiscWideFlange)
+        >>> passing = (0.9 * 50 * table["Zx"] >= 6000) & (table["d"] <= 24)
+        >>> lightest = table.to_sections(passing & (table["W"] == table["W"][passing].min()))
+        >>> [section.AISC_name for section in lightest]
+        ['W24X55']
+
+    :param section_type: The section type of the table, e.g. :class:`efficalc.sections.AiscWideFlange`
+    :type section_type: type
+    :param columns: The column arrays by property name
+    :type columns: dict[str, numpy.ndarray]
+    """
+
+    def __init__(self, section_type: type, columns: dict[str, "np.ndarray"]):
+        self.section_type = section_type
+        self.columns = columns
+        _, self._size_field_name = _SECTION_TABLES[section_type]
+
+    def __len__(self) -> int:
+        return len(self.columns[self._size_field_name])
+
+    def __getitem__(self, property_name: str) -> "np.ndarray":
+        return self.columns[property_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    @property
+    def names(self) -> "np.ndarray":
+        """The section size names (the AISC_name or Size property) in the order of the table rows."""
+        return self.columns[self._size_field_name]
+
+    def to_section(self, index: int):
+        """Returns the section of a table row as a section dataclass, the same as the section getter of its type
+        (e.g. :func:`get_aisc_wide_flange`) returns.
+
+        :param index: The row index
+        :type index: int
+        :return: The section of the row
+        """
+        return self.to_sections([index])[0]
+
+    def to_sections(self, selection) -> list:
+        """Returns the sections of the selected table rows as section dataclasses, the same as the bulk section getter
+        of their type (e.g. :func:`get_aisc_wide_flanges`) returns.
+
+        :param selection: A boolean mask with an element for every row (e.g. the result of a check) or an array of
+            row indexes
+        :type selection: numpy.ndarray or list
+        :return: The sections of the selected rows in table order (for masks) or index order (for indexes)
+        :rtype: list
+        """
+        names = [str(name) for name in self.names[np.asarray(selection)]]
+        sections = _fetch_sections_or_raise(
+            self.section_type, names, self.section_type.__name__
+        )
+        return [sections[name] for name in names]
+
+    def to_structured_array(self) -> "np.ndarray":
+        """Returns the table as a NumPy structured array with a record for every section and a field for every
+        property.
+
+        :return: The structured array of the table
+        :rtype: numpy.ndarray
+        """
+        structured = np.empty(
+            len(self),
+            dtype=[(name, column.dtype) for name, column in self.columns.items()],
+        )
+        for name, column in self.columns.items():
+            structured[name] = column
+        return structured
+
+
+def get_section_table(section_type: type) -> SectionTable:
+    """Returns all sections of a type from the sections database as NumPy columns (see :class:`SectionTable`). The
+    table is loaded with a single query the first time and then shared by every later call.
+
+    :param section_type: The section type, e.g. :class:`efficalc.sections.AiscWideFlange`
+    :type section_type: type
+    :return: The table of all sections of the type
+    :rtype: :class:`SectionTable`
+    :raises ValueError: If the section type is not in the sections database.
+    """
+    if not numpy_installed:
+        raise ImportError(
+            "NumPy is required for section tables. Install it with `pip install efficalc[numpy]`."
+        )
+    if section_type not in _SECTION_TABLES:
+        raise ValueError(
+            f"{section_type} is not a section type in the sections database."
+        )
+    return _load_section_table(section_type)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_section_table(section_type: type) -> SectionTable:
+    table, _ = _SECTION_TABLES[section_type]
+    fields = dataclasses.fields(section_type)
+    rows = (
+        _get_connection()
+        .execute(
+            f"SELECT {', '.join(f.name for f in fields)} FROM {table} ORDER BY rowid;"
+        )
+        .fetchall()
+    )
+
+    columns = {}
+    for i, field in enumerate(fields):
+        values = [row[i] for row in rows]
+        if field.type is str:
+            column = np.array(values, dtype=object)
+        else:
+            # Missing values are stored as NULL, which NumPy converts to NaN
+            column = np.array(values, dtype=float)
+        # Tables are shared by every caller, so their columns can't be changed
+        column.flags.writeable = False
+        columns[field.name] = column
+    return SectionTable(section_type, columns)
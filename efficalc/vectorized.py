@@ -0,0 +1,268 @@
+import dataclasses
+import importlib.util
+from functools import reduce
+from typing import Callable
+
+from latexexpr_efficalc import Expression, Operation, Variable
+
+from efficalc import Calculation, Comparison, Input, Symbolic
+from efficalc.base_definitions.shared import _ExpressionReference
+from efficalc.calculation_graph import CalculationGraph
+
+# NumPy is not required for any other functionality in the efficalc package, so only import it if it is installed.
+numpy_installed = importlib.util.find_spec("numpy")
+if numpy_installed:
+    import numpy as np
+
+
+@dataclasses.dataclass
+class VectorizedResults(object):
+    """The results of a calculation function evaluated over arrays of input values. Every array has the broadcast
+    shape of all array input values.
+
+    :param values: The result arrays by item name for every :class:`.Calculation` and :class:`.Symbolic` with
+        `result_check=True` and boolean arrays for every :class:`.Comparison` with `result_check=True`
+    :type values: dict[str, numpy.ndarray]
+    :param errors: Boolean masks by item name for every :class:`.Calculation` and :class:`.Symbolic` in `values`. An
+        element is True where the calculation could not be evaluated (e.g. a math domain error or a division by zero).
+        Like :func:`.Calculation.result`, the value of these elements is 0.
+    :type errors: dict[str, numpy.ndarray]
+    """
+
+    values: dict
+    errors: dict
+
+
+_COMPARISONS = {
+    "<": "less",
+    "<=": "less_equal",
+    "=": "equal",
+    "!=": "not_equal",
+    "==": "equal",
+    ">": "greater",
+    ">=": "greater_equal",
+}
+
+
+def _require_numpy():
+    if not numpy_installed:
+        raise ImportError(
+            "NumPy is required for vectorized calculations. Install it with `pip install efficalc[numpy]`."
+        )
+
+
+def _is_array(value) -> bool:
+    return numpy_installed and isinstance(value, np.ndarray)
+
+
+def _to_scalar_input_vals(input_vals: dict[str, any]) -> dict[str, any]:
+    """Replaces every array input value with its first element so the calculation function can be run once with
+    scalar values to record its calculation items."""
+    _require_numpy()
+    return {
+        name: value.flat[0].item() if _is_array(value) else value
+        for name, value in input_vals.items()
+    }
+
+
+def _evaluate_vectorized(
+    calculation_items: list,
+    value_reads: list,
+    input_vals: dict[str, any],
+    run_scalar: Callable[[dict[str, any]], list],
+) -> VectorizedResults:
+    """Evaluates the recorded calculation items with array semantics for the array values in `input_vals`. If the
+    calculation function reads the value of an item that depends on an array input, each element may take a
+    different path through the function, so every element is evaluated on its own with `run_scalar` instead.
+    """
+    _require_numpy()
+
+    array_inputs = [
+        item
+        for item in calculation_items
+        if isinstance(item, Input) and _is_array(input_vals.get(item.name))
+    ]
+    shape = np.broadcast_shapes(*(input_vals[i.name].shape for i in array_inputs))
+
+    array_dependents = CalculationGraph(calculation_items).get_downstream_items(
+        array_inputs
+    )
+    array_item_ids = {id(item) for item in array_inputs + array_dependents}
+    if any(id(item) in array_item_ids for item, _ in value_reads):
+        return _evaluate_elementwise(input_vals, shape, run_scalar)
+
+    values = {}
+    results = VectorizedResults({}, {})
+
+    with np.errstate(all="ignore"):
+        for item in calculation_items:
+            if isinstance(item, Input) and id(item) in array_item_ids:
+                values[id(item)] = np.asarray(input_vals[item.name], dtype=float)
+
+            elif isinstance(item, (Calculation, Symbolic)) and not item.is_symbolic():
+                if id(item) in array_item_ids:
+                    value, error = _evaluate_node(item.operation, values)
+                    value = np.where(error, 0.0, value)
+                    values[id(item)] = value
+                else:
+                    # Items that do not depend on any array input are the same for every element
+                    value = item.result()
+                    error = item.error is not None
+
+                if item.result_check:
+                    results.values[item.name] = np.broadcast_to(value, shape).copy()
+                    results.errors[item.name] = np.broadcast_to(error, shape).copy()
+
+            elif isinstance(item, Comparison) and item.result_check:
+                comparison = _evaluate_comparison(item, values)
+                results.values[item.name] = np.broadcast_to(comparison, shape).copy()
+
+    return results
+
+
+def _evaluate_elementwise(
+    input_vals: dict[str, any],
+    shape: tuple,
+    run_scalar: Callable[[dict[str, any]], list],
+) -> VectorizedResults:
+    """Runs the calculation function with `run_scalar` once for every element of the broadcast input arrays and
+    collects the results into arrays. An item that is not created for some elements (because those elements take
+    another branch) has a value of 0 (or False for a :class:`.Comparison`) and an error for those elements.
+    """
+    array_names = [name for name, value in input_vals.items() if _is_array(value)]
+    arrays = np.broadcast_arrays(*(input_vals[name] for name in array_names))
+    results = VectorizedResults({}, {})
+
+    for index in np.ndindex(shape):
+        element_vals = dict(input_vals)
+        for name, array in zip(array_names, arrays):
+            element_vals[name] = array[index].item()
+
+        for item in run_scalar(element_vals):
+            if isinstance(item, (Calculation, Symbolic)) and not item.is_symbolic():
+                if not item.result_check:
+                    continue
+                if item.name not in results.values:
+                    results.values[item.name] = np.zeros(shape)
+                    results.errors[item.name] = np.ones(shape, dtype=bool)
+                results.values[item.name][index] = item.result()
+                results.errors[item.name][index] = item.error is not None
+
+            elif isinstance(item, Comparison) and item.result_check:
+                if item.name not in results.values:
+                    results.values[item.name] = np.zeros(shape, dtype=bool)
+                results.values[item.name][index] = item.is_passing()
+
+    return results
+
+
+def _evaluate_node(node, values: dict) -> tuple:
+    """Returns the value of a node in an expression tree and a mask of the elements that could not be evaluated."""
+    if isinstance(node, _ExpressionReference):
+        return values.get(id(node.expression), node.value), False
+    elif isinstance(node, (Input, Calculation, Symbolic)):
+        return values.get(id(node), float(node)), False
+    elif isinstance(node, Variable):
+        return float(node), False
+    elif isinstance(node, Expression):
+        return _evaluate_node(node.operation, values)
+    elif isinstance(node, Operation):
+        evaluated_args = [_evaluate_node(arg, values) for arg in node.args]
+        arg_values = [value for value, _ in evaluated_args]
+        arg_error = reduce(np.logical_or, (error for _, error in evaluated_args))
+        value = _apply_operation(node.type, arg_values)
+        return value, arg_error | _get_operation_errors(node.type, arg_values, value)
+    else:
+        return float(node), False
+
+
+def _get_operation_errors(operation_type: str, args: list, value):
+    """Returns a mask of the elements where the scalar operation raises a math domain error or a division by zero
+    error. Elements that overflow are infinite, like the scalar result of an overflowing product, and are not
+    errors."""
+    finite_args = reduce(np.logical_and, (np.isfinite(v) for v in args))
+    # A math domain error is where the operation makes finite values not a number
+    errors = finite_args & np.isnan(value)
+
+    if len(args) == 2:
+        v0, v1 = args
+        if operation_type in ("/", "//"):
+            errors = errors | (v1 == 0)
+        elif operation_type == "pow":
+            errors = errors | ((v0 == 0) & (v1 < 0))
+        elif operation_type == "root":
+            errors = errors | (v0 == 0) | ((v1 == 0) & (v0 < 0))
+        elif operation_type == "log":
+            errors = errors | (v0 <= 0) | (v1 <= 0) | (v0 == 1)
+    elif operation_type in ("ln", "log10"):
+        errors = errors | (args[0] <= 0)
+    return errors
+
+
+def _apply_operation(operation_type: str, args: list):
+    """The array equivalent of `latexexpr_efficalc.Operation.result` for each supported operation type."""
+    if operation_type == "+":
+        return reduce(np.add, args)
+    if operation_type == "*":
+        return reduce(np.multiply, args, 1.0)
+    if operation_type == "max":
+        return reduce(np.maximum, args)
+    if operation_type == "min":
+        return reduce(np.minimum, args)
+
+    if len(args) == 2:
+        v0, v1 = args
+        if operation_type == "-":
+            return np.subtract(v0, v1)
+        if operation_type == "/":
+            return np.true_divide(v0, v1)
+        if operation_type == "//":
+            return np.floor_divide(v0, v1)
+        if operation_type == "pow":
+            return np.power(v0, v1)
+        if operation_type == "root":
+            return np.power(v1, 1.0 / v0)
+        if operation_type == "log":
+            return np.log(v1) / np.log(v0)
+
+    v = args[0]
+    if operation_type in ("", "pos", "()", "[]", "{}", "<>"):
+        return v
+    if operation_type == "neg":
+        return np.negative(v)
+    if operation_type == "abs":
+        return np.abs(v)
+    if operation_type == "sqr":
+        return np.power(v, 2)
+    if operation_type == "sqrt":
+        return np.sqrt(v)
+    if operation_type == "sin":
+        return np.sin(v)
+    if operation_type == "cos":
+        return np.cos(v)
+    if operation_type == "tan":
+        return np.tan(v)
+    if operation_type == "sinh":
+        return np.sinh(v)
+    if operation_type == "cosh":
+        return np.cosh(v)
+    if operation_type == "tanh":
+        return np.tanh(v)
+    if operation_type == "exp":
+        return np.exp(v)
+    if operation_type == "ln":
+        return np.log(v)
+    if operation_type == "log10":
+        return np.log(v) / np.log(10)
+
+    raise ValueError(f"The operation {operation_type} can not be vectorized.")
+
+
+def _evaluate_comparison(item: Comparison, values: dict):
+    if item.comparator not in _COMPARISONS:
+        return np.False_
+
+    value_a, error_a = _evaluate_node(item.a, values)
+    value_b, error_b = _evaluate_node(item.b, values)
+    comparison = getattr(np, _COMPARISONS[item.comparator])
+    return comparison(value_a, value_b) & ~(error_a | error_b)
@@ -1,4 +1,5 @@
 import pytest
+from latexexpr_efficalc import Variable
 
 from efficalc import (
     Calculation,
@@ -7,6 +8,8 @@ from efficalc import (
     clear_all_input_default_overrides,
     clear_saved_objects,
     get_all_calc_objects,
+    get_result_cache_stats,
+    reset_result_cache_stats,
     sqrt,
 )
 
@@ -75,6 +78,96 @@ def test_expression_with_expressions(common_setup_teardown):
     assert e.result() == -63
 
 
+def test_result_is_cached(common_setup_teardown):
+    a = Input("a", 2)
+    b = Calculation("b", a * 3)
+    reset_result_cache_stats()
+
+    assert b.result() == 6
+    assert b.result() == 6
+    stats = get_result_cache_stats()
+    assert stats.hits == 2
+    assert stats.misses == 0
+    assert stats.hit_rate == 1.0
+
+
+def test_result_cache_invalidated_by_upstream_input(common_setup_teardown):
+    a = Input("a", 2)
+    other = Input("other", 1)
+    b = Calculation("b", a * 3)
+    c = Calculation("c", b + 1)
+    d = Calculation("d", other + 1)
+    reset_result_cache_stats()
+
+    a.value = 4
+    assert c.result() == 13
+    assert b.result() == 12
+    assert d.result() == 2
+    stats = get_result_cache_stats()
+    assert stats.misses == 2
+    assert stats.hits == 2
+
+
+def test_result_cache_keeps_error(common_setup_teardown):
+    a = Input("a", -2)
+    b = Calculation("b", sqrt(a))
+    assert b.result() == 0.0
+    b.error = None
+    assert b.result() == 0.0
+    assert "could not be calculated" in b.error
+
+    a.value = 4
+    assert b.result() == 2
+
+
+def test_result_cache_clears_fixed_error(common_setup_teardown):
+    a = Input("a", -2)
+    b = Calculation("b", sqrt(a))
+    c = Calculation("c", b * 1000)
+    assert b.result() == 0.0
+    assert b.error is not None
+    assert c.format == "%.4g"
+
+    a.value = 4
+    assert b.result() == 2
+    assert b.error is None
+    assert c.result() == 2000
+    assert c.error is None
+    assert c.format == "%.0f"
+
+
+def test_result_cache_renders_reevaluated_result_like_fresh_run(
+    common_setup_teardown,
+):
+    a = Input("a", 2000)
+    b = Calculation("b", a * 1)
+    assert (
+        b.str_result_with_unit()
+        == Calculation("b", Input("a", 2000) * 1).str_result_with_unit()
+    )
+
+    for value in (-5.3, -2000.5, 3.14159, 999.99, 123456.7):
+        a.value = value
+        b.result()
+        fresh = Calculation("b", Input("a", value) * 1)
+        assert b.format == fresh.format
+        assert b.str_result_with_unit() == fresh.str_result_with_unit()
+
+
+def test_result_cache_invalidated_by_plain_variable(common_setup_teardown):
+    v = Variable("v", 3)
+    d = Calculation("d", v * 2)
+    e = Calculation("e", d + 1)
+    assert e.result() == 7
+
+    v.value = 10
+    assert d.result() == 20
+    assert e.result() == 21
+
+    v.value = 1
+    assert e.result() == 3
+
+
 def test_save_calc_item(common_setup_teardown):
     b = Calculation("b", 8)
     saved_items = get_all_calc_objects()
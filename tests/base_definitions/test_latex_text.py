@@ -0,0 +1,42 @@
+import pytest
+from pylatexenc.latex2text import LatexNodes2Text
+
+from efficalc.base_definitions.latex_text import _fast_latex_to_text, _latex_to_text
+
+
+@pytest.mark.parametrize(
+    "latex_code",
+    [
+        " 68.4 \\ \\mathrm{in}",
+        r"{\left( {a} \right)}^{ {2} } + {a} + {2}",
+        r"\phi_{b} \cdot M_{n}",
+        r"\max\left( a, b \right) \cdot  c",
+        r"\mathrm {kip \cdot ft}",
+        r"\left\{ a \right\} \# 1",
+        r"\pi{}a",
+    ],
+)
+def test_fast_latex_to_text_matches_pylatexenc(latex_code):
+    assert _fast_latex_to_text(latex_code) == LatexNodes2Text().latex_to_text(
+        latex_code
+    )
+
+
+@pytest.mark.parametrize(
+    "latex_code",
+    [
+        r"\frac{a}{b}",
+        r"\sqrt{a + b}",
+        r"\mathbf{x}",
+        r"\mathrm x",
+        "a -- b",
+        "a ~ b",
+        "$a$",
+        r"a \\ b",
+        "{a",
+        "a}",
+    ],
+)
+def test_fast_latex_to_text_skips_unsupported_latex(latex_code):
+    assert _fast_latex_to_text(latex_code) is None
+    assert _latex_to_text(latex_code) == LatexNodes2Text().latex_to_text(latex_code)
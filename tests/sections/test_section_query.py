@@ -1,6 +1,23 @@
+import dataclasses
+import pickle
+import sqlite3
+import threading
+
 import pytest
 
+from efficalc.sections import (
+    ALL_AISC_WIDE_FLANGE_NAMES,
+    AiscWideFlange,
+    AluminumAngle,
+    get_aisc_wide_flanges,
+    get_aluminum_angles,
+    search_sections,
+)
 from efficalc.sections.section_query import (
+    SectionCatalog,
+    _get_connection,
+    disable_section_catalog,
+    enable_section_catalog,
     get_aisc_angle,
     get_aisc_channel,
     get_aisc_circular,
@@ -178,3 +195,160 @@ def test_aluminum_wide_flange_lookup_size_not_found():
     with pytest.raises(ValueError) as e_info:
         get_aluminum_wide_flange("NOT_FOUND")
     assert "section size named NOT_FOUND could not be found" in str(e_info.value)
+
+
+def test_connection_is_reused_within_a_thread():
+    get_aisc_wide_flange("W14X109")
+    assert _get_connection() is _get_connection()
+
+    other_thread_connections = []
+    thread = threading.Thread(
+        target=lambda: other_thread_connections.append(_get_connection())
+    )
+    thread.start()
+    thread.join()
+    assert other_thread_connections[0] is not _get_connection()
+
+
+def test_connection_is_read_only():
+    with pytest.raises(sqlite3.OperationalError):
+        _get_connection().execute("CREATE TABLE not_allowed (id INTEGER);")
+
+
+@pytest.fixture
+def section_catalog():
+    yield enable_section_catalog()
+    disable_section_catalog()
+
+
+def test_catalog_getters_return_shared_read_only_sections(section_catalog):
+    section = get_aisc_wide_flange("W14X109")
+    assert section is get_aisc_wide_flange("W14X109")
+    assert isinstance(section, AiscWideFlange)
+    assert section.d == 14.3
+    assert repr(section).startswith("AiscWideFlange(")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        section.d = 10
+    assert hash(section) == hash(get_aisc_wide_flange("W14X109"))
+
+    with pytest.raises(ValueError) as e_info:
+        get_aisc_wide_flange("NOT_FOUND")
+    assert "section size named NOT_FOUND could not be found" in str(e_info.value)
+
+
+def test_catalog_sections_match_database_sections():
+    database_section = get_aluminum_angle("L 2 x 2 x 1/4")
+    with_catalog = SectionCatalog().get(AluminumAngle, "L 2 x 2 x 1/4")
+    assert dataclasses.asdict(with_catalog) == dataclasses.asdict(database_section)
+
+    unpickled = pickle.loads(pickle.dumps(with_catalog))
+    assert type(unpickled) is AluminumAngle
+    assert unpickled == database_section
+
+
+def test_catalog_sections_equal_database_sections():
+    database_section = get_aluminum_angle("L 2 x 2 x 1/4")
+    catalog = SectionCatalog()
+    with_catalog = catalog.get(AluminumAngle, "L 2 x 2 x 1/4")
+
+    assert with_catalog == database_section
+    assert database_section == with_catalog
+    assert with_catalog == catalog.get(AluminumAngle, "L 2 x 2 x 1/4")
+    assert with_catalog != get_aluminum_angle("L 2 x 2 x 1/8")
+    assert with_catalog != dataclasses.asdict(database_section)
+    assert hash(with_catalog) == hash(
+        SectionCatalog().get(AluminumAngle, "L 2 x 2 x 1/4")
+    )
+
+
+def test_catalog_loads_sections_lazily():
+    catalog = SectionCatalog()
+    empty_size = catalog.memory_usage()
+
+    catalog.get(AiscWideFlange, "W14X109")
+    one_type_size = catalog.memory_usage()
+    assert one_type_size > empty_size
+
+    catalog.load_all()
+    assert catalog.memory_usage() > one_type_size
+
+
+def test_bulk_lookup():
+    sections = get_aisc_wide_flanges(["W14X109", "W44X335", "W14X109"])
+    assert list(sections) == ["W14X109", "W44X335"]
+    assert sections["W14X109"] == get_aisc_wide_flange("W14X109")
+
+    angles = get_aluminum_angles(["L 3 x 2 x 3/8"])
+    assert angles["L 3 x 2 x 3/8"] == get_aluminum_angle("L 3 x 2 x 3/8")
+
+
+def test_bulk_lookup_all_sizes():
+    sections = get_aisc_wide_flanges(ALL_AISC_WIDE_FLANGE_NAMES)
+    assert list(sections) == list(ALL_AISC_WIDE_FLANGE_NAMES)
+
+
+def test_bulk_lookup_reports_all_missing_sizes():
+    with pytest.raises(ValueError) as e_info:
+        get_aisc_wide_flanges(["MISSING_1", "W14X109", "MISSING_2"])
+    assert "section sizes named MISSING_1, MISSING_2 could not be found" in str(
+        e_info.value
+    )
+
+
+def test_bulk_lookup_with_catalog(section_catalog):
+    sections = get_aisc_wide_flanges(["W14X109", "W44X335"])
+    assert sections["W14X109"] is get_aisc_wide_flange("W14X109")
+
+    with pytest.raises(ValueError) as e_info:
+        get_aisc_wide_flanges(["MISSING_1", "MISSING_2"])
+    assert "MISSING_1, MISSING_2" in str(e_info.value)
+
+
+def test_search_sections():
+    beams = list(
+        search_sections(
+            AiscWideFlange, {"Zx": 120}, {"d": 24}, order_by="W", page_size=7
+        )
+    )
+    assert len(beams) > 7
+    assert all(beam.Zx >= 120 and beam.d <= 24 for beam in beams)
+    assert [beam.W for beam in beams] == sorted(beam.W for beam in beams)
+
+    everything = list(search_sections(AiscWideFlange))
+    assert len(everything) == len(ALL_AISC_WIDE_FLANGE_NAMES)
+    expected = [s for s in everything if s.Zx >= 120 and s.d <= 24]
+    assert sorted(b.AISC_name for b in beams) == sorted(s.AISC_name for s in expected)
+
+
+def test_search_sections_limit_and_descending():
+    heaviest = list(
+        search_sections(AiscWideFlange, order_by="W", descending=True, limit=3)
+    )
+    assert len(heaviest) == 3
+    assert heaviest[0].W == max(s.W for s in search_sections(AiscWideFlange))
+    assert heaviest[0].W >= heaviest[1].W >= heaviest[2].W
+
+
+def test_search_sections_with_catalog(section_catalog):
+    angles = list(search_sections(AluminumAngle, max_values={"A": 1}))
+    assert angles
+    assert angles[0] is get_aluminum_angle(angles[0].Size)
+
+
+def test_search_sections_invalid_arguments():
+    with pytest.raises(ValueError):
+        search_sections(AiscWideFlange, {"AISC_name": 1})
+    with pytest.raises(ValueError):
+        search_sections(AiscWideFlange, order_by="not_a_property")
+    with pytest.raises(ValueError):
+        search_sections(dict)
+    with pytest.raises(ValueError):
+        search_sections(AiscWideFlange, page_size=0)
+
+
+def test_search_uses_property_indexes():
+    plan = _get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM aisc_wide_flange WHERE Zx >= 120;"
+    )
+    assert "index_aisc_wide_flange_Zx" in str([tuple(row) for row in plan])
@@ -0,0 +1,62 @@
+import pytest
+
+from efficalc.sections import (
+    ALL_AISC_WIDE_FLANGE_NAMES,
+    AiscRectangular,
+    AiscWideFlange,
+    disable_section_catalog,
+    enable_section_catalog,
+    get_aisc_rectangular,
+    get_aisc_wide_flange,
+    get_section_table,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def test_section_table_columns():
+    table = get_section_table(AiscWideFlange)
+    assert len(table) == len(ALL_AISC_WIDE_FLANGE_NAMES)
+    assert list(table.names) == list(ALL_AISC_WIDE_FLANGE_NAMES)
+    assert table["Zx"].dtype == float
+    assert table["AISC_name"].dtype == object
+
+    index = list(table.names).index("W14X109")
+    assert table["d"][index] == get_aisc_wide_flange("W14X109").d
+
+    with pytest.raises(ValueError):
+        table["d"][0] = 1.0
+    assert get_section_table(AiscWideFlange) is table
+
+
+def test_vectorized_screening():
+    table = get_section_table(AiscWideFlange)
+    passing = 0.9 * 50 * table["Zx"] >= 6000
+
+    sections = table.to_sections(passing)
+    assert len(sections) == np.count_nonzero(passing)
+    assert all(0.9 * 50 * section.Zx >= 6000 for section in sections)
+    assert sections[0] == get_aisc_wide_flange(sections[0].AISC_name)
+
+
+def test_to_section_with_catalog():
+    catalog = enable_section_catalog()
+    try:
+        table = get_section_table(AiscRectangular)
+        assert table.to_section(3) is get_aisc_rectangular(table.names[3])
+    finally:
+        disable_section_catalog()
+    assert catalog.memory_usage() > 0
+
+
+def test_to_structured_array():
+    table = get_section_table(AiscRectangular)
+    structured = table.to_structured_array()
+    assert len(structured) == len(table)
+    assert structured.dtype.names == tuple(table.columns)
+    np.testing.assert_array_equal(structured["A"], table["A"])
+
+
+def test_unknown_section_type():
+    with pytest.raises(ValueError):
+        get_section_table(dict)
@@ -0,0 +1,49 @@
+from benchmarks.run_benchmarks import compare_to_baseline, time_function
+
+
+def benchmark_results(**minimum_times):
+    return {
+        "metadata": {},
+        "benchmarks": {
+            name: {"min": minimum, "median": minimum, "mean": minimum, "repeats": 1}
+            for name, minimum in minimum_times.items()
+        },
+    }
+
+
+def test_compare_to_baseline():
+    baseline = benchmark_results(same=1.0, faster=1.0, slower=1.0, limit=1.0)
+    results = benchmark_results(same=1.0, faster=0.5, slower=1.5, limit=1.2)
+
+    assert compare_to_baseline(results, baseline, threshold=0.25) == ["slower"]
+    assert compare_to_baseline(results, baseline, threshold=0.1) == [
+        "slower",
+        "limit",
+    ]
+    assert compare_to_baseline(results, baseline, threshold=0.5) == []
+
+
+def test_compare_to_baseline_skips_missing_scenarios(capsys):
+    baseline = benchmark_results(old=1.0, both=1.0)
+    baseline["benchmarks"]["skipped_now"] = {"min": 1.0}
+    results = benchmark_results(new=9.0, both=1.0)
+    results["benchmarks"]["skipped_now"] = {"skipped": "No module named 'x'"}
+
+    assert compare_to_baseline(results, baseline, threshold=0.2) == []
+    output = capsys.readouterr().out
+    assert "both" in output
+    assert "new" not in output
+    assert "skipped_now" not in output
+
+
+def test_time_function_resets_before_every_call():
+    calls = []
+    timing = time_function(
+        lambda: calls.append("call"),
+        max_repeats=3,
+        reset=lambda: calls.append("reset"),
+    )
+
+    assert calls == ["reset", "call"] * 3
+    assert timing["repeats"] == 3
+    assert timing["min"] <= timing["median"]
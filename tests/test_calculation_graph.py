@@ -0,0 +1,70 @@
+import pytest
+
+from efficalc import (
+    Calculation,
+    Comparison,
+    Heading,
+    Input,
+    Symbolic,
+    clear_saved_objects,
+    get_all_calc_objects,
+)
+from efficalc.calculation_graph import (
+    CalculationGraph,
+    get_direct_dependencies,
+    refresh_expression_references,
+)
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def test_direct_dependencies(common_setup_teardown):
+    a = Input("a", 1)
+    b = Input("b", 2)
+    c = Calculation("c", a * 2 + a)
+    d = Calculation("d", c + b)
+    s = Symbolic("s", d / c)
+    comp = Comparison(d, ">", a + 1)
+    heading = Heading("Heading")
+
+    assert get_direct_dependencies(a) == []
+    assert get_direct_dependencies(c) == [a]
+    assert get_direct_dependencies(d) == [c, b]
+    assert get_direct_dependencies(s) == [d, c]
+    assert get_direct_dependencies(comp) == [d, a]
+    assert get_direct_dependencies(heading) == []
+
+
+def test_downstream_items_in_topological_order(common_setup_teardown):
+    a = Input("a", 1)
+    b = Input("b", 2)
+    c = Calculation("c", b * 2)
+    d = Calculation("d", a + 1)
+    e = Calculation("e", d + c)
+    comp = Comparison(e, ">", 1)
+
+    graph = CalculationGraph(get_all_calc_objects())
+    assert graph.get_dependents(a) == [d]
+    assert graph.get_downstream_items([a]) == [d, e, comp]
+    assert graph.get_downstream_items([b]) == [c, e, comp]
+    assert graph.get_downstream_items([a, d]) == [e, comp]
+    assert graph.get_downstream_items([comp]) == []
+
+
+def test_refresh_expression_references(common_setup_teardown):
+    a = Input("a", 1)
+    b = Calculation("b", a * 2)
+    c = Calculation("c", b + 1)
+    assert c.result() == 3
+    b_reference = c.operation.args[0]
+
+    a._replace_value(5)
+    assert b_reference.value == 2
+
+    refresh_expression_references(c)
+    assert b_reference.value == 10
+    assert c.result() == 11
@@ -1,3 +1,7 @@
+import asyncio
+import io
+import time
+
 import pytest
 
 from efficalc import (
@@ -14,6 +18,10 @@ from efficalc import (
     get_override_or_default_value,
 )
 from efficalc.calculation_runner import CalculationRunner
+from efficalc.generate_html import (
+    generate_html_for_calc_items,
+    write_html_for_calc_items,
+)
 
 
 @pytest.fixture
@@ -107,3 +115,151 @@ def test_get_results_as_dict():
     calculation = CalculationRunner(calc_function_simple, inputs)
     results = calculation.calculate_results("dict")
     assert results["calc"].result() == 25
+
+
+def test_run_many_yields_results_in_input_order():
+    input_sets = [{"a": a} for a in range(1, 8)]
+    all_results = list(
+        CalculationRunner.run_many(
+            calc_function_simple, input_sets, max_workers=2, chunksize=3
+        )
+    )
+    assert [index for index, _ in all_results] == list(range(7))
+    for index, results in all_results:
+        [calc] = results
+        assert isinstance(calc, Calculation)
+        assert calc.result() == (index + 1) ** 2
+
+
+def test_run_many_unordered_yields_every_result_once():
+    input_sets = [{"a": a} for a in range(5)]
+    all_results = dict(
+        CalculationRunner.run_many(
+            calc_function_simple,
+            input_sets,
+            return_type="dict",
+            max_workers=2,
+            ordered=False,
+        )
+    )
+    assert sorted(all_results.keys()) == list(range(5))
+    for index, results in all_results.items():
+        assert results["calc"].result() == index**2
+
+
+def test_run_many_keeps_global_storage_clean():
+    list(CalculationRunner.run_many(calc_function_simple, [{"a": 2}], max_workers=1))
+    assert len(get_all_calc_objects()) == 0
+
+
+def test_run_many_invalid_arguments():
+    with pytest.raises(ValueError):
+        list(CalculationRunner.run_many(calc_function_simple, [{}], return_type="set"))
+    with pytest.raises(ValueError):
+        list(CalculationRunner.run_many(calc_function_simple, [{}], chunksize=0))
+
+
+async def async_calc_function():
+    a = Input("a", 1)
+    await asyncio.sleep(0)
+    b = Input("b", 2)
+    await asyncio.sleep(0)
+    Calculation("c", a + b, result_check=True)
+
+
+def test_calculate_all_items_async_runs_sync_function(calc_function):
+    runner = CalculationRunner(calc_function, {"in_{put}": 1})
+    all_items = asyncio.run(runner.calculate_all_items_async())
+    assert len(all_items) == 11
+    assert all_items[3].value == 1
+    assert len(get_all_calc_objects()) == 0
+
+
+def test_calculate_results_async_concurrent_runs_do_not_share_items():
+    async def run_all():
+        runners = [CalculationRunner(async_calc_function, {"a": i}) for i in range(20)]
+        return await asyncio.gather(
+            *(runner.calculate_all_items_async() for runner in runners)
+        )
+
+    for i, all_items in enumerate(asyncio.run(run_all())):
+        assert [item.name for item in all_items] == ["a", "b", "c"]
+        assert all_items[2].result() == i + 2
+    assert len(get_all_calc_objects()) == 0
+
+
+def test_calculate_results_async_as_dict():
+    runner = CalculationRunner(async_calc_function, {"b": 5})
+    results = asyncio.run(runner.calculate_results_async("dict"))
+    assert list(results.keys()) == ["c"]
+    assert results["c"].result() == 6
+
+
+def test_nested_run_keeps_outer_items(calc_function):
+    a = Input("a", 1)
+    CalculationRunner(calc_function).calculate_all_items()
+    assert get_all_calc_objects() == [a]
+
+
+def test_stream_all_items(calc_function):
+    runner = CalculationRunner(calc_function, {"in_{put}": 2})
+    streamed = list(runner.stream_all_items(max_queued=1))
+    assert [type(item) for item in streamed] == [
+        type(item) for item in runner.calculate_all_items()
+    ]
+    assert streamed[3].value == 2
+    assert streamed[5].result() == 3
+    assert len(get_all_calc_objects()) == 0
+
+
+def test_stream_all_items_yields_before_calc_function_finishes():
+    created = []
+
+    def calc():
+        for i in range(100):
+            created.append(Input(f"x_{i}", i))
+
+    stream = CalculationRunner(calc).stream_all_items(max_queued=2)
+    first = next(stream)
+    assert first.name == "x_0"
+    assert 2 <= len(created) <= 5
+
+    stream.close()
+    assert len(created) <= 5
+
+
+def test_stream_all_items_yields_complete_items():
+    class LabeledInput(Input):
+        def __init__(self, name, value):
+            super().__init__(name, value)
+            time.sleep(0.01)
+            self.label = f"{name} input"
+
+    def calc():
+        LabeledInput("a", 1)
+        LabeledInput("b", 2)
+
+    streamed = CalculationRunner(calc).stream_all_items(max_queued=1)
+    assert [item.label for item in streamed] == ["a input", "b input"]
+
+
+def test_write_streamed_items_html(calc_function):
+    runner = CalculationRunner(calc_function)
+    expected = generate_html_for_calc_items(runner.calculate_all_items())
+
+    writer = io.StringIO()
+    write_html_for_calc_items(runner.stream_all_items(max_queued=1), writer)
+    assert writer.getvalue() == expected
+
+
+def test_stream_all_items_raises_calc_function_error():
+    def calc():
+        Input("a", 1)
+        raise KeyError("bad input")
+
+    stream = CalculationRunner(calc).stream_all_items()
+    assert next(stream).name == "a"
+    with pytest.raises(KeyError):
+        next(stream)
+    with pytest.raises(ValueError):
+        next(CalculationRunner(calc).stream_all_items(max_queued=0))
@@ -0,0 +1,89 @@
+import pytest
+
+from efficalc import Calculation, Comparison, Heading, Input, clear_saved_objects
+from efficalc.calculation_session import CalculationSession
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def branched_calc():
+    a = Input("a", 2)
+    b = Input("b", 3)
+    Heading("Results")
+    c = Calculation("c", a * 2)
+    d = Calculation("d", b + 1)
+    e = Calculation("e", c + d, result_check=True)
+    Comparison(e, "<", 20)
+
+
+def cutoff_calc():
+    a = Input("a", 2)
+    b = Calculation("b", a * 0)
+    c = Calculation("c", b + 1)
+    Calculation("d", c * 2)
+
+
+def guarded_calc():
+    a = Input("a", 2)
+    factor = Input("factor", 1)
+    if factor.get_value() > 5:
+        Calculation("b", a * 2)
+    else:
+        Calculation("b", a * 3)
+
+
+def names(items):
+    return [item.name for item in items]
+
+
+def test_set_input_value_returns_changed_items(common_setup_teardown):
+    session = CalculationSession(branched_calc)
+    a, b, _, c, d, e, comparison = session.items
+
+    changed = session.set_input_value("a", 4)
+    assert changed == [a, c, e, comparison]
+    assert c.result() == 8
+    assert e.result() == 12
+    assert comparison.is_passing() is True
+
+    changed = session.set_input_value("b", 15)
+    assert changed == [b, d, e, comparison]
+    assert e.result() == 24
+    assert comparison.is_passing() is False
+
+
+def test_set_input_value_unchanged_value(common_setup_teardown):
+    session = CalculationSession(branched_calc)
+    assert session.set_input_value("a", 2) == []
+
+
+def test_set_input_value_stops_where_values_do_not_change(common_setup_teardown):
+    session = CalculationSession(cutoff_calc)
+
+    changed = session.set_input_value("a", 5)
+    assert names(changed) == ["a", "b"]
+    assert session.items[2].result() == 1
+
+
+def test_set_input_value_reruns_when_guard_changes(common_setup_teardown):
+    session = CalculationSession(guarded_calc)
+    original_items = session.items
+
+    changed = session.set_input_value("a", 3)
+    assert session.items == original_items
+    assert changed[1].result() == 9
+
+    changed = session.set_input_value("factor", 10)
+    assert changed == session.items
+    assert changed[0] is not original_items[0]
+    assert changed[2].result() == 6
+
+
+def test_set_input_value_unknown_input(common_setup_teardown):
+    session = CalculationSession(branched_calc)
+    with pytest.raises(ValueError):
+        session.set_input_value("x", 1)
@@ -0,0 +1,129 @@
+import pytest
+
+from efficalc import (
+    Calculation,
+    Comparison,
+    Heading,
+    Input,
+    InputTable,
+    clear_saved_objects,
+    get_all_calc_objects,
+    sqrt,
+)
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.compiled_calculation import CompiledCalculation
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def chained_calc():
+    a = Input("a", 3, "in")
+    b = Input("b", 4, "in")
+    Heading("Results")
+    c = Calculation("c", sqrt(a**2 + b**2), "in")
+    d = Calculation("d", c * 2 + c, "in", result_check=True)
+    Comparison(d, "<", 20)
+
+
+def control_flow_calc():
+    a = Input("a", 1)
+    b = Input("b", 2)
+    if a.get_value() > 5:
+        Calculation("c", a * 10, result_check=True)
+    else:
+        Calculation("c", a + b, result_check=True)
+
+
+def get_values(items: list) -> list:
+    return [item.get_value() for item in items if hasattr(item, "get_value")]
+
+
+def test_compiled_matches_full_run_for_new_inputs(common_setup_teardown):
+    compiled = CompiledCalculation(chained_calc)
+    assert not compiled.has_guards
+
+    for input_vals in [{}, {"a": 6}, {"a": 5, "b": 12}, {"b": 0.5}, {}]:
+        expected = CalculationRunner(chained_calc, input_vals).calculate_all_items()
+        compiled_items = compiled.calculate_all_items(input_vals)
+        assert get_values(compiled_items) == pytest.approx(get_values(expected))
+        assert [i.str_substituted() for i in compiled_items[3:]] == [
+            i.str_substituted() for i in expected[3:]
+        ]
+
+
+def test_compiled_reuses_template_items(common_setup_teardown):
+    compiled = CompiledCalculation(chained_calc)
+    first = compiled.calculate_all_items({"a": 1})
+    second = compiled.calculate_all_items({"a": 2})
+    assert all(a is b for a, b in zip(first, second))
+    assert len(get_all_calc_objects()) == 0
+
+
+def test_compiled_results(common_setup_teardown):
+    compiled = CompiledCalculation(chained_calc)
+    results = compiled.calculate_results({"a": 6, "b": 8}, "dict")
+    assert results["d"].result() == pytest.approx(30)
+    assert results[r"\ d \ & < \ 20"].is_passing() is False
+
+    [d, comparison] = compiled.calculate_results({"a": 3, "b": 4})
+    assert d.result() == pytest.approx(15)
+    assert comparison.is_passing() is True
+
+
+def test_compiled_clears_errors_when_inputs_fixed(common_setup_teardown):
+    def calc():
+        a = Input("a", -1)
+        Calculation("b", sqrt(a), result_check=True)
+
+    compiled = CompiledCalculation(calc)
+    [b] = compiled.calculate_results()
+    assert b.result() == 0
+    assert b.error is not None
+
+    [b] = compiled.calculate_results({"a": 4})
+    assert b.error is None
+    assert b.result() == 2
+    assert b.error is None
+
+
+def test_control_flow_guard_falls_back_to_full_run(common_setup_teardown):
+    compiled = CompiledCalculation(control_flow_calc)
+    assert compiled.has_guards
+
+    [c] = compiled.calculate_results({"a": 2})
+    assert c.str_symbolic() == "{a} + {b}"
+    assert c.result() == 4
+
+    [c] = compiled.calculate_results({"a": 6})
+    assert c.str_symbolic() == "{a} \\cdot {10}"
+    assert c.result() == 60
+
+
+def test_full_run_after_failed_guard_is_compiled_again(common_setup_teardown):
+    compiled = CompiledCalculation(control_flow_calc)
+    compiled.calculate_results({"a": 6})
+    template = compiled._items
+
+    [c] = compiled.calculate_results({"a": 6, "b": 3})
+    assert compiled._items is template
+    assert c.str_symbolic() == "{a} \\cdot {10}"
+    assert c.result() == 60
+
+    [c] = compiled.calculate_results({"a": 2})
+    assert compiled._items is not template
+    assert c.str_symbolic() == "{a} + {b}"
+    assert c.result() == 4
+
+
+def test_changed_input_table_falls_back_to_full_run(common_setup_teardown):
+    def calc():
+        table = InputTable([[1, 2]], ["x", "y"])
+        Calculation("total", sum(table.data[0]), result_check=True)
+
+    compiled = CompiledCalculation(calc)
+    [total] = compiled.calculate_results({"input_table-x-y": [[3, 4]]})
+    assert total.result() == 7
@@ -1,4 +1,5 @@
 import html
+import io
 
 import pytest
 from latexexpr_efficalc import brackets
@@ -19,9 +20,15 @@ from efficalc import (
     TextBlock,
     Title,
     clear_saved_objects,
+    get_result_cache_stats,
+    reset_result_cache_stats,
 )
 from efficalc.canvas import Canvas
-from efficalc.generate_html import generate_html_for_calc_items
+from efficalc.generate_html import (
+    _iter_result_table_html,
+    generate_html_for_calc_items,
+    write_html_for_calc_items,
+)
 
 
 @pytest.fixture
@@ -555,3 +562,53 @@ def test_equation_escapes_hash_character(common_setup_teardown):
     assert calc.description in result
     assert calc.reference in result
     assert r"\therefore" in result
+
+
+def test_write_html_for_calc_items_matches_generate(common_setup_teardown):
+    a = Input("a", 2, "in")
+    items = [Heading("Inputs"), a, Calculation("b", a * 2, "in"), Table([[1, 2]])]
+    writer = io.StringIO()
+    write_html_for_calc_items(iter(items), writer)
+    assert writer.getvalue() == generate_html_for_calc_items(items)
+
+
+def test_write_html_for_calc_items_writes_table_parts(common_setup_teardown):
+    class ChunkWriter:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(chunk)
+
+    table = Table([[i] for i in range(1200)])
+    writer = ChunkWriter()
+    write_html_for_calc_items([Heading("Rows"), table], writer)
+    assert writer.chunks[1:] == list(_iter_result_table_html(table))
+
+
+def test_render_workers_use_the_caller_context(common_setup_teardown):
+    a = Input("a", 2, "in")
+    b = Calculation("b", a * 2, "in")
+    items = [Comparison(b, "<", i) for i in range(10)]
+
+    reset_result_cache_stats()
+    serial = generate_html_for_calc_items(items)
+    serial_hits = get_result_cache_stats().hits
+
+    reset_result_cache_stats()
+    assert generate_html_for_calc_items(items, max_workers=4) == serial
+    assert get_result_cache_stats().hits == serial_hits > 0
+
+
+def test_table_html_parts_and_lazy_rows(common_setup_teardown):
+    table = Table([[i] for i in range(1200)], numbered_rows=True)
+    parts = list(_iter_result_table_html(table))
+    assert len(parts) == 3
+    assert "".join(parts) == generate_html_for_calc_items([table])
+
+    lazy_html = "".join(_iter_result_table_html(table, lazy_rows=2))
+    assert (
+        "<tr><td>2</td><td>1</td></tr>"
+        '<template class="lazy-rows"><tr><td>3</td><td>2</td></tr>'
+    ) in lazy_html
+    assert lazy_html.endswith("</template></tbody></table></div>")
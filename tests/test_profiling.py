@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from efficalc import Calculation, Heading, Input, clear_saved_objects
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.profiling import CalculationProfiler
+from efficalc.report_builder import ReportBuilder
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def profiled_calc():
+    Heading("Inputs")
+    a = Input("a", 2, "in")
+    b = Calculation("b", a * 3, "in")
+    Calculation("c", b + a, "in", result_check=True)
+
+
+def test_runner_records_items_with_source_lines(common_setup_teardown):
+    profiler = CalculationProfiler()
+    CalculationRunner(profiled_calc, profiler=profiler).calculate_all_items()
+
+    assert [p.name for p in profiler.items] == ["Inputs", "a", "b", "c"]
+    assert [p.index for p in profiler.items] == [0, 1, 2, 3]
+    assert profiler.items[2].item_type == "Calculation"
+    assert profiler.items[2].source.startswith("test_profiling.py:20 ")
+    assert "evaluate" in profiler.items[2].times
+    assert "render" not in profiler.items[2].times
+    assert set(profiler.run_times) == {"calc_function"}
+
+
+def test_report_builder_records_render_phase(common_setup_teardown):
+    profiler = CalculationProfiler()
+    html = ReportBuilder(profiled_calc, profiler=profiler).get_html_as_str()
+
+    assert html == ReportBuilder(profiled_calc).get_html_as_str()
+    assert all(p.times["render"] > 0 for p in profiler.items)
+    assert set(profiler.run_times) == {"calc_function", "render", "assemble"}
+
+
+def test_trace_memory(common_setup_teardown):
+    profiler = CalculationProfiler(trace_memory=True)
+    ReportBuilder(profiled_calc, profiler=profiler).get_html_as_str()
+
+    assert set(profiler.items[3].memory) == {"construct", "evaluate", "render"}
+    assert "render KiB" in profiler.format_table()
+
+
+def test_format_table(common_setup_teardown):
+    profiler = CalculationProfiler()
+    CalculationRunner(profiled_calc, profiler=profiler).calculate_all_items()
+
+    lines = profiler.format_table(sort_by="index", limit=2).splitlines()
+    assert lines[0].split()[:4] == ["#", "type", "name", "source"]
+    assert lines[2].startswith("0 ")
+    assert lines[3].startswith("1 ")
+    assert lines[4].startswith("calc_function: ")
+
+    with pytest.raises(ValueError):
+        profiler.format_table(sort_by="name")
+
+
+def test_chrome_trace(common_setup_teardown, tmp_path):
+    profiler = CalculationProfiler()
+    ReportBuilder(profiled_calc, profiler=profiler).get_html_as_str()
+
+    file_path = profiler.save_chrome_trace(str(tmp_path / "trace.json"))
+    with open(file_path) as file:
+        trace = json.load(file)
+
+    events = trace["traceEvents"]
+    assert {event["cat"] for event in events} == {
+        "run",
+        "construct",
+        "evaluate",
+        "render",
+    }
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from efficalc import (
+    Calculation,
+    CalculationItem,
+    Comparison,
+    Heading,
+    Input,
+    Symbolic,
+    Table,
+    TextBlock,
+    Title,
+    clear_saved_objects,
+)
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.generate_html import HTML_RENDERERS, generate_html_for_calc_items
+from efficalc.renderers import (
+    JSON_RENDERERS,
+    MARKDOWN_RENDERERS,
+    TEXT_RENDERERS,
+    RenderContext,
+    RendererRegistry,
+)
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+class Note(TextBlock):
+    pass
+
+
+class Marker(CalculationItem):
+    def __init__(self, label: str):
+        self.label = label
+        super().__init__()
+
+
+def rendered_calc():
+    Title("Beam")
+    Heading("Inputs")
+    a = Input("a", 2, "in", description="Depth", reference="Sec. 1")
+    Heading("Checks", head_level=2)
+    b = Calculation("b", a * 3, "in")
+    Comparison(b, "<", 5)
+    Table([[1, "x|y"]], ["n", "s"])
+
+
+def test_registry_uses_closest_base_class():
+    registry = RendererRegistry({TextBlock: lambda item, context: "text"})
+    assert registry.render(Note("note")) == "text"
+
+    registry.register(Note, lambda item, context: "note")
+    assert registry.render(Note("note")) == "note"
+    assert registry.render(TextBlock("text")) == "text"
+
+
+def test_registry_without_renderer():
+    with pytest.raises(ValueError):
+        RendererRegistry().render(TextBlock("text"))
+
+    default = RendererRegistry(default=lambda item, context: "default")
+    assert default.render(TextBlock("text")) == "default"
+
+
+def test_registry_renders_chunks():
+    registry = RendererRegistry({TextBlock: lambda item, context: iter(["a", "b"])})
+    assert list(registry.iter_render(TextBlock("text"))) == ["a", "b"]
+    assert registry.render(TextBlock("text")) == "ab"
+    assert list(MARKDOWN_RENDERERS.iter_render(TextBlock("text"))) == ["text\n\n"]
+
+
+def test_copy_does_not_change_registry():
+    copied = MARKDOWN_RENDERERS.copy()
+    copied.register(TextBlock, lambda item, context: "changed")
+    assert copied.render(TextBlock("text")) == "changed"
+    assert MARKDOWN_RENDERERS.render(TextBlock("text")) == "text\n\n"
+
+
+def test_render_items_numbers_headings(common_setup_teardown):
+    items = [Heading("A"), Heading("B", head_level=2), Heading("C")]
+    contexts = []
+    registry = RendererRegistry(
+        default=lambda item, context: contexts.append(context) or ""
+    )
+    registry.render_to_str(items)
+    assert [c.header_numbers for c in contexts] == [[1], [1, 1], [2]]
+
+
+def test_markdown_renderers(common_setup_teardown):
+    items = CalculationRunner(rendered_calc).calculate_all_items()
+    markdown = MARKDOWN_RENDERERS.render_to_str(items)
+
+    assert markdown.startswith("# Beam\n\n## 1. Inputs\n\n")
+    assert "Depth; $a =  2 \\ \\mathrm{in}$ [Sec. 1]\n\n" in markdown
+    assert "### 1.1. Checks\n\n" in markdown
+    assert "=  6 \\ \\mathrm{in}$$\n\n" in markdown
+    assert "| n | s |\n| --- | --- |\n| 1 | x\\|y |\n\n" in markdown
+
+
+def test_text_renderers(common_setup_teardown):
+    items = CalculationRunner(rendered_calc).calculate_all_items()
+    lines = TEXT_RENDERERS.render_to_str(items).splitlines()
+
+    assert lines[:4] == ["Beam", "1. Inputs", "Depth; a = 2 in [Sec. 1]", "1.1. Checks"]
+    assert lines[4].endswith("= 6 in")
+    assert lines[5].endswith("∴ERROR")
+    assert lines[6:] == ["n  s", "1  x|y"]
+
+
+def test_json_renderers(common_setup_teardown):
+    items = CalculationRunner(rendered_calc).calculate_all_items()
+    records = [json.loads(line) for line in JSON_RENDERERS.render_items(items)]
+
+    assert [r["type"] for r in records] == [
+        "Title",
+        "Heading",
+        "Input",
+        "Heading",
+        "Calculation",
+        "Comparison",
+        "Table",
+    ]
+    assert records[3]["number"] == "1.1"
+    assert records[4]["value"] == 6
+    assert records[6]["data"] == [[1, "x|y"]]
+
+
+def test_json_renderers_symbolic_only_items(common_setup_teardown):
+    def calc():
+        a = Input("a", 2, "in")
+        Symbolic("s", "M_u / \\phi M_n")
+        Symbolic("t", a * 2)
+
+    items = CalculationRunner(calc).calculate_all_items()
+    records = [json.loads(line) for line in JSON_RENDERERS.render_items(items)]
+
+    assert records[1]["value"] is None
+    assert records[1]["error"] is None
+    assert records[2]["value"] == 4
+    assert records[2]["error"] is None
+    assert all(item.error is None for item in items[1:])
+
+
+def test_html_renderers_for_custom_items(common_setup_teardown):
+    marker = Marker("custom")
+    assert generate_html_for_calc_items([marker]) == HTML_RENDERERS.render(marker)
+
+    HTML_RENDERERS.register(Marker, lambda item, context: f"<mark>{item.label}</mark>")
+    assert generate_html_for_calc_items([marker]) == "<mark>custom</mark>"
+    assert HTML_RENDERERS.render(marker, RenderContext([1])) == "<mark>custom</mark>"
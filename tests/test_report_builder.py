@@ -1,10 +1,43 @@
+import asyncio
+import importlib.util
+import io
 import os
+import threading
+import zipfile
 from unittest.mock import mock_open, patch
 
 import pytest
 
-from efficalc import Calculation, Input, clear_saved_objects
+from efficalc import (
+    Calculation,
+    Comparison,
+    FigureFromBytes,
+    Heading,
+    Input,
+    Symbolic,
+    Table,
+    clear_saved_objects,
+)
+from efficalc.generate_html import HTML_RENDERERS
+from efficalc.profiling import CalculationProfiler
 from efficalc.report_builder import LongCalcDisplayType, ReportBuilder
+from efficalc.result_cache import ResultCache
+
+
+def batch_calc_function():
+    a = Input("a", 1, "in")
+    Calculation("b", a * 2, "in")
+
+
+def batch_figure_calc_function():
+    a = Input("a", 1, "in")
+    Calculation("b", a * 2, "in")
+    FigureFromBytes(b"\x89PNG\r\n\x1a\n" + b"image data", "figure")
+
+
+def batch_index_calc_function():
+    index = Input("index", 1)
+    Calculation("b", index * 2)
 
 
 @pytest.fixture
@@ -69,6 +102,10 @@ def mock_os_makedirs():
         yield mock
 
 
+def get_written_content(open_handle) -> str:
+    return "".join(call[0][0] for call in open_handle.write.call_args_list)
+
+
 def test_view_report_creates_temp_calc_file_and_opens_in_browser(
     calc_function, mock_webbrowser_open, mock_create_temp_html_file, temp_file_path
 ):
@@ -82,7 +119,7 @@ def test_view_report_creates_temp_calc_file_and_opens_in_browser(
         "file://" + os.path.realpath(temp_file_path)
     )
 
-    report_content = mock_create_temp_html_file.call_args[0][0]
+    report_content = "".join(mock_create_temp_html_file.call_args[0][0])
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert "{\\left( {a} \\right)}^{ {2} } + {a} + {2}" in report_content
     assert "<!DOCTYPE html>" in report_content
@@ -98,6 +135,31 @@ def test_get_html_as_str_creates_html_file(calc_function):
     assert '<html style="background-color: #eeeeee;">' in report_content
 
 
+def test_get_html_as_str_async_matches_sync(calc_function):
+    report_builder = ReportBuilder(calc_function=calc_function)
+    report_content = asyncio.run(report_builder.get_html_as_str_async())
+    assert report_content == report_builder.get_html_as_str()
+
+
+def test_save_report_async_writes_to_file(
+    calc_function,
+    mock_webbrowser_open,
+    mock_os_path_exists,
+    mock_os_makedirs,
+    mock_builtin_open,
+):
+    test_folder = "test/folder"
+    expected_full_path = os.path.join(test_folder, "calc_report.html")
+
+    report_builder = ReportBuilder(calc_function=calc_function)
+    report_path = asyncio.run(report_builder.save_report_async(test_folder))
+
+    assert report_path == expected_full_path
+    mock_builtin_open.assert_called_once_with(expected_full_path, "w")
+    report_content = get_written_content(mock_builtin_open())
+    assert "a =  4 \\ \\mathrm{in}" in report_content
+
+
 def test_save_report_writes_to_file_in_existing_folder_without_opening_by_default(
     calc_function,
     mock_webbrowser_open,
@@ -125,7 +187,7 @@ def test_save_report_writes_to_file_in_existing_folder_without_opening_by_defaul
 
     # writes the expected html content to the file
     open_handle = mock_builtin_open()
-    report_content = open_handle.write.call_args[0][0]
+    report_content = get_written_content(open_handle)
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert "{\\left( {a} \\right)}^{ {2} } + {a} + {2}" in report_content
     assert "<!DOCTYPE html>" in report_content
@@ -159,7 +221,7 @@ def test_save_report_writes_to_new_file_when_folder_does_not_exist(
 
     # writes the expected html content to the file
     open_handle = mock_builtin_open()
-    report_content = open_handle.write.call_args[0][0]
+    report_content = get_written_content(open_handle)
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert "{\\left( {a} \\right)}^{ {2} } + {a} + {2}" in report_content
     assert "<!DOCTYPE html>" in report_content
@@ -194,7 +256,7 @@ def test_save_report_writes_to_file_in_existing_folder_with_specified_filename(
 
     # writes the expected html content to the file
     open_handle = mock_builtin_open()
-    report_content = open_handle.write.call_args[0][0]
+    report_content = get_written_content(open_handle)
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert "{\\left( {a} \\right)}^{ {2} } + {a} + {2}" in report_content
     assert "<!DOCTYPE html>" in report_content
@@ -230,7 +292,7 @@ def test_save_report_writes_to_file_in_existing_folder_and_opens(
 
     # writes the expected html content to the file
     open_handle = mock_builtin_open()
-    report_content = open_handle.write.call_args[0][0]
+    report_content = get_written_content(open_handle)
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert "{\\left( {a} \\right)}^{ {2} } + {a} + {2}" in report_content
     assert "<!DOCTYPE html>" in report_content
@@ -273,3 +335,404 @@ def test_html_configured_with_breaking_long_equations(calc_function):
     assert mathjax_config in report_content
     assert "a =  4 \\ \\mathrm{in}" in report_content
     assert '<html style="background-color: #eeeeee;">' in report_content
+
+
+def test_iter_html_matches_get_html_as_str(calc_function):
+    report_builder = ReportBuilder(calc_function=calc_function)
+    chunks = list(report_builder.iter_html())
+
+    assert len(chunks) == 4
+    assert chunks[0].strip().startswith("<!DOCTYPE html>")
+    assert "".join(chunks) == report_builder.get_html_as_str()
+
+
+def test_iter_html_renders_items_while_calc_function_runs():
+    released = threading.Event()
+    finished = []
+
+    def calc():
+        Heading("Inputs", numbered=True)
+        Input("a", 1, "in")
+        released.wait(5)
+        finished.append(True)
+
+    chunks = ReportBuilder(calc).iter_html()
+    next(chunks)
+    assert next(chunks) == "<h2>1.\u00a0 Inputs</h2>"
+    assert not finished
+
+    released.set()
+    assert "a" in next(chunks)
+    assert len(list(chunks)) == 1
+    assert finished
+
+
+def test_write_report_writes_each_item(calc_function):
+    writer = io.StringIO()
+    report_builder = ReportBuilder(calc_function=calc_function)
+    report_builder.write_report(writer)
+    assert writer.getvalue() == report_builder.get_html_as_str()
+
+
+def test_render_workers_matches_serial_report():
+    def calc():
+        for i in range(20):
+            Heading(f"Section {i}", numbered=True, head_level=1 + i % 2)
+            a = Input("a", i, "in")
+            Calculation("b", a**2 + 1 / a, "in^2")
+            FigureFromBytes(bytes([i]) * 100, f"figure {i}")
+            Table([[i, i + 1]], ["x", "y"])
+
+    serial = ReportBuilder(calc).get_html_as_str()
+    concurrent = ReportBuilder(calc, render_workers=4).get_html_as_str()
+
+    assert concurrent == serial
+    assert "".join(ReportBuilder(calc, render_workers=3).iter_html()) == serial
+
+
+def test_render_workers_matches_serial_report_with_symbolic_only_items():
+    def calc():
+        a = Input("a", 2, "in")
+        Symbolic("s", "M_u / \\phi M_n", "A symbolic-only expression")
+        Symbolic("t", a * 2)
+        Calculation("b", a * 3, "in")
+
+    serial = ReportBuilder(calc).get_html_as_str()
+    concurrent = ReportBuilder(calc, render_workers=4).get_html_as_str()
+
+    assert "ERROR" not in serial
+    assert concurrent == serial
+
+
+def test_save_report_with_external_figures(tmp_path):
+    png_bytes = b"\x89PNG\r\n\x1a\n" + b"image data"
+
+    def calc():
+        FigureFromBytes(png_bytes, "first")
+        FigureFromBytes(png_bytes, "second")
+        FigureFromBytes(b"\xff\xd8\xff other image", "third")
+
+    first_path = ReportBuilder(calc).save_report(
+        str(tmp_path), "first", external_figures=True
+    )
+    ReportBuilder(calc, render_workers=2).save_report(
+        str(tmp_path), "second", external_figures=True
+    )
+
+    assets = sorted(os.listdir(tmp_path / "assets"))
+    assert len(assets) == 2
+    assert {os.path.splitext(asset)[1] for asset in assets} == {".png", ".jpg"}
+
+    with open(first_path) as file:
+        report_content = file.read()
+    assert "base64" not in report_content
+    for asset in assets:
+        assert f'src="assets/{asset}"' in report_content
+    png_asset = next(asset for asset in assets if asset.endswith(".png"))
+    assert (tmp_path / "assets" / png_asset).read_bytes() == png_bytes
+
+
+def test_prerender_math_drops_mathjax(calc_function):
+    pytest.importorskip("latex2mathml")
+    report_content = ReportBuilder(calc_function, prerender_math=True).get_html_as_str()
+
+    assert "mathjax" not in report_content.lower()
+    assert "<math" in report_content
+    assert "\\[" not in report_content
+
+
+def test_prerender_math_requires_latex2mathml(calc_function):
+    if importlib.util.find_spec("latex2mathml"):
+        pytest.skip("latex2mathml is installed")
+    with pytest.raises(ImportError):
+        ReportBuilder(calc_function, prerender_math=True).get_html_as_str()
+
+
+def test_save_reports_to_folder(tmp_path):
+    input_sets = [{"a": a} for a in range(4)]
+    paths = ReportBuilder.save_reports(
+        batch_calc_function,
+        input_sets,
+        str(tmp_path),
+        "beam_{index}_{a}",
+        max_workers=2,
+    )
+
+    assert paths == [str(tmp_path / f"beam_{i}_{i}.html") for i in range(4)]
+    for path, input_vals in zip(paths, input_sets):
+        with open(path) as file:
+            report_content = file.read()
+        expected = ReportBuilder(batch_calc_function, input_vals).get_html_as_str()
+        assert report_content == expected
+
+    index_content = (tmp_path / "index.html").read_text()
+    assert '<a href="beam_3_3.html">' in index_content
+    assert "mathjax" not in index_content.lower()
+
+
+def test_save_reports_to_zip_stream():
+    stream = io.BytesIO()
+    names = ReportBuilder.save_reports(
+        batch_calc_function, [{"a": 1}, {"a": 2}], stream, max_workers=1
+    )
+
+    assert names == ["calc_report_0.html", "calc_report_1.html"]
+    with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as archive:
+        assert archive.namelist() == names + ["index.html"]
+        report_content = archive.read(names[1]).decode("utf-8")
+    expected = ReportBuilder(batch_calc_function, {"a": 2}).get_html_as_str()
+    assert report_content == expected
+
+
+def test_save_reports_duplicate_filenames(tmp_path):
+    with pytest.raises(ValueError):
+        ReportBuilder.save_reports(
+            batch_calc_function, [{"a": 1}, {"a": 2}], str(tmp_path), "report"
+        )
+
+
+def test_save_reports_to_path_objects(tmp_path):
+    paths = ReportBuilder.save_reports(
+        batch_calc_function, [{"a": 1}], tmp_path / "reports", max_workers=1
+    )
+    assert paths == [os.path.join(tmp_path, "reports", "calc_report_0.html")]
+    assert (tmp_path / "reports" / "index.html").exists()
+
+    names = ReportBuilder.save_reports(
+        batch_calc_function, [{"a": 1}], tmp_path / "reports.zip", max_workers=1
+    )
+    assert names == ["calc_report_0.html"]
+    with zipfile.ZipFile(tmp_path / "reports.zip") as archive:
+        assert archive.namelist() == ["calc_report_0.html", "index.html"]
+
+
+def test_save_reports_with_input_named_index(tmp_path):
+    paths = ReportBuilder.save_reports(
+        batch_index_calc_function,
+        [{"index": 5}, {"index": 6}],
+        str(tmp_path),
+        "report_{index}",
+        max_workers=1,
+    )
+    assert paths == [str(tmp_path / f"report_{i}.html") for i in range(2)]
+
+
+def test_save_reports_reserved_filename(tmp_path):
+    for template in ("index", "INDEX"):
+        with pytest.raises(ValueError):
+            ReportBuilder.save_reports(
+                batch_calc_function, [{"a": 1}], str(tmp_path), template
+            )
+
+
+def test_save_reports_with_external_figures(tmp_path):
+    input_sets = [{"a": 1}, {"a": 2}]
+    paths = ReportBuilder.save_reports(
+        batch_figure_calc_function,
+        input_sets,
+        str(tmp_path),
+        max_workers=1,
+        external_figures=True,
+        render_workers=2,
+    )
+
+    assets = os.listdir(tmp_path / "assets")
+    assert len(assets) == 1
+    for path in paths:
+        with open(path) as file:
+            report_content = file.read()
+        assert f'src="assets/{assets[0]}"' in report_content
+        assert "base64" not in report_content
+
+
+def test_save_reports_with_external_figures_to_zip():
+    stream = io.BytesIO()
+    ReportBuilder.save_reports(
+        batch_figure_calc_function,
+        [{"a": 1}, {"a": 2}],
+        stream,
+        max_workers=1,
+        external_figures=True,
+    )
+
+    with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as archive:
+        names = archive.namelist()
+        assets = [name for name in names if name.startswith("assets/")]
+        assert len(assets) == 1
+        assert archive.read(assets[0]).endswith(b"image data")
+        report_content = archive.read("calc_report_1.html").decode("utf-8")
+    assert f'src="{assets[0]}"' in report_content
+    assert "base64" not in report_content
+
+
+def test_save_reports_with_prerendered_math(tmp_path):
+    pytest.importorskip("latex2mathml")
+    paths = ReportBuilder.save_reports(
+        batch_calc_function,
+        [{"a": 1}],
+        str(tmp_path),
+        max_workers=1,
+        prerender_math=True,
+    )
+
+    with open(paths[0]) as file:
+        report_content = file.read()
+    assert (
+        report_content
+        == ReportBuilder(
+            batch_calc_function, {"a": 1}, prerender_math=True
+        ).get_html_as_str()
+    )
+
+
+def test_fragment_cache_reuses_unchanged_items():
+    def calc():
+        Heading("Inputs")
+        a = Input("a", 1, "in")
+        b = Input("b", 2, "in")
+        Heading("Results")
+        Heading("Results")
+        Calculation("c", a * 2, "in")
+        Calculation("d", b * 2, "in")
+
+    cache = ResultCache(max_entries=100)
+    first = ReportBuilder(calc, fragment_cache=cache).get_html_as_str()
+    assert first == ReportBuilder(calc).get_html_as_str()
+    assert (cache.hits, cache.misses) == (0, 7)
+
+    second = ReportBuilder(calc, {"a": 5}, fragment_cache=cache).get_html_as_str()
+    assert second == ReportBuilder(calc, {"a": 5}).get_html_as_str()
+    # Only the changed input and the calculation that depends on it are rendered again
+    assert (cache.hits, cache.misses) == (5, 9)
+
+
+def test_fragment_cache_keys_comparisons_on_operand_results():
+    def calc():
+        a = Input("a", 1, "in")
+        c = Calculation("c", a * 2, "in")
+        Comparison(c, "<", 5)
+        Comparison(a, "<", 5, description="Check a")
+
+    cache = ResultCache(max_entries=100)
+    ReportBuilder(calc, fragment_cache=cache).get_html_as_str()
+    changed = ReportBuilder(calc, {"a": 3}, fragment_cache=cache).get_html_as_str()
+    assert changed == ReportBuilder(calc, {"a": 3}).get_html_as_str()
+    assert cache.hits == 0
+
+    # The key of an unchanged comparison is built without generating its LaTeX
+    with patch.object(Comparison, "str_substituted", side_effect=AssertionError):
+        ReportBuilder(calc, {"a": 3}, fragment_cache=cache).get_html_as_str()
+    assert cache.hits == 4
+
+
+def test_fragment_cache_keyed_on_renderer():
+    def calc():
+        a = Input("a", 1, "in")
+        Calculation("c", a * 2, "in")
+
+    cache = ResultCache(max_entries=100)
+    default_html = ReportBuilder(calc, fragment_cache=cache).get_html_as_str()
+
+    default_renderer = HTML_RENDERERS.get_renderer(Calculation)
+    HTML_RENDERERS.register(Calculation, lambda item, context: "<p>custom</p>")
+    try:
+        custom_html = ReportBuilder(calc, fragment_cache=cache).get_html_as_str()
+    finally:
+        HTML_RENDERERS.register(Calculation, default_renderer)
+
+    assert "<p>custom</p>" in custom_html
+    assert "<p>custom</p>" not in default_html
+    assert ReportBuilder(calc, fragment_cache=cache).get_html_as_str() == default_html
+
+
+def paginated_calc_function():
+    Heading("Inputs")
+    a = Input("a", 1, "in")
+    Heading("Details", head_level=2)
+    Input("b", 2, "in")
+    Heading("Results")
+    Calculation("c", a * 2, "in")
+    Table([[i] for i in range(10)], ["rows"])
+
+
+def test_save_paginated_report_splits_at_headings(tmp_path):
+    paths = ReportBuilder(paginated_calc_function).save_paginated_report(
+        str(tmp_path), "calc", lazy_table_rows=3
+    )
+    clear_saved_objects()
+
+    assert [os.path.basename(path) for path in paths] == [
+        "calc.html",
+        "calc_1.html",
+        "calc_2.html",
+    ]
+    with open(paths[0]) as file:
+        contents = file.read()
+    assert '<a href="calc_1.html#section-1">1. Inputs</a>' in contents
+    assert '<a href="calc_1.html#section-2">1.1. Details</a>' in contents
+    assert '<a href="calc_2.html#section-3">2. Results</a>' in contents
+
+    with open(paths[1]) as file:
+        first_page = file.read()
+    assert '<a id="section-2"></a>' in first_page
+    assert '<a href="calc_2.html">Next</a>' in first_page
+    assert "Previous" not in first_page
+
+    with open(paths[2]) as file:
+        second_page = file.read()
+    assert '<a href="calc_1.html">Previous</a>' in second_page
+    assert '<template class="lazy-rows"><tr><td>3</td></tr>' in second_page
+    assert "IntersectionObserver" in second_page
+
+
+def test_save_paginated_report_items_per_page(tmp_path):
+    paths = ReportBuilder(paginated_calc_function).save_paginated_report(
+        str(tmp_path), split_heading_level=None, items_per_page=3, lazy_table_rows=None
+    )
+    clear_saved_objects()
+
+    assert len(paths) == 4
+    with open(paths[3]) as file:
+        last_page = file.read()
+    assert "Page 3 of 3" in last_page
+    assert "lazy-rows" not in last_page
+
+
+def test_save_paginated_report_uses_registered_renderers(tmp_path):
+    default_renderer = HTML_RENDERERS.get_renderer(Table)
+    HTML_RENDERERS.register(
+        Table,
+        lambda item, context: f"<p>table of {len(item.data)} rows, "
+        f"{context.lazy_table_rows} shown</p>",
+    )
+    try:
+        paths = ReportBuilder(paginated_calc_function).save_paginated_report(
+            str(tmp_path), "calc", lazy_table_rows=3
+        )
+    finally:
+        HTML_RENDERERS.register(Table, default_renderer)
+        clear_saved_objects()
+
+    with open(paths[2]) as file:
+        second_page = file.read()
+    assert "<p>table of 10 rows, 3 shown</p>" in second_page
+    assert "<table" not in second_page
+
+
+def test_save_paginated_report_records_render_times(tmp_path):
+    profiler = CalculationProfiler()
+    ReportBuilder(paginated_calc_function, profiler=profiler).save_paginated_report(
+        str(tmp_path)
+    )
+    clear_saved_objects()
+
+    assert [p.item_type for p in profiler.items][-1] == "Table"
+    assert all(p.times["render"] > 0 for p in profiler.items)
+    assert set(profiler.run_times) == {"calc_function", "render"}
+
+
+def test_save_paginated_report_invalid_items_per_page(tmp_path):
+    with pytest.raises(ValueError):
+        ReportBuilder(paginated_calc_function).save_paginated_report(
+            str(tmp_path), items_per_page=0
+        )
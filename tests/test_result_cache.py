@@ -0,0 +1,147 @@
+import pytest
+
+from efficalc import Calculation, Input, clear_saved_objects
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.report_builder import ReportBuilder
+from efficalc.result_cache import ResultCache
+
+run_count = []
+
+
+@pytest.fixture
+def common_setup_teardown():
+    run_count.clear()
+    yield None
+    clear_saved_objects()
+
+
+def counted_calc():
+    run_count.append(1)
+    a = Input("a", 2, "in")
+    b = Input("b", 3, "in")
+    Calculation("c", a * b, "in^2", result_check=True)
+
+
+def other_calc():
+    a = Input("a", 2, "in")
+    Calculation("c", a * 10, "in", result_check=True)
+
+
+def test_calculate_results_cached_in_memory(common_setup_teardown):
+    cache = ResultCache()
+    first = CalculationRunner(counted_calc, {"a": 5}).calculate_results(
+        "dict", cache=cache
+    )
+    second = CalculationRunner(counted_calc, {"a": 5}).calculate_results(
+        "dict", cache=cache
+    )
+
+    assert len(run_count) == 1
+    assert second is first
+    assert second["c"].result() == 15
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_key(common_setup_teardown):
+    cache = ResultCache()
+    key = cache.make_key(counted_calc, {"a": 1, "b": 2}, "results-list")
+
+    assert key == cache.make_key(counted_calc, {"b": 2, "a": 1}, "results-list")
+    assert key != cache.make_key(counted_calc, {"a": 1, "b": 2.0}, "results-list")
+    assert key != cache.make_key(counted_calc, {"a": 1, "b": 2}, "results-dict")
+    assert key != cache.make_key(other_calc, {"a": 1, "b": 2}, "results-list")
+    assert key != ResultCache(version="2").make_key(
+        counted_calc, {"a": 1, "b": 2}, "results-list"
+    )
+
+
+def test_cache_key_numpy_arrays(common_setup_teardown):
+    np = pytest.importorskip("numpy")
+    cache = ResultCache()
+    spans = np.arange(2000.0)
+    changed_spans = spans.copy()
+    changed_spans[1000] = -1.0
+    # The repr of both arrays is the same because NumPy truncates large arrays
+    assert repr(spans) == repr(changed_spans)
+
+    key = cache.make_key(counted_calc, {"a": spans}, "results-list")
+    assert key == cache.make_key(counted_calc, {"a": spans.copy()}, "results-list")
+    assert key != cache.make_key(counted_calc, {"a": changed_spans}, "results-list")
+    assert key != cache.make_key(
+        counted_calc, {"a": spans.astype(np.float32)}, "results-list"
+    )
+    assert key != cache.make_key(
+        counted_calc, {"a": spans.reshape(2, 1000)}, "results-list"
+    )
+
+
+def test_cache_key_unsupported_value(common_setup_teardown):
+    cache = ResultCache()
+    with pytest.raises(TypeError):
+        cache.make_key(counted_calc, {"a": object()}, "results-list")
+    with pytest.raises(TypeError):
+        cache.make_fragment_key("Calculation", [object()])
+    with pytest.raises(TypeError):
+        CalculationRunner(counted_calc, {"a": {1, 2}}).calculate_results(cache=cache)
+
+
+def test_cache_evicts_least_recently_used(common_setup_teardown):
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 10)
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("a", lambda: 10) == 1
+    assert cache.get_or_compute("b", lambda: 20) == 20
+
+
+def test_cache_max_bytes(common_setup_teardown):
+    cache = ResultCache(max_bytes=100)
+    cache.get_or_compute("big", lambda: "x" * 200)
+    cache.get_or_compute("small", lambda: "y")
+
+    assert cache.get_or_compute("big", lambda: "new") == "new"
+    assert cache.get_or_compute("small", lambda: "new") == "y"
+
+
+@pytest.mark.parametrize("tier", ["directory", "sqlite"])
+def test_cache_disk_tier_shared_between_instances(
+    common_setup_teardown, tmp_path, tier
+):
+    if tier == "directory":
+        make_cache = lambda: ResultCache(directory=str(tmp_path / "cache"))
+    else:
+        make_cache = lambda: ResultCache(sqlite_path=str(tmp_path / "cache.db"))
+
+    first_cache = make_cache()
+    CalculationRunner(counted_calc, {"a": 4}).calculate_results(cache=first_cache)
+    first_cache.close()
+
+    second_cache = make_cache()
+    results = CalculationRunner(counted_calc, {"a": 4}).calculate_results(
+        cache=second_cache
+    )
+    assert len(run_count) == 1
+    assert results[0].result() == 12
+
+    second_cache.clear()
+    CalculationRunner(counted_calc, {"a": 4}).calculate_results(cache=second_cache)
+    assert len(run_count) == 2
+    second_cache.close()
+
+
+def test_get_html_as_str_cached(common_setup_teardown):
+    cache = ResultCache()
+    html = ReportBuilder(counted_calc).get_html_as_str(cache=cache)
+
+    assert ReportBuilder(counted_calc).get_html_as_str(cache=cache) == html
+    assert ReportBuilder(counted_calc, {"a": 1}).get_html_as_str(cache=cache) != html
+    assert len(run_count) == 2
+
+
+def test_result_cache_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=0)
+    with pytest.raises(ValueError):
+        ResultCache(directory=str(tmp_path), sqlite_path=str(tmp_path / "c.db"))
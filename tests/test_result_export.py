@@ -0,0 +1,126 @@
+import io
+import json
+import pickle
+
+import pytest
+
+from efficalc import (
+    Calculation,
+    Comparison,
+    Heading,
+    Input,
+    Symbolic,
+    clear_saved_objects,
+    sqrt,
+)
+from efficalc.calculation_runner import CalculationRunner
+from efficalc.result_export import to_result_record, write_jsonl
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def exported_calc():
+    Heading("Inputs")
+    a = Input("a", 2, "in")
+    b = Calculation("b", a * 3, "in")
+    Comparison(b, "<", 5, result_check=True)
+    Calculation("c", b + a, "in", result_check=True)
+
+
+def test_result_records(common_setup_teardown):
+    records = list(CalculationRunner(exported_calc).iter_result_records())
+
+    assert [r["type"] for r in records] == [
+        "Input",
+        "Calculation",
+        "Comparison",
+        "Calculation",
+    ]
+    assert records[0] == {
+        "type": "Input",
+        "name": "a",
+        "value": 2,
+        "unit": "in",
+        "result_check": False,
+        "passing": None,
+        "message": None,
+        "error": None,
+    }
+    assert records[1]["value"] == 6
+    assert records[2]["value"] is False
+    assert records[2]["passing"] is False
+    assert records[2]["message"] == "ERROR"
+    assert records[3]["value"] == 8
+    assert records[3]["result_check"] is True
+
+
+def test_result_records_results_only(common_setup_teardown):
+    records = CalculationRunner(exported_calc).iter_result_records(results_only=True)
+    assert [r["type"] for r in records] == ["Comparison", "Calculation"]
+
+
+def test_result_records_with_symbolic(common_setup_teardown):
+    runner = CalculationRunner(exported_calc)
+    record = list(runner.iter_result_records(include_symbolic=True))[1]
+
+    assert record["symbolic"] == "{a} \\cdot {3}"
+    assert "2" in record["substituted"]
+
+    plain_record = list(runner.iter_result_records())[1]
+    assert "symbolic" not in plain_record
+
+
+def test_symbolic_only_record(common_setup_teardown):
+    a = Input("a", 2, "in")
+    text_symbolic = Symbolic("s", "M_u / \\phi M_n")
+    numeric_symbolic = Symbolic("t", a * 2)
+
+    record = to_result_record(text_symbolic, include_symbolic=True)
+    assert record["value"] is None
+    assert record["error"] is None
+    assert record["symbolic"] == "{M_u / \\phi M_n}"
+    assert text_symbolic.error is None
+
+    assert to_result_record(numeric_symbolic)["value"] == 4
+    assert numeric_symbolic.error is None
+
+
+def test_record_does_not_change_item_error(common_setup_teardown):
+    a = Input("a", -4)
+    b = Symbolic("b", sqrt(a))
+
+    record = to_result_record(b)
+    assert record["value"] == 0.0
+    assert "could not be calculated" in record["error"]
+    assert b.error is None
+
+
+def test_heading_has_no_record(common_setup_teardown):
+    assert to_result_record(Heading("Inputs")) is None
+
+
+def test_records_are_serializable(common_setup_teardown):
+    records = list(CalculationRunner(exported_calc).iter_result_records())
+    assert pickle.loads(pickle.dumps(records)) == records
+    assert json.loads(json.dumps(records)) == records
+
+
+def test_write_results_jsonl(common_setup_teardown):
+    runner = CalculationRunner(exported_calc, {"a": 1})
+    output = io.StringIO()
+
+    assert runner.write_results_jsonl(output) == 4
+
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 4
+    assert [json.loads(line) for line in lines] == list(runner.iter_result_records())
+
+
+def test_write_jsonl_unserializable_values():
+    output = io.StringIO()
+    write_jsonl([{"value": 1 + 2j}], output)
+    assert json.loads(output.getvalue()) == {"value": "(1+2j)"}
@@ -0,0 +1,177 @@
+import pytest
+
+from efficalc import (
+    Calculation,
+    Comparison,
+    Input,
+    clear_saved_objects,
+    ln,
+    log,
+    maximum,
+    root,
+    sqrt,
+)
+from efficalc.calculation_runner import CalculationRunner
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def common_setup_teardown():
+    yield None
+    clear_saved_objects()
+
+
+def beam_calc():
+    w = Input("w", 2, "kip/ft")
+    L = Input("L", 20, "ft")
+    M_n = Input("M_n", 150, "kip-ft")
+    Calculation("F_y", 50, "ksi", result_check=True)
+    M_u = Calculation("M_u", w * L**2 / 8, "kip-ft", result_check=True)
+    ratio = Calculation("ratio", maximum(M_u / M_n, 0.1), result_check=True)
+    Comparison(ratio, "<=", 1.0)
+
+
+def error_calc():
+    a = Input("a", 4)
+    b = Input("b", 2)
+    Calculation("c", sqrt(a) / b, result_check=True)
+
+
+def guarded_calc():
+    a = Input("a", 4)
+    b = Calculation("b", a * 2)
+    if b.result() > 10:
+        Calculation("c", b * 2, result_check=True)
+    else:
+        Calculation("c", b * 3, result_check=True)
+
+
+def test_vectorized_results_match_scalar_runs(common_setup_teardown):
+    spans = np.array([10.0, 20.0, 30.0, 40.0])
+    results = CalculationRunner(beam_calc, {"L": spans}).calculate_vectorized_results()
+
+    for i, span in enumerate(spans):
+        scalar = CalculationRunner(beam_calc, {"L": span}).calculate_results("dict")
+        assert results.values["M_u"][i] == pytest.approx(scalar["M_u"].result())
+        assert results.values["ratio"][i] == pytest.approx(scalar["ratio"].result())
+        comparison_name = next(n for n in scalar if n not in ("F_y", "M_u", "ratio"))
+        assert (
+            results.values[comparison_name][i] == scalar[comparison_name].is_passing()
+        )
+
+    assert not results.errors["M_u"].any()
+
+
+def test_vectorized_results_broadcast_inputs(common_setup_teardown):
+    loads = np.array([[1.0], [2.0]])
+    spans = np.array([10.0, 20.0, 30.0])
+    results = CalculationRunner(
+        beam_calc, {"w": loads, "L": spans}
+    ).calculate_vectorized_results()
+
+    assert results.values["M_u"].shape == (2, 3)
+    assert results.values["M_u"][1, 2] == pytest.approx(2 * 30**2 / 8)
+    assert results.values["F_y"].shape == (2, 3)
+    assert (results.values["F_y"] == 50).all()
+    assert not results.errors["F_y"].any()
+
+
+def test_vectorized_results_error_elements(common_setup_teardown):
+    results = CalculationRunner(
+        error_calc, {"a": np.array([4.0, -1.0, 9.0]), "b": np.array([2.0, 1.0, 0.0])}
+    ).calculate_vectorized_results()
+
+    assert results.values["c"].tolist() == [1.0, 0.0, 0.0]
+    assert results.errors["c"].tolist() == [False, True, True]
+
+
+def edge_calc():
+    a = Input("a", 1.0)
+    b = Input("b", 1.0)
+    Calculation("power", a**b, result_check=True)
+    Calculation("root", root(a, b), result_check=True)
+    Calculation("ln", ln(a), result_check=True)
+    Calculation("log", log(a, b), result_check=True)
+
+
+def test_vectorized_error_elements_match_scalar_runs(common_setup_teardown):
+    a = np.array([0.0, 0.0, -8.0, 1.0, 2.0, 4.0])
+    b = np.array([-1.0, 2.0, 0.5, 3.0, 0.0, 1.0])
+    results = CalculationRunner(
+        edge_calc, {"a": a, "b": b}
+    ).calculate_vectorized_results()
+
+    for i in range(len(a)):
+        scalar = CalculationRunner(
+            edge_calc, {"a": float(a[i]), "b": float(b[i])}
+        ).calculate_all_items()
+        for item in scalar[2:]:
+            value = item.result()
+            assert results.errors[item.name][i] == (item.error is not None)
+            if item.error is None:
+                assert results.values[item.name][i] == pytest.approx(value)
+
+
+def test_vectorized_overflow_is_not_an_error(common_setup_teardown):
+    def calc():
+        a = Input("a", 1.0)
+        Calculation("product", a * 1e300, result_check=True)
+
+    results = CalculationRunner(
+        calc, {"a": np.array([1.0, 1e10])}
+    ).calculate_vectorized_results()
+    scalar = CalculationRunner(calc, {"a": 1e10}).calculate_results("dict")
+
+    assert scalar["product"].result() == np.inf
+    assert scalar["product"].error is None
+    assert results.values["product"].tolist() == [1e300, np.inf]
+    assert not results.errors["product"].any()
+
+
+def test_vectorized_results_scalar_inputs_only(common_setup_teardown):
+    results = CalculationRunner(beam_calc).calculate_vectorized_results()
+
+    assert results.values["M_u"].shape == ()
+    assert results.values["M_u"] == pytest.approx(100)
+
+
+def test_vectorized_results_guard_on_array_input(common_setup_teardown):
+    results = CalculationRunner(
+        guarded_calc, {"a": np.array([1.0, 10.0, -4.0])}
+    ).calculate_vectorized_results()
+
+    assert results.values["c"].tolist() == [6.0, 40.0, -24.0]
+    assert not results.errors["c"].any()
+
+
+def test_vectorized_results_guard_with_branch_items(common_setup_teardown):
+    def calc():
+        L = Input("L", 10, "ft")
+        M_u = Calculation("M_u", L**2 / 8, "kip-ft", result_check=True)
+        if M_u.result() > 20:
+            Calculation("L_b", L / 2, "ft", result_check=True)
+            Comparison(M_u, "<=", 100, result_check=True)
+
+    spans = np.array([[10.0, 20.0], [30.0, 40.0]])
+    results = CalculationRunner(calc, {"L": spans}).calculate_vectorized_results()
+
+    assert results.values["M_u"].tolist() == (spans**2 / 8).tolist()
+    assert results.values["L_b"].tolist() == [[0.0, 10.0], [15.0, 20.0]]
+    assert results.errors["L_b"].tolist() == [[True, False], [False, False]]
+    comparison = next(n for n in results.values if n not in ("M_u", "L_b"))
+    assert results.values[comparison].tolist() == [[False, True], [False, False]]
+
+
+def test_vectorized_results_guard_on_scalar_input(common_setup_teardown):
+    def calc():
+        guarded_calc()
+        x = Input("x", 1)
+        Calculation("y", x + 1, result_check=True)
+
+    results = CalculationRunner(
+        calc, {"x": np.array([1.0, 2.0])}
+    ).calculate_vectorized_results()
+
+    assert results.values["c"].tolist() == [24.0, 24.0]
+    assert results.values["y"].tolist() == [2.0, 3.0]
@@ -1,6 +1,7 @@
 """
 This script creates a clean build of the sections database packaged with the library. It reads the individual CSV
-files for each section type and writes them to a table in the sections database with an index on the AISC_name column.
+files for each section type and writes them to a table in the sections database with a unique index on the section name
+column and an index on each of the common properties used to search for sections.
 """
 
 import sqlite3
@@ -23,6 +24,7 @@ from efficalc.sections.section_query import (
     ALUM_RECTANGULAR_TABLE,
     ALUM_SECTION_SIZE_NAME_COLUMN,
     ALUM_WIDE_FLANGE_TABLE,
+    INDEXED_SECTION_PROPERTIES,
     SECTIONS_DB_NAME,
 )
 
@@ -105,10 +107,36 @@ def clean_build_section_tables():
         f"CREATE UNIQUE INDEX unique_alum_name_{ALUM_WIDE_FLANGE_TABLE} ON {ALUM_WIDE_FLANGE_TABLE}({ALUM_SECTION_SIZE_NAME_COLUMN});"
     )
 
+    create_property_indexes(conn)
+
     conn.close()
 
     print("Section tables built successfully.")
 
 
+def create_property_indexes(conn: sqlite3.Connection):
+    """Creates an index on each of the indexed section properties in every section table that has the property."""
+    for table in (
+        AISC_ANGLE_TABLE,
+        AISC_CHANNEL_TABLE,
+        AISC_CIRCULAR_TABLE,
+        AISC_DOUBLE_ANGLE_TABLE,
+        AISC_RECTANGULAR_TABLE,
+        AISC_TEE_TABLE,
+        AISC_WIDE_FLANGE_TABLE,
+        ALUM_ANGLE_TABLE,
+        ALUM_CHANNEL_TABLE,
+        ALUM_CIRCULAR_TABLE,
+        ALUM_RECTANGULAR_TABLE,
+        ALUM_WIDE_FLANGE_TABLE,
+    ):
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table});")}
+        for column in INDEXED_SECTION_PROPERTIES:
+            if column in columns:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS index_{table}_{column} ON {table}({column});"
+                )
+
+
 if __name__ == "__main__":
     clean_build_section_tables()